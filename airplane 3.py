@@ -2,18 +2,41 @@
 # 【第 1 段】匯入模組
 # 目的：載入 GUI、對話框與隨機工具
 # ============================================================
+import datetime
+import os
+import random
+import time
 import tkinter as tk                      # 建立視窗與按鈕
 from tkinter import messagebox            # 提示視窗
-import random                             # 產生隨機飛機形狀與位置
+from plane_engine import GRID_SIZE, DIFFICULTY_STEPS, HEAD  # 無 GUI 的遊戲規則
+from plane_sparse import SPARSE_THRESHOLD, make_engine   # 依棋盤大小選擇儲存方式
+from plane_shapes import daily_seed             # 每日挑戰的棋盤種子
+try:
+    from plane_hints import HeadHeatmap   # 機頭機率提示 (需要 NumPy，沒有就不提供提示)
+except ImportError:
+    HeadHeatmap = None
+from plane_pool import SEED_BITS, BoardPool     # 背景預先產生棋盤
+from plane_views import ButtonGridView, CanvasGridView  # 主棋盤繪製方式
+from plane_replay import ReplayWriter, CLICK, BOMB      # 對局記錄
+from plane_results import RESULTS_PATH, ResultStore, result_of  # 勝負統計 (SQLite，背景寫入)
+from plane_worker import AnalysisWorker, HintAnalysis   # 背景分析 (不卡住畫面)
+from plane_metrics import METRICS, instrument, mark_idle, serve_from_env  # 效能指標 (PLANE_METRICS=1 時)
+from plane_animate import AnimationScheduler    # 翻格動畫 (每幀限時，不卡住輸入)
 
 
 # ============================================================
 # 【第 2 段】遊戲基本參數設定
 # 目的：統一管理棋盤與格子大小
 # ============================================================
-GRID_SIZE = 10           # 棋盤大小為 10x10
 CELL_SIZE = 40           # 主棋盤格子大小
+RENDERER = "button"      # 主棋盤繪製方式："button" 或 "canvas" (大棋盤請用 canvas)
+BOMB_ADVICE = "info"     # 空襲建議依據："info" (預期資訊量) 或 "heads" (預期炸到的機頭數)
+REPLAY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replays.bin")  # 對局記錄檔
 PREVIEW_CELL_SIZE = 20   # 右側預覽飛機格子大小
+WINDOW_TITLE = "尋找機頭 - 雷達作戰中心"
+GUI_TIMERS = {"start_game": "gui.start_game_ms", "show_cells": "gui.show_cells_ms",
+              "draw_plane_previews": "gui.draw_previews_ms",
+              "update_plane_preview": "gui.draw_previews_ms"}  # 開啟效能指標時計時的方法 (預覽的整頁與局部重畫同一項)
 
 
 # ============================================================
@@ -44,9 +67,11 @@ HEADER_FONT = ("Microsoft JhengHei", 16, "bold")
 # 目的：將整個遊戲封裝成一個物件
 # ============================================================
 class PlaneGame:
-    def __init__(self, root):
+    def __init__(self, root, renderer=RENDERER, size=GRID_SIZE):
+        instrument(self, GUI_TIMERS)   # 要在方法交給按鈕之前包裝
         self.root = root
-        self.root.title("尋找機頭 - 雷達作戰中心")
+        self.renderer = renderer
+        self.root.title(WINDOW_TITLE)
         self.root.geometry("780x600") # 加寬視窗以容納右側面板
         self.root.configure(bg=THEME_BG)
 
@@ -54,16 +79,25 @@ class PlaneGame:
         # 【第 5 段】遊戲資料結構與狀態變數
         # 目的：記錄遊戲進度與棋盤內容
         # ====================================================
-        self.grid_data = [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        self.buttons = [[None for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        self.planes = []
-        self.total_heads = 0
-        self.found_heads = 0
-        self.steps = 0
-        self.max_steps = 0
-        self.game_over = False
-        self.bomb_available = 1
-        self.is_bombing = False
+        # 規則與棋盤內容由 engine 負責，本類別只處理畫面；
+        # 大棋盤不建完整形狀目錄，也就沒有預先產生的棋盤池，開局時直接由種子放置
+        self.engine = make_engine(size)
+        self.board_pool = None
+        if size <= SPARSE_THRESHOLD:
+            self.board_pool = BoardPool([(n, s) for n in (2, 3) for s in DIFFICULTY_STEPS.values()], size=size)
+        self.replay = ReplayWriter(REPLAY_PATH)
+        self.results = ResultStore(RESULTS_PATH)
+        self.started = time.monotonic()   # 本局開始時間 (記錄對局時長)
+        self.animator = AnimationScheduler(self.root)
+        self.last_click = None    # 最後點擊 / 空襲的格子，結束時的雷達掃描由此展開
+        self.hint_mode = False
+        self.game_id = 0          # 每開一局加一，丟棄上一局的分析結果
+        self.probs = None         # 背景算好的機頭機率 (開啟提示後才有)
+        self.analysis = None
+        # 機率提示 (與空襲建議) 只支援預設大小的棋盤
+        self.hints_available = HeadHeatmap is not None and size == GRID_SIZE
+        if self.hints_available:
+            self.analysis = AnalysisWorker(self.root, HintAnalysis(BOMB_ADVICE), self.on_analysis)
 
         # ====================================================
         # 【第 6 段】上方資訊列（步數、剩餘機頭、操作按鈕）
@@ -89,6 +123,11 @@ class PlaneGame:
                                   font=BTN_FONT, bg=THEME_BTN_BG, fg="#2E3440", relief="flat", padx=10)
         self.btn_bomb.pack(side=tk.RIGHT, padx=5)
 
+        if self.hints_available:
+            self.btn_hint = tk.Button(btn_frame, text="🎯 機率提示", command=self.toggle_hints,
+                                      font=BTN_FONT, bg=THEME_FG, fg="#2E3440", relief="flat", padx=10)
+            self.btn_hint.pack(side=tk.RIGHT, padx=5)
+
         # ====================================================
         # 【第 7 段】主畫面與右側飛機預覽區
         # ====================================================
@@ -115,19 +154,18 @@ class PlaneGame:
 
 
     # ========================================================
-    # 【第 8 段】建立棋盤按鈕與點擊事件
+    # 【第 8 段】建立棋盤與點擊事件
     # ========================================================
     def _init_grid_ui(self):
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
-                btn = tk.Button(
-                    self.game_frame, width=4, height=2,
-                    bg=COLOR_DEFAULT, activebackground=COLOR_HOVER,
-                    relief="groove", borderwidth=1,
-                    command=lambda row=r, col=c: self.on_click(row, col)
-                )
-                btn.grid(row=r, column=c, padx=1, pady=1)
-                self.buttons[r][c] = btn
+        colors = {"default": COLOR_DEFAULT, "hover": COLOR_HOVER, "miss": COLOR_MISS,
+                  "body": COLOR_BODY, "head": COLOR_HEAD, "target": THEME_BTN_BG}
+        size = self.engine.size
+        if self.renderer == "canvas":
+            # 棋盤變大時縮小格子，讓整個棋盤維持在視窗內
+            cell_px = max(4, min(CELL_SIZE, 440 // size))
+            self.view = CanvasGridView(self.game_frame, size, self.on_click, colors, cell_px)
+        else:
+            self.view = ButtonGridView(self.game_frame, size, self.on_click, colors)
 
 
     # ========================================================
@@ -160,220 +198,263 @@ class PlaneGame:
         frame_diff.pack(pady=5)
 
         # 格式：(名稱, 顏色, 步數上限)
-        modes = [("簡單", "#90EE90", 40), ("一般", "#FFFFE0", 30), ("困難", "#FFB6C1", 20)]
+        modes = [(t, c, DIFFICULTY_STEPS[t]) for t, c in (("簡單", "#90EE90"), ("一般", "#FFFFE0"), ("困難", "#FFB6C1"))]
         for text, color, _ in modes:
             tk.Radiobutton(frame_diff, text=text, variable=var_diff, value=text, indicatoron=0, width=6, height=2, selectcolor=color, font=("Microsoft JhengHei", 10)).pack(side=tk.LEFT, padx=2)
 
-        # 3. 確認按鈕
+        # 3. 每日挑戰 (同一天、同樣設定的棋盤人人相同)
+        var_daily = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame_center, text="今日挑戰", variable=var_daily, bg="#F0F0F0",
+                       font=("Microsoft JhengHei", 10)).pack(pady=(15, 0))
+
+        # 4. 確認按鈕
         def confirm():
             num = var_planes.get()
             diff_text = var_diff.get()
             steps = next(s for t, c, s in modes if t == diff_text)
+            seed = daily_seed(datetime.date.today(), num, diff_text) if var_daily.get() else None
             settings_win.destroy()
-            self.start_game(num, steps)
+            self.start_game(num, steps, seed)
 
         tk.Button(frame_center, text="開始任務", command=confirm, font=("Microsoft JhengHei", 14, "bold"), bg="#4CAF50", fg="white", height=2, width=15, relief="flat").pack(pady=(30, 0))
 
-    def start_game(self, num_planes, max_steps):
-        self.max_steps = max_steps
-        self.steps = 0
-        self.total_heads = num_planes
-        self.found_heads = 0
-        self.planes.clear()
-        self.bomb_available = 1
-        self.game_over = False
-        self.is_bombing = False
-
-        self.lbl_steps.config(text=f"步數: 0 / 上限: {self.max_steps}")
-        self.lbl_heads.config(text=f"剩餘目標: {self.total_heads}")
+    def start_game(self, num_planes, max_steps, seed=None):
+        # 棋盤由背景執行緒預先產生，UI 執行緒只負責取用與繪製；指定種子時由種子產生
+        board = None
+        if seed is None and self.board_pool is not None:
+            seed, board = self.board_pool.get(num_planes, max_steps)
+        elif seed is None:
+            seed = random.getrandbits(SEED_BITS)
+        self.engine.start_game(num_planes, max_steps, board, seed)
+        self.replay.begin_game(self.engine)
+        self.started = time.monotonic()
+        self.game_id += 1
+        self.probs = None
+        if self.analysis is not None:
+            self.analysis.cancel()
+        self.root.title(f"{WINDOW_TITLE}  (棋盤 #{seed})")   # 回報問題時附上種子即可重現
+
+        self.animator.cancel()    # 上一局還沒播完的動畫作廢，之後才重置棋盤
+        self.last_click = None
+        self.lbl_steps.config(text=f"步數: 0 / 上限: {max_steps}")
+        self.lbl_heads.config(text=f"剩餘目標: {num_planes}")
         self.btn_bomb.config(text="💣 呼叫空襲 (1)", state=tk.NORMAL, bg=THEME_BTN_BG, relief="flat")
         self.preview_canvas.delete("all")
 
-        # 重置棋盤
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
-                self.grid_data[r][c] = None
-                self.buttons[r][c].config(bg=COLOR_DEFAULT, state=tk.NORMAL, text="", relief="groove")
+        # 重置棋盤 (只重畫上一局有變化的格子)
+        self.view.clear_target()
+        self.view.reset()
 
-        self.place_planes(num_planes)
         self.draw_plane_previews()
+        self.draw_hints()
+        self.request_analysis()
 
 
     # ========================================================
-    # 【第 10 段】飛機生成、旋轉與放置演算法
-    # ========================================================
-    def generate_random_shape(self):
-        shape = [(0, 0), (0, 1)] # 頭+頸
-        body_len = random.randint(2, 4)
-        wing_len = random.randint(1, 3)
-        for i in range(2, body_len + 1): shape.append((0, i))
-        for i in range(1, wing_len + 1):
-            shape.append((-i, 1))
-            shape.append((i, 1))
-        if random.choice([True, False]): # 尾翼
-            shape.append((-1, body_len)); shape.append((1, body_len))
-        return shape
-
-    def rotate_shape(self, shape, angle):
-        new_shape = []
-        for x, y in shape:
-            if angle == 90: nx, ny = -y, x
-            elif angle == 180: nx, ny = -x, -y
-            elif angle == 270: nx, ny = y, -x
-            else: nx, ny = x, y
-            new_shape.append((nx, ny))
-        return new_shape
-
-    def place_planes(self, count):
-        placed = 0
-        attempts = 0 # 安全計數器，防止無限迴圈
-        while placed < count and attempts < 1000:
-            attempts += 1
-            shape = self.rotate_shape(self.generate_random_shape(), random.choice([0, 90, 180, 270]))
-            r, c = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-            if self.is_valid_position(r, c, shape):
-                self.add_plane_to_grid(r, c, shape)
-                self.planes.append(shape)
-                placed += 1
-        
-        if placed < count:
-            print("警告：無法放置所有飛機 (嘗試次數過多)")
-
-    def is_valid_position(self, r, c, shape):
-        for dx, dy in shape:
-            nr, nc = r + dy, c + dx
-            if not (0 <= nr < GRID_SIZE and 0 <= nc < GRID_SIZE): return False
-            if self.grid_data[nr][nc] is not None: return False
-        return True
-
-    def add_plane_to_grid(self, r, c, shape):
-        for i, (dx, dy) in enumerate(shape):
-            nr, nc = r + dy, c + dx
-            self.grid_data[nr][nc] = 'H' if i == 0 else 'B'
-
-
-    # ========================================================
-    # 【第 11 段】點擊翻格 (包含勝負判定)
+    # 【第 10 段】點擊翻格 (規則交給 engine，這裡只更新畫面)
     # ========================================================
     def on_click(self, r, c):
-        if self.game_over: return
+        start = time.perf_counter()   # 點擊到畫面更新的延遲從這裡算起
+        engine = self.engine
+        if engine.game_over or not engine.planes: return   # 還沒開局 (設定視窗開著) 時不理會點擊
 
-        if self.is_bombing:
+        if engine.is_bombing:
             self.execute_bomb_at(r, c)
             return
 
-        if self.buttons[r][c]["state"] == tk.DISABLED: return
-
-        self.steps += 1
-        self.lbl_steps.config(text=f"步數: {self.steps} / 上限: {self.max_steps}")
-
-        if self.steps > self.max_steps:
-            self.game_over = True
-            self.reveal_all_planes() # 【新增】失敗時顯示全圖
+        self.last_click = (r, c)
+        if not engine.is_revealed(r, c):
+            self.replay.record(CLICK, r, c)
+        events = engine.on_click(r, c)
+        self.lbl_steps.config(text=f"步數: {engine.steps} / 上限: {engine.max_steps}")
+        self.show_cells(events)
+        self.check_game_end()
+        if METRICS.enabled: mark_idle(self.root, "gui.click_to_idle_ms", start)   # 重畫排好之後才等閒置
+
+    def show_cells(self, events, animate=False, done=None):
+        """
+        依 engine 回傳的 [(r, c, cell), ...] 更新格子；animate 時由 last_click 向外依序翻開，
+        done 在最後一格畫上之後執行
+        """
+        changed = set()
+        if animate:
+            for r, c, _ in events:
+                self.view.pending(r, c)   # 立刻不能再點，外觀由掃描依序換上
+            self.animator.sweep(events, self.last_click, self.view.show, done=done)
+        for r, c, cell in events:
+            if not animate:
+                self.view.show(r, c, cell)
+            if cell == HEAD:
+                changed.add(self.engine.plane_id_at(r, c))
+        self.lbl_heads.config(text=f"剩餘目標: {self.engine.heads_left}")
+        for idx in changed:
+            self.update_plane_preview(idx)
+        self.request_analysis()
+
+    def check_game_end(self):
+        engine = self.engine
+        if not engine.game_over or not engine.planes: return   # 沒有開局就不記錄結果
+        self.replay.end_game(engine)
+        self.results.record(result_of(engine, self.started))   # 只放進佇列，不等寫入
+        if self.analysis is not None:
+            self.analysis.cancel()
+        self.draw_hints()        # 結束時收起機率提示
+        self.reveal_all_planes() # 結束時顯示全圖
+        if engine.won:
+            messagebox.showinfo("任務完成", f"恭喜！您以 {engine.steps} 步殲滅了所有敵機！")
+        else:
             messagebox.showinfo("任務失敗", "步數已用盡，作戰失敗！")
-            return
-
-        self.reveal_cell(r, c)
-
-    def reveal_cell(self, r, c):
-        btn = self.buttons[r][c]
-        if btn["state"] == tk.DISABLED: return
-
-        cell = self.grid_data[r][c]
-        if cell is None:
-            btn.config(bg=COLOR_MISS, relief="sunken") # 空格
-        elif cell == 'B':
-            btn.config(bg=COLOR_BODY, relief="sunken") # 機身
-        elif cell == 'H':
-            btn.config(bg=COLOR_HEAD, text="X", relief="sunken") # 機頭
-            self.found_heads += 1
-            self.lbl_heads.config(text=f"剩餘目標: {self.total_heads - self.found_heads}")
-            if self.found_heads == self.total_heads:
-                self.game_over = True
-                self.reveal_all_planes() # 【新增】勝利時顯示全圖
-                messagebox.showinfo("任務完成", f"恭喜！您以 {self.steps} 步殲滅了所有敵機！")
-
-        btn.config(state=tk.DISABLED)
 
     def reveal_all_planes(self):
-        """遊戲結束後，翻開所有飛機位置"""
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
-                cell = self.grid_data[r][c]
-                btn = self.buttons[r][c]
-                
-                # 如果是機頭或機身，不管有沒有被點過，全部顯示出來
-                if cell == 'H':
-                    btn.config(bg=COLOR_HEAD, text="X", relief="sunken", state=tk.DISABLED)
-                elif cell == 'B':
-                    btn.config(bg=COLOR_BODY, relief="sunken", state=tk.DISABLED)
+        """遊戲結束後，從最後點擊的格子以雷達掃描的方式翻開所有飛機位置"""
+        engine = self.engine
+        hidden = [(r, c, cell) for r, c, cell in engine.reveal_all_planes() if not engine.is_revealed(r, c)]
+        self.animator.sweep(hidden, self.last_click, self.view.show)
 
 
     # ========================================================
-    # 【第 12 段】預覽繪製 & 炸彈功能
+    # 【第 11 段】預覽繪製 & 炸彈功能
     # ========================================================
     def use_bomb(self):
-        if self.bomb_available <= 0 or self.game_over: return
+        engine = self.engine
+        if engine.bomb_available <= 0 or engine.game_over or not engine.planes: return
 
-        if not self.is_bombing:
-            self.is_bombing = True
+        if engine.use_bomb():
             self.btn_bomb.config(text="鎖定目標中...", bg="#FF8888", relief="sunken")
+            self.request_analysis()   # 背景算出建議位置後再框出
         else:
-            self.is_bombing = False
             self.btn_bomb.config(text="💣 呼叫空襲 (1)", bg=THEME_BTN_BG, relief="flat")
+            self.view.clear_target()
 
     def execute_bomb_at(self, r, c):
         """執行 2x2 轟炸"""
-        self.bomb_available = 0
-        self.is_bombing = False
+        if not self.engine.planes: return
+        done = None
+        if METRICS.enabled:
+            start = time.perf_counter()
+            done = lambda: mark_idle(self.root, "gui.bomb_to_idle_ms", start)   # 掃描畫完最後一格才停
+        self.last_click = (r, c)
+        self.replay.record(BOMB, r, c)
+        events = self.engine.execute_bomb_at(r, c)
         self.btn_bomb.config(text="空襲已耗盡", state=tk.DISABLED, bg="#555555", relief="sunken")
-
-        # 炸開 2x2 區域 (點擊點 + 右 + 下 + 右下)
-        for dr in range(0, 2):
-            for dc in range(0, 2):
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < GRID_SIZE and 0 <= nc < GRID_SIZE:
-                    self.reveal_cell(nr, nc)
+        self.view.clear_target()
+        self.show_cells(events, animate=True, done=done)
+        self.check_game_end()
 
     def draw_plane_previews(self):
         """繪製右側飛機預覽 (自動置中修正版)"""
         self.preview_canvas.delete("all")
+        self.preview_slots = []   # 每架飛機預覽的起始 y，局部重畫時使用
         y_current = 20
-        
-        for idx, shape in enumerate(self.planes):
-            self.preview_canvas.create_text(
-                100, y_current, text=f"敵機訊號 {idx + 1}", 
-                font=("Microsoft JhengHei", 10, "bold"), fill=THEME_FG
+
+        for idx in range(len(self.engine.planes)):
+            self.preview_slots.append(y_current)
+            y_current = self.draw_plane_entry(idx, y_current)
+
+    def update_plane_preview(self, idx):
+        """只重畫狀態有變化的那一架飛機"""
+        self.preview_canvas.delete(f"plane{idx}")
+        self.draw_plane_entry(idx, self.preview_slots[idx])
+
+    def draw_plane_entry(self, idx, y_current):
+        """
+        畫出第 idx 架飛機 (標題 + 形狀)，回傳下一架的 y；
+        只標示是否已擊落，不標出翻到的是哪一格 (否則可由機身位置直接推出機頭)
+        """
+        engine = self.engine
+        shape = engine.planes[idx]
+        tag = f"plane{idx}"
+        destroyed = engine.plane_heads_found[idx] > 0
+
+        if destroyed:
+            title, title_color = f"敵機訊號 {idx + 1}  ✖ 已擊落", COLOR_HEAD
+        else:
+            title, title_color = f"敵機訊號 {idx + 1}", THEME_FG
+        self.preview_canvas.create_text(
+            100, y_current, text=title, tags=tag,
+            font=("Microsoft JhengHei", 10, "bold"), fill=title_color
+        )
+        y_current += 20
+
+        xs = [p[0] for p in shape]; ys = [p[1] for p in shape]
+        min_x, max_x = min(xs), max(xs)
+        min_y, max_y = min(ys), max(ys)
+
+        plane_height_px = (max_y - min_y + 1) * PREVIEW_CELL_SIZE
+        plane_width_px = (max_x - min_x + 1) * PREVIEW_CELL_SIZE
+
+        for i, (dx, dy) in enumerate(shape):
+            norm_x = dx - min_x
+            norm_y = dy - min_y
+            # X軸置中公式: 畫布寬度200
+            cx = 100 - (plane_width_px / 2) + (norm_x * PREVIEW_CELL_SIZE) + (PREVIEW_CELL_SIZE / 2)
+            cy = y_current + (norm_y * PREVIEW_CELL_SIZE) + (PREVIEW_CELL_SIZE / 2)
+
+            color = COLOR_HEAD if i == 0 else COLOR_BODY
+            self.preview_canvas.create_rectangle(
+                cx - PREVIEW_CELL_SIZE/2, cy - PREVIEW_CELL_SIZE/2,
+                cx + PREVIEW_CELL_SIZE/2, cy + PREVIEW_CELL_SIZE/2,
+                fill=color, outline="white", stipple="gray50" if destroyed else "", tags=tag
             )
-            y_current += 20
-            
-            xs = [p[0] for p in shape]; ys = [p[1] for p in shape]
-            min_x, max_x = min(xs), max(xs)
-            min_y, max_y = min(ys), max(ys)
-            
-            plane_height_px = (max_y - min_y + 1) * PREVIEW_CELL_SIZE
-            plane_width_px = (max_x - min_x + 1) * PREVIEW_CELL_SIZE
-            
-            for i, (dx, dy) in enumerate(shape):
-                norm_x = dx - min_x
-                norm_y = dy - min_y
-                # X軸置中公式: 畫布寬度200
-                cx = 100 - (plane_width_px / 2) + (norm_x * PREVIEW_CELL_SIZE) + (PREVIEW_CELL_SIZE / 2)
-                cy = y_current + (norm_y * PREVIEW_CELL_SIZE) + (PREVIEW_CELL_SIZE / 2)
-                
-                color = COLOR_HEAD if i == 0 else COLOR_BODY
-                self.preview_canvas.create_rectangle(
-                    cx - PREVIEW_CELL_SIZE/2, cy - PREVIEW_CELL_SIZE/2,
-                    cx + PREVIEW_CELL_SIZE/2, cy + PREVIEW_CELL_SIZE/2,
-                    fill=color, outline="white"
-                )
-            y_current += plane_height_px + 30
+        return y_current + plane_height_px + 30
+
+
+    # ========================================================
+    # 【第 12 段】機頭機率提示 (覆蓋在未翻開的格子上)
+    # 目的：機率與空襲建議在背景執行緒計算 (plane_worker)，
+    #       點擊時只送出快照，算好後才回到 UI 執行緒繪製
+    # ========================================================
+    def toggle_hints(self):
+        self.hint_mode = not self.hint_mode
+        self.btn_hint.config(relief="sunken" if self.hint_mode else "flat")
+        self.draw_hints()
+        self.request_analysis()
+
+    def request_analysis(self):
+        """提示開啟或鎖定空襲時，把目前盤面送去背景分析"""
+        engine = self.engine
+        if self.analysis is None or engine.game_over or not engine.planes: return
+        if not (self.hint_mode or engine.is_bombing): return
+        self.analysis.submit((self.game_id, list(engine.planes), engine.revealed_cells(), engine.is_bombing))
+
+    def on_analysis(self, result):
+        """背景分析完成 (在 UI 執行緒上由 root.after 呼叫)"""
+        if result["game"] != self.game_id: return
+        self.probs = result["probs"]
+        self.draw_hints()
+        if result["bomb"] is not None and self.engine.is_bombing:
+            # 鎖定空襲時，框出分數最高的 2x2 位置
+            r, c = result["bomb"]
+            size = self.engine.size
+            self.view.show_target([(r + dr, c + dc) for dr in (0, 1) for dc in (0, 1)
+                                   if r + dr < size and c + dc < size])
+
+    def draw_hints(self):
+        """在未翻開的格子上顯示機頭機率 (%)，顏色越紅機率越高"""
+        engine = self.engine
+        if not (self.hint_mode and self.probs is not None and not engine.game_over):
+            for r, c in list(self.view.hints):
+                self.view.hint(r, c, 0)
+            return
+
+        probs = self.probs
+        for r in range(engine.size):
+            for c in range(engine.size):
+                if not engine.is_revealed(r, c):
+                    self.view.hint(r, c, probs[r][c])
 
 
 # ============================================================
-# 【主程式入口】建立視窗並啟動遊戲
+# 【主程式入口】建立視窗並啟動遊戲 (plane_launcher 也從這裡進入)
 # ============================================================
-if __name__ == "__main__":
+def main():
     root = tk.Tk()
-    game = PlaneGame(root)
+    metrics_server = serve_from_env()   # PLANE_METRICS=1 且設定 PLANE_METRICS_PORT 時提供 /metrics
+    PlaneGame(root)                     # 按鈕與 after() 回呼持有遊戲物件，不必另存
     root.mainloop()
+    if metrics_server is not None:
+        metrics_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
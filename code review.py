@@ -5,6 +5,7 @@
 import tkinter as tk                      # 建立視窗與按鈕
 from tkinter import messagebox            # 提示視窗
 import random                             # 產生隨機飛機形狀與位置
+from plane_shapes import get_catalog      # 預先算好的形狀目錄 (放置不需重試)
 
 
 # ============================================================
@@ -224,14 +225,12 @@ class PlaneGame:
         return new_shape
 
     def place_planes(self, count):
-        placed = 0
-        while placed < count:
-            shape = self.rotate_shape(self.generate_random_shape(), random.choice([0, 90, 180, 270]))
-            r, c = random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1)
-            if self.is_valid_position(r, c, shape):
-                self.add_plane_to_grid(r, c, shape)
-                self.planes.append(shape)
-                placed += 1
+        """從形狀目錄直接抽合法放置，不會無限重試 (見 ShapeCatalog.sample)"""
+        catalog = get_catalog(GRID_SIZE)
+        for placement in catalog.sample_board(count, random):
+            shape = catalog.variants[placement.variant].shape
+            self.add_plane_to_grid(placement.r, placement.c, shape)
+            self.planes.append(shape)
 
     def is_valid_position(self, r, c, shape):
         for dx, dy in shape:
@@ -0,0 +1,79 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：以 root.after 驅動的動畫排程，把畫面上的格子更新排進佇列，
+#       每一幀只在時間預算內處理，剩下的留到下一幀 (視窗不會卡住、點擊照常回應)
+# ============================================================
+import heapq
+import math
+import time
+
+FRAME_MS = 16            # 每幀間隔 (約 60 fps)
+BUDGET_MS = 8            # 每幀最多花在格子更新上的時間，其餘留給輸入與重畫
+SWEEP_MS = 25            # 雷達掃描：距離每多一格延後的毫秒數
+SWEEP_MAX_MS = 800       # 整段掃描最長的時間 (大棋盤自動縮短每格的延遲)
+
+
+# ============================================================
+# 【第 2 段】AnimationScheduler 類別
+# 目的：每個工作是 (預定時間, 序號, 函式)；只有佇列不空時才排 after，
+#       cancel() 清空佇列並取消下一幀 (例如開新局重置棋盤時)
+# ============================================================
+class AnimationScheduler:
+    def __init__(self, root, frame_ms=FRAME_MS, budget_ms=BUDGET_MS):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.budget = budget_ms / 1000
+        self._heap = []
+        self._seq = 0             # 同一時間的工作依加入順序執行
+        self._after = None        # 下一幀的 after id
+
+    @property
+    def busy(self):
+        return bool(self._heap)
+
+    def add(self, func, delay_ms=0):
+        """delay_ms 毫秒後 (最早在下一幀) 執行 func()"""
+        self._seq += 1
+        heapq.heappush(self._heap, (time.perf_counter() + delay_ms / 1000, self._seq, func))
+        if self._after is None:
+            self._after = self.root.after(self.frame_ms, self._frame)
+
+    def sweep(self, cells, origin, apply, step_ms=SWEEP_MS, max_ms=SWEEP_MAX_MS, done=None):
+        """
+        雷達掃描：cells 為 [(r, c, cell), ...]，依與 origin (r, c) 的距離由近而遠
+        呼叫 apply(r, c, cell)；origin 為 None 時全部立即排入。
+        done 在最後一格之後執行 (同一時間的工作依加入順序，所以排在最後一格的時間即可)
+        """
+        last_ms = 0
+        if origin is None:
+            for r, c, cell in cells:
+                self.add(lambda r=r, c=c, cell=cell: apply(r, c, cell))
+        elif cells:
+            r0, c0 = origin
+            dist = [math.hypot(r - r0, c - c0) for r, c, _ in cells]
+            step_ms = min(step_ms, max_ms / max(1.0, max(dist)))
+            for i in sorted(range(len(cells)), key=dist.__getitem__):
+                r, c, cell = cells[i]
+                self.add(lambda r=r, c=c, cell=cell: apply(r, c, cell), dist[i] * step_ms)
+            last_ms = max(dist) * step_ms
+        if done is not None:
+            self.add(done, last_ms)
+
+    def cancel(self):
+        """丟棄所有還沒執行的工作"""
+        self._heap.clear()
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+            self._after = None
+
+    def _frame(self):
+        self._after = None
+        start = time.perf_counter()
+        deadline = start + self.budget
+        heap = self._heap
+        while heap and heap[0][0] <= start:
+            heapq.heappop(heap)[2]()
+            if time.perf_counter() >= deadline:
+                break             # 超過預算，剩下的下一幀再做
+        if heap and self._after is None:
+            self._after = self.root.after(self.frame_ms, self._frame)
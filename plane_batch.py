@@ -0,0 +1,105 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：以 NumPy 一次產生大量棋盤 (難度校正、訓練模型用)
+# ============================================================
+import numpy as np
+
+from plane_shapes import GRID_SIZE, get_catalog
+
+
+# ============================================================
+# 【第 2 段】基本參數
+# ============================================================
+EMPTY, BODY, HEAD = 0, 1, 2     # 批次棋盤中的格子值 (uint8)
+
+CHUNK_SIZE = 1 << 16     # 每次向量化處理的棋盤數，限制暫存記憶體
+QUICK_ROUNDS = 32        # 直接抽候選的輪數，之後剩下的棋盤改為完整篩選
+
+
+# ============================================================
+# 【第 3 段】目錄轉成陣列
+# 目的：每個 placement 的格子索引補齊到同樣長度，補位指向多出來的一格
+# ============================================================
+_ARRAYS = {}
+
+
+def catalog_arrays(size=GRID_SIZE):
+    """回傳 (cells, heads, variants, rows, cols)，依棋盤大小快取"""
+    arrays = _ARRAYS.get(size)
+    if arrays is None:
+        catalog = get_catalog(size)
+        pad = size * size
+        width = max(len(v.shape) for v in catalog.variants)
+        cells = np.full((len(catalog.placements), width), pad, dtype=np.int32)
+        for i, p in enumerate(catalog.placements):
+            shape = catalog.variants[p.variant].shape
+            cells[i, :len(shape)] = [(p.r + dy) * size + p.c + dx for dx, dy in shape]
+        heads = cells[:, 0].copy()     # 形狀第一格就是機頭
+        variants = np.array([p.variant for p in catalog.placements], dtype=np.int16)
+        rows = np.array([p.r for p in catalog.placements], dtype=np.int16)
+        cols = np.array([p.c for p in catalog.placements], dtype=np.int16)
+        arrays = _ARRAYS[size] = (cells, heads, variants, rows, cols)
+    return arrays
+
+
+# ============================================================
+# 【第 4 段】批次取樣
+# 目的：與 ShapeCatalog.sample 相同的分布 (合法放置均勻抽)，
+#       但所有棋盤同時抽、同時檢查重疊
+# ============================================================
+def _sample_chunk(rng, n, num_planes, size):
+    cells = catalog_arrays(size)[0]
+    count = len(cells)
+    occupied = np.zeros((n, size * size + 1), dtype=bool)
+    chosen = np.empty((n, num_planes), dtype=np.int32)
+
+    for k in range(num_planes):
+        pending = np.arange(n)
+        for _ in range(QUICK_ROUNDS):
+            if not pending.size: break
+            cand = rng.integers(count, size=pending.size)
+            ok = ~occupied[pending[:, None], cells[cand]].any(axis=1)
+            chosen[pending[ok], k] = cand[ok]
+            pending = pending[~ok]
+
+        if pending.size:
+            # 少數擁擠的棋盤：列出全部合法候選後再抽，保證有限時間內完成
+            valid = ~occupied[pending][:, cells].any(axis=2)
+            totals = valid.sum(axis=1)
+            if not totals.all():
+                raise ValueError("棋盤上已沒有可放置飛機的位置")
+            pick = (rng.random(pending.size) * totals).astype(np.int64)
+            chosen[pending, k] = (valid.cumsum(axis=1) > pick[:, None]).argmax(axis=1)
+
+        occupied[np.arange(n)[:, None], cells[chosen[:, k]]] = True
+        occupied[:, -1] = False        # 補位格永遠視為空格
+
+    return chosen
+
+
+def generate_boards(n, num_planes, seed=None, size=GRID_SIZE):
+    """
+    產生 n 張棋盤，回傳 (boards, placements)：
+      boards      (n, size, size) uint8，EMPTY / BODY / HEAD
+      placements  (n, num_planes) int32，對應 get_catalog(size).placements 的索引
+    相同 seed 得到相同結果。
+    """
+    rng = np.random.default_rng(seed)
+    cells, heads = catalog_arrays(size)[:2]
+    placements = np.empty((n, num_planes), dtype=np.int32)
+    for start in range(0, n, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, n)
+        placements[start:stop] = _sample_chunk(rng, stop - start, num_planes, size)
+
+    boards = np.zeros((n, size * size + 1), dtype=np.uint8)
+    rows = np.arange(n)[:, None]
+    for k in range(num_planes):
+        boards[rows, cells[placements[:, k]]] = BODY
+        boards[np.arange(n), heads[placements[:, k]]] = HEAD
+    return boards[:, :-1].reshape(n, size, size), placements
+
+
+def plane_metadata(placements, size=GRID_SIZE):
+    """把 placements 索引展開成每架飛機的變體編號與機頭位置"""
+    variants, rows, cols = catalog_arrays(size)[2:]
+    return {"variant": variants[placements], "row": rows[placements], "col": cols[placements]}
@@ -0,0 +1,100 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：策略評測工具，用多個行程同時跑大量無 GUI 對局，
+#       檢查規則調整後各難度是否變得太簡單或不可能
+#       用法：python plane_bench.py --games 20000 --planes 2
+# ============================================================
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+from plane_bots import BOTS, play_game
+from plane_engine import DIFFICULTY_STEPS, PlaneEngine
+
+
+# ============================================================
+# 【第 2 段】單一工作行程
+# 目的：不設步數上限把每局玩到贏，回傳每局用掉的步數
+# ============================================================
+def run_chunk(args):
+    bot_name, num_planes, games, seed = args
+    rng = random.Random(seed)
+    engine = PlaneEngine(rng=rng)
+    bot = BOTS[bot_name](rng)
+    no_limit = engine.size * engine.size
+    return [play_game(engine, bot, num_planes, no_limit).steps for _ in range(games)]
+
+
+def split_games(games, parts):
+    base, extra = divmod(games, parts)
+    return [base + (i < extra) for i in range(parts) if base + (i < extra)]
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+# ============================================================
+# 【第 3 段】統計
+# 目的：步數 <= 上限即算在該難度下獲勝
+# ============================================================
+def summarize(steps, seconds):
+    steps = sorted(steps)
+    return {
+        "games": len(steps),
+        "win_rate": {name: sum(s <= limit for s in steps) / len(steps)
+                     for name, limit in DIFFICULTY_STEPS.items()},
+        "steps": {"mean": sum(steps) / len(steps), "p10": percentile(steps, 10),
+                  "p50": percentile(steps, 50), "p90": percentile(steps, 90), "max": steps[-1]},
+        "games_per_sec": len(steps) / seconds,
+    }
+
+
+def run_benchmark(bot_names, num_planes, games, seed, processes):
+    results = {}
+    with multiprocessing.Pool(processes) as pool:
+        for i, name in enumerate(bot_names):
+            chunks = split_games(games, processes * 4)
+            jobs = [(name, num_planes, n, seed + 1000 * i + k) for k, n in enumerate(chunks)]
+            start = time.perf_counter()
+            steps = [s for part in pool.map(run_chunk, jobs) for s in part]
+            results[name] = summarize(steps, time.perf_counter() - start)
+    return results
+
+
+def print_table(results):
+    header = f"{'策略':<12}{'局數':>8}" + "".join(f"{f'{n}({s})':>12}" for n, s in DIFFICULTY_STEPS.items())
+    print(header + f"{'平均':>8}{'p10':>6}{'p50':>6}{'p90':>6}{'max':>6}{'局/秒':>10}")
+    for name, res in results.items():
+        row = f"{name:<14}{res['games']:>8}"
+        row += "".join(f"{res['win_rate'][n] * 100:>13.1f}%" for n in DIFFICULTY_STEPS)
+        st = res["steps"]
+        row += f"{st['mean']:>10.1f}{st['p10']:>6}{st['p50']:>6}{st['p90']:>6}{st['max']:>6}{res['games_per_sec']:>10.0f}"
+        print(row)
+
+
+# ============================================================
+# 【主程式入口】
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="尋找機頭：策略勝率評測")
+    parser.add_argument("--games", type=int, default=10000, help="每種策略的局數")
+    parser.add_argument("--planes", type=int, default=2, choices=(2, 3), help="飛機數量")
+    parser.add_argument("--bots", nargs="+", default=list(BOTS), choices=list(BOTS), help="要評測的策略")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", action="store_true", help="輸出 JSON 而非表格")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.bots, args.planes, args.games, args.seed, args.processes)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
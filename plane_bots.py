@@ -0,0 +1,158 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：自動玩家 (策略)，只看玩家看得到的資訊：已翻開格子與預覽形狀
+# ============================================================
+import abc
+import random
+
+from plane_engine import BODY
+
+
+# ============================================================
+# 【第 2 段】策略基底
+# 目的：choose() 回傳 ("click", r, c) 或 ("bomb", r, c)，
+#       update() 接收 engine 回傳的新翻開格子
+# ============================================================
+class Bot(abc.ABC):
+    name = "base"
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
+
+    def reset(self, engine):
+        self.size = engine.size
+        self.planes = engine.planes
+        self.unknown = {(r, c) for r in range(engine.size) for c in range(engine.size)}
+        self.bombed = False
+
+    def update(self, events):
+        for r, c, _ in events:
+            self.unknown.discard((r, c))
+
+    @abc.abstractmethod
+    def choose(self):
+        """回傳下一步動作"""
+
+    def _bomb_anywhere(self):
+        self.bombed = True
+        return ("bomb", self.rng.randrange(self.size - 1), self.rng.randrange(self.size - 1))
+
+
+# ============================================================
+# 【第 3 段】隨機點擊
+# ============================================================
+class RandomBot(Bot):
+    name = "random"
+
+    def reset(self, engine):
+        super().reset(engine)
+        self.order = sorted(self.unknown)
+        self.rng.shuffle(self.order)
+
+    def choose(self):
+        if not self.bombed:
+            return self._bomb_anywhere()
+        while self.order[-1] not in self.unknown:
+            self.order.pop()
+        return ("click",) + self.order.pop()
+
+
+# ============================================================
+# 【第 4 段】搜尋 + 追擊 (打到機身就往四周找)
+# ============================================================
+class HuntTargetBot(Bot):
+    name = "hunt-target"
+
+    def reset(self, engine):
+        super().reset(engine)
+        self.targets = []
+        self.hunt_order = self._hunt_order()
+
+    def _hunt_order(self):
+        cells = sorted(self.unknown)
+        self.rng.shuffle(cells)
+        return cells
+
+    def update(self, events):
+        super().update(events)
+        for r, c, cell in events:
+            if cell == BODY:
+                for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if (nr, nc) in self.unknown:
+                        self.targets.append((nr, nc))
+
+    def choose(self):
+        if not self.bombed:
+            return self._bomb_anywhere()
+        while self.targets:
+            cell = self.targets.pop()
+            if cell in self.unknown:
+                return ("click",) + cell
+        while self.hunt_order:
+            cell = self.hunt_order.pop()
+            if cell in self.unknown:
+                return ("click",) + cell
+        return ("click",) + min(self.unknown)
+
+
+# ============================================================
+# 【第 5 段】棋盤格 (parity) 搜尋
+# 目的：每架飛機一定跨過兩種顏色的格子，先只搜一半的格子
+# ============================================================
+class ParityBot(HuntTargetBot):
+    name = "parity"
+
+    def _hunt_order(self):
+        even = [cell for cell in sorted(self.unknown) if (cell[0] + cell[1]) % 2 == 0]
+        odd = [cell for cell in sorted(self.unknown) if (cell[0] + cell[1]) % 2 == 1]
+        self.rng.shuffle(even); self.rng.shuffle(odd)
+        return odd + even        # pop() 從尾端取，先搜偶數格
+
+    def _bomb_anywhere(self):
+        self.bombed = True
+        return ("bomb", self.size // 2 - 1, self.size // 2 - 1)
+
+
+# ============================================================
+# 【第 6 段】機率貪婪 (需要 NumPy)
+# 目的：永遠點機頭機率最高的格子，空襲丟在機率和最高的 2x2
+# ============================================================
+class ProbabilityBot(Bot):
+    name = "probability"
+
+    def reset(self, engine):
+        from plane_hints import HeadHeatmap
+        super().reset(engine)
+        self.heatmap = HeadHeatmap(engine.planes, engine.size)
+
+    def update(self, events):
+        super().update(events)
+        self.heatmap.observe_all(events)
+
+    def choose(self):
+        probs = self.heatmap.probabilities()
+        if not self.bombed:
+            self.bombed = True
+            block = probs[:-1, :-1] + probs[1:, :-1] + probs[:-1, 1:] + probs[1:, 1:]
+            r, c = divmod(int(block.argmax()), self.size - 1)
+            return ("bomb", r, c)
+        r, c = divmod(int(probs.argmax()), self.size)
+        return ("click", r, c)
+
+
+BOTS = {bot.name: bot for bot in (RandomBot, HuntTargetBot, ParityBot, ProbabilityBot)}
+
+
+# ============================================================
+# 【第 7 段】自動對局
+# ============================================================
+def play_game(engine, bot, num_planes, max_steps):
+    """用 bot 玩完一局，回傳 engine (可讀 won / steps)"""
+    engine.start_game(num_planes, max_steps)
+    bot.reset(engine)
+    while not engine.game_over:
+        action, r, c = bot.choose()
+        if action == "bomb":
+            engine.use_bomb()
+        bot.update(engine.on_click(r, c))
+    return engine
@@ -0,0 +1,207 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：串流產生訓練資料 (玩家看到的部分盤面 → 機頭位置 / 機頭機率)，
+#       分成多個固定長度紀錄的分片檔，多個行程同時寫，記憶體用量與樣本數無關
+#       用法：python plane_dataset.py 輸出目錄 --samples 100000000 --shards 64 [--bots parity]
+# ============================================================
+import argparse
+import multiprocessing
+import os
+import random
+import struct
+import time
+
+import numpy as np
+
+import plane_engine
+from plane_batch import CHUNK_SIZE, HEAD, generate_boards
+from plane_bots import BOTS
+from plane_engine import DIFFICULTY_STEPS, PlaneEngine
+from plane_shapes import GRID_SIZE, get_catalog
+
+
+# ============================================================
+# 【第 2 段】分片檔格式 (little endian)
+#   標頭  magic(4) 版本(1) 棋盤大小(1) 飛機數(1) 目標種類(1) 樣本數(8)
+#   之後是固定長度的紀錄，可直接 np.memmap 成結構陣列 (見 record_dtype)：
+#     obs       (size*size,) uint8   UNKNOWN / MISS / HIT_BODY / HIT_HEAD
+#     variants  (飛機數,)     uint8   每架飛機的變體編號 (預覽面板上看得到的形狀)
+#     target    (size*size,) uint8   "heads"：尚未翻開的機頭為 1
+#                            float16 "probs"：與翻開格子一致的所有配置下的機頭機率
+# ============================================================
+MAGIC = b"PLDS"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBQ")
+
+UNKNOWN, MISS, HIT_BODY, HIT_HEAD = 0, 1, 2, 3
+TARGETS = {"heads": 0, "probs": 1}
+
+MAX_REVEALS = max(DIFFICULTY_STEPS.values())   # 每個樣本最多走的步數 (不含空襲)
+BOMB_RATE = 0.5          # 允許策略使用空襲 (多翻開一個 2x2) 的對局比例
+BOT_NAMES = ("random", "hunt-target", "parity")   # 預設輪流使用的策略 (probability 每步都要算機率，太慢)
+
+
+def record_dtype(size=GRID_SIZE, num_planes=2, target="heads"):
+    cells = size * size
+    return np.dtype([("obs", np.uint8, (cells,)), ("variants", np.uint8, (num_planes,)),
+                     ("target", np.uint8 if target == "heads" else np.float16, (cells,))])
+
+
+# ============================================================
+# 【第 3 段】樣本產生器
+# 目的：棋盤用 plane_batch 一次產生一批 (與 place_planes 同分布)，
+#       每張棋盤輪到 bots 中的一種策略 (plane_bots) 真的去玩，走 0 ~ max_reveals 步後的盤面
+#       就是一筆樣本，翻開的格子與真人對局一樣集中在打到的飛機附近；
+#       只有 bomb_rate 比例的對局允許策略呼叫空襲；機頭已全部找到的盤面不收
+# ============================================================
+def iter_samples(count, num_planes=2, rng=None, size=GRID_SIZE, target="heads",
+                 max_reveals=MAX_REVEALS, bomb_rate=BOMB_RATE, bots=BOT_NAMES):
+    """逐批產生 record_dtype 的結構陣列 (每批最多 CHUNK_SIZE 筆)，合計 count 筆"""
+    rng = rng if rng is not None else np.random.default_rng()
+    dtype = record_dtype(size, num_planes, target)
+    catalog = get_catalog(size)
+    cells = size * size
+    variants = np.array([p.variant for p in catalog.placements], dtype=np.uint8)
+    codes = {None: MISS, plane_engine.BODY: HIT_BODY, plane_engine.HEAD: HIT_HEAD}
+    engine = PlaneEngine(size)
+    bot_rng = random.Random(int(rng.integers(1 << 63)))   # 策略用 random.Random 介面，種子取自 rng
+    players = [BOTS[name](bot_rng) for name in bots]
+
+    while count > 0:
+        n = min(CHUNK_SIZE, count)
+        boards, placements = generate_boards(n, num_planes, rng, size)
+        boards = boards.reshape(n, cells)
+        k = rng.integers(0, max_reveals + 1, size=n)
+        bombing = rng.random(n) < bomb_rate
+        picks = rng.integers(0, len(players), size=n)
+
+        obs = np.zeros((n, cells), dtype=np.uint8)
+        alive = np.ones(n, dtype=bool)
+        for i in range(n):
+            engine.start_game(num_planes, cells, [catalog.placements[p] for p in placements[i]])
+            bot = players[picks[i]]
+            bot.reset(engine)
+            if not bombing[i]:
+                bot.bombed = True     # 策略以 bombed 判斷空襲是否已用掉
+            while engine.steps < k[i] and not engine.game_over:
+                action, r, c = bot.choose()
+                if action == "bomb":
+                    engine.use_bomb()
+                events = engine.on_click(r, c)
+                bot.update(events)
+                for er, ec, cell in events:
+                    obs[i, er * size + ec] = codes[cell]
+            alive[i] = not engine.game_over
+
+        chunk = np.zeros(int(alive.sum()), dtype=dtype)
+        boards, obs, placements = boards[alive], obs[alive], placements[alive]
+        heads = boards == HEAD
+        chunk["obs"] = obs
+        chunk["variants"] = variants[placements]
+        if target == "heads":
+            chunk["target"] = heads & (obs == UNKNOWN)
+        else:
+            chunk["target"] = _posteriors(chunk, size)
+
+        count -= len(chunk)
+        yield chunk
+
+
+def _posteriors(chunk, size):
+    """逐筆以 HeadHeatmap 算出精確的機頭機率 (每筆約數毫秒，比 "heads" 慢得多)"""
+    import plane_engine
+    from plane_hints import HeadHeatmap
+    codes = {MISS: None, HIT_BODY: plane_engine.BODY, HIT_HEAD: plane_engine.HEAD}
+    variants = get_catalog(size).variants
+    out = np.zeros((len(chunk), size * size), dtype=np.float16)
+    for i, (obs, ids) in enumerate(zip(chunk["obs"], chunk["variants"])):
+        heatmap = HeadHeatmap([variants[v].shape for v in ids], size)
+        for b in np.flatnonzero(obs):
+            heatmap.observe(*divmod(int(b), size), codes[obs[b]])
+        out[i] = heatmap.probabilities().ravel()
+    return out
+
+
+# ============================================================
+# 【第 4 段】寫入與讀取分片
+# ============================================================
+def write_shard(path, count, num_planes=2, seed=None, size=GRID_SIZE, target="heads", **options):
+    """串流寫入一個分片，回傳樣本數；先寫到暫存檔，完成後才換上"""
+    rng = np.random.default_rng(seed)
+    tmp = path + ".tmp"
+    written = 0
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, num_planes, TARGETS[target], 0))
+        for chunk in iter_samples(count, num_planes, rng, size, target, **options):
+            f.write(chunk.tobytes())
+            written += len(chunk)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, size, num_planes, TARGETS[target], written))
+    os.replace(tmp, path)
+    return written
+
+
+def open_shard(path):
+    """回傳 (資訊 dict, np.memmap 結構陣列)，不把整個分片讀進記憶體"""
+    with open(path, "rb") as f:
+        magic, version, size, num_planes, kind, count = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("資料分片格式錯誤")
+    target = {v: k for k, v in TARGETS.items()}[kind]
+    info = {"size": size, "num_planes": num_planes, "target": target, "count": count}
+    if not count:
+        return info, np.zeros(0, dtype=record_dtype(size, num_planes, target))
+    records = np.memmap(path, dtype=record_dtype(size, num_planes, target), mode="r",
+                        offset=HEADER.size, shape=(count,))
+    return info, records
+
+
+def _write_job(args):
+    path, count, num_planes, seed, size, target, options = args
+    return write_shard(path, count, num_planes, seed, size, target, **options)
+
+
+def export(out_dir, samples, num_planes=2, shards=8, seed=0, size=GRID_SIZE, target="heads", processes=None,
+           **options):
+    """
+    分成 shards 個分片平行寫入 out_dir/shard-00000.plds ...，回傳各分片路徑。
+    第 i 個分片的亂數種子為 (seed, i)，同樣的參數得到同樣的資料；
+    options (max_reveals、bomb_rate、bots) 原樣交給 iter_samples
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    base, extra = divmod(samples, shards)
+    jobs = [(os.path.join(out_dir, f"shard-{i:05d}.plds"), base + (i < extra), num_planes, [seed, i], size, target,
+             options) for i in range(shards)]
+    with multiprocessing.Pool(processes) as pool:
+        for _ in pool.imap_unordered(_write_job, jobs):
+            pass
+    return [job[0] for job in jobs]
+
+
+# ============================================================
+# 【主程式入口】
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="尋找機頭：訓練資料匯出")
+    parser.add_argument("out_dir")
+    parser.add_argument("--samples", type=int, default=1000000)
+    parser.add_argument("--planes", type=int, default=2, choices=(2, 3), help="飛機數量")
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--target", default="heads", choices=list(TARGETS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bots", nargs="+", default=list(BOT_NAMES), choices=list(BOTS),
+                        help="產生盤面的策略 (每局輪到其中一種)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    paths = export(args.out_dir, args.samples, args.planes, args.shards, args.seed,
+                   target=args.target, processes=args.processes, bots=args.bots)
+    elapsed = time.perf_counter() - start
+    total = sum(os.path.getsize(p) for p in paths)
+    print(f"{args.samples} 筆樣本、{len(paths)} 個分片、{total / 1e6:.1f} MB，"
+          f"{elapsed:.1f} 秒 ({args.samples / elapsed:.0f} 筆/秒)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：純規則核心，不依賴任何 GUI 模組，可在無視窗環境大量模擬
+# ============================================================
+import random                             # 產生隨機飛機位置
+from plane_metrics import instrument      # 熱點路徑計時 (未開啟時不包裝)
+from plane_shapes import GRID_SIZE, generate_random_shape, rotate_shape, get_catalog  # 形狀規則與目錄
+
+
+# ============================================================
+# 【第 2 段】遊戲基本參數設定
+# ============================================================
+# 難度 → 步數上限 (與設定視窗的選項一致)
+DIFFICULTY_STEPS = {"簡單": 40, "一般": 30, "困難": 20}
+
+# 格子內容
+HEAD = 'H'               # 機頭
+BODY = 'B'               # 機身 (空格為 None)
+
+# 開啟 PLANE_METRICS 時計時的方法 -> 指標名稱 (毫秒)
+ENGINE_TIMERS = {
+    "start_game": "engine.start_game_ms",
+    "place_planes": "engine.place_planes_ms",
+    "place_seeded": "engine.place_seeded_ms",
+    "on_click": "engine.on_click_ms",
+    "reveal_cell": "engine.reveal_cell_ms",
+    "execute_bomb_at": "engine.bomb_ms",
+}
+
+
+# ============================================================
+# 【第 3 段】PlaneEngine 類別（無 GUI 的遊戲規則）
+# 目的：步數上限、機頭計數、一次性 2x2 空襲與勝負判定
+#       每個動作回傳新翻開的格子 [(r, c, cell), ...] 供前端繪製
+# ============================================================
+class PlaneEngine:
+    def __init__(self, size=GRID_SIZE, rng=None):
+        self.size = size
+        self.rng = rng if rng is not None else random
+        self.seed = None          # 本局棋盤的種子 (沒有種子的棋盤為 None)
+        self._reset_board()       # 建立 grid_data / revealed (子類別可改用其他儲存方式)
+        self.planes = []          # 每架飛機的形狀 (已旋轉，與目錄中的變體共用)
+        self.anchors = []         # 每架飛機機頭所在的 (r, c)
+        self.plane_index = {}     # r * size + c -> 飛機編號 (planes 的索引)
+        self.plane_hits = []      # 每架飛機被翻開的格子數
+        self.plane_heads_found = []  # 每架飛機機頭是否已被找到 (0 / 1)
+        self.total_heads = 0
+        self.found_heads = 0
+        self.steps = 0
+        self.max_steps = 0
+        self.game_over = False
+        self.won = False
+        self.bomb_available = 1
+        self.is_bombing = False
+        instrument(self, ENGINE_TIMERS)
+
+    @property
+    def lost(self):
+        return self.game_over and not self.won
+
+    @property
+    def heads_left(self):
+        return self.total_heads - self.found_heads
+
+    # ========================================================
+    # 【第 4 段】開局與重置
+    # ========================================================
+    def start_game(self, num_planes, max_steps, board=None, seed=None):
+        """
+        board 為事先產生好的 placements (例如取自 BoardPool)，省略則現場放置；
+        seed 為這張棋盤的種子，只給 seed 時由種子產生棋盤 (見 ShapeCatalog.board_from_seed)
+        """
+        self.seed = seed
+        self.max_steps = max_steps
+        self.steps = 0
+        self.total_heads = num_planes
+        self.found_heads = 0
+        self.planes.clear()
+        self.anchors.clear()
+        self.plane_index.clear()
+        self.plane_hits.clear()
+        self.plane_heads_found.clear()
+        self.bomb_available = 1
+        self.game_over = False
+        self.won = False
+        self.is_bombing = False
+        self._reset_board()
+        if board is not None:
+            self.place_board(board)
+        elif seed is not None:
+            self.place_seeded(num_planes, seed)
+        else:
+            self.place_planes(num_planes)
+
+    def _reset_board(self):
+        size = self.size
+        self.grid_data = [[None] * size for _ in range(size)]
+        self.revealed = [[False] * size for _ in range(size)]
+
+    # ========================================================
+    # 【第 5 段】飛機放置
+    # ========================================================
+    def generate_random_shape(self):
+        return generate_random_shape(self.rng)
+
+    def rotate_shape(self, shape, angle):
+        return rotate_shape(shape, angle)
+
+    def place_planes(self, count):
+        """從形狀目錄直接抽合法放置，不會失敗也不需重試 (見 ShapeCatalog.sample)"""
+        self.place_board(get_catalog(self.size).sample_board(count, self.rng))
+
+    def place_seeded(self, count, seed):
+        self.place_board(get_catalog(self.size).board_from_seed(seed, count))
+
+    def place_board(self, board):
+        variants = get_catalog(self.size).variants
+        for placement in board:
+            self.add_plane_to_grid(placement.r, placement.c, variants[placement.variant].shape)
+
+    def is_valid_position(self, r, c, shape):
+        size = self.size
+        grid = self.grid_data
+        for dx, dy in shape:
+            nr, nc = r + dy, c + dx
+            if not (0 <= nr < size and 0 <= nc < size): return False
+            if grid[nr][nc] is not None: return False
+        return True
+
+    def add_plane_to_grid(self, r, c, shape):
+        grid = self.grid_data
+        for i, (dx, dy) in enumerate(shape):
+            grid[r + dy][c + dx] = HEAD if i == 0 else BODY
+        self._register_plane(r, c, shape)
+
+    def _register_plane(self, r, c, shape):
+        """記錄飛機並建立格子 -> 飛機編號的索引"""
+        plane_id = len(self.planes)
+        size = self.size
+        for dx, dy in shape:
+            self.plane_index[(r + dy) * size + c + dx] = plane_id
+        self.planes.append(shape)
+        self.anchors.append((r, c))
+        self.plane_hits.append(0)
+        self.plane_heads_found.append(0)
+
+    # ========================================================
+    # 【第 6 段】點擊翻格 (包含勝負判定)
+    # ========================================================
+    def cell_at(self, r, c):
+        return self.grid_data[r][c]
+
+    def is_revealed(self, r, c):
+        return self.revealed[r][c]
+
+    def plane_id_at(self, r, c):
+        """(r, c) 屬於哪一架飛機，空格回傳 None"""
+        return self.plane_index.get(r * self.size + c)
+
+    def on_click(self, r, c):
+        if self.game_over: return []
+
+        if self.is_bombing:
+            return self.execute_bomb_at(r, c)
+
+        if self.is_revealed(r, c): return []
+
+        self.steps += 1
+        if self.steps > self.max_steps:
+            self.game_over = True # 步數用盡，作戰失敗
+            return []
+
+        return self.reveal_cell(r, c)
+
+    def reveal_cell(self, r, c):
+        if self.revealed[r][c]: return []
+        self.revealed[r][c] = True
+
+        cell = self.grid_data[r][c]
+        if cell is not None:
+            self._hit(r * self.size + c, cell)
+        return [(r, c, cell)]
+
+    def _hit(self, key, cell):
+        """翻到飛機格子：更新該架飛機的計數，並判定是否勝利"""
+        plane_id = self.plane_index[key]
+        self.plane_hits[plane_id] += 1
+        if cell == HEAD:
+            self.plane_heads_found[plane_id] += 1
+            self.found_heads += 1
+            if self.found_heads == self.total_heads:
+                self.game_over = True
+                self.won = True
+
+    def reveal_all_planes(self):
+        """遊戲結束後，列出所有飛機格子"""
+        size = self.size
+        grid = self.grid_data
+        return [(r, c, grid[r][c]) for r in range(size) for c in range(size)
+                if grid[r][c] is not None]
+
+    def revealed_cells(self):
+        """目前已翻開的格子 [(r, c, cell), ...] (玩家所知的盤面)"""
+        size = self.size
+        return [(r, c, self.cell_at(r, c)) for r in range(size) for c in range(size)
+                if self.is_revealed(r, c)]
+
+    # ========================================================
+    # 【第 7 段】空襲 (一次性 2x2 轟炸，不計步數)
+    # ========================================================
+    def use_bomb(self):
+        """切換空襲鎖定狀態，回傳目前是否處於鎖定中"""
+        if self.bomb_available <= 0 or self.game_over: return False
+        self.is_bombing = not self.is_bombing
+        return self.is_bombing
+
+    def execute_bomb_at(self, r, c):
+        """執行 2x2 轟炸 (點擊點 + 右 + 下 + 右下)"""
+        self.bomb_available = 0
+        self.is_bombing = False
+
+        size = self.size
+        events = []
+        for dr in range(0, 2):
+            for dc in range(0, 2):
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < size and 0 <= nc < size:
+                    events += self.reveal_cell(nr, nc)
+        return events
@@ -0,0 +1,187 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：機頭機率提示，機率取自所有與已翻開格子一致的飛機配置
+# ============================================================
+import threading
+
+import numpy as np
+
+from plane_batch import catalog_arrays
+from plane_engine import HEAD, BODY
+from plane_shapes import GRID_SIZE, get_catalog
+
+
+INFO_SAMPLE = 4096       # 計算空襲資訊量時最多取樣的配置數 (維持在一個畫面更新內)
+
+
+# ============================================================
+# 【第 2 段】目錄轉成位元陣列
+# 目的：每個 placement 的遮罩拆成數個 uint64 字組，方便向量化 AND
+# ============================================================
+_ARRAYS = {}
+
+
+def placement_arrays(size=GRID_SIZE):
+    """回傳 (words, covers, heads)，依棋盤大小快取；有配置索引時直接取用索引中的陣列"""
+    arrays = _ARRAYS.get(size)
+    if arrays is None and config_index(size) is not None:
+        index = config_index(size)
+        words = np.ascontiguousarray(index.masks, dtype="<u8")
+        covers = np.unpackbits(words.view(np.uint8), axis=1, bitorder="little")[:, :size * size].astype(bool)
+        arrays = _ARRAYS[size] = (words, covers, index.heads.astype(np.int32))
+    if arrays is None:
+        catalog = get_catalog(size)
+        cells = size * size
+        n_words = (cells + 63) // 64
+        words = np.array([[(p.mask >> (64 * w)) & (2**64 - 1) for w in range(n_words)]
+                          for p in catalog.placements], dtype=np.uint64)
+        covers = np.array([[p.mask >> b & 1 for b in range(cells)]
+                           for p in catalog.placements], dtype=bool)
+        heads = np.array([p.r * size + p.c for p in catalog.placements], dtype=np.int32)
+        arrays = _ARRAYS[size] = (words, covers, heads)
+    return arrays
+
+
+def config_boards(configs, size=GRID_SIZE):
+    """把配置展開成盤面 (M, size * size) uint8：0 空格、1 機身、2 機頭"""
+    cells, heads = catalog_arrays(size)[:2]
+    n = len(configs)
+    values = np.zeros((n, size * size + 1), dtype=np.uint8)
+    rows = np.arange(n)
+    for k in range(configs.shape[1]):
+        values[rows[:, None], cells[configs[:, k]]] = 1
+    for k in range(configs.shape[1]):
+        values[rows, heads[configs[:, k]]] = 2
+    return values[:, :-1]
+
+
+def enumerate_configs(planes, size=GRID_SIZE):
+    """
+    列出已知形狀 planes 的所有互不重疊擺法。
+    回傳 (M, 飛機數) 的 placement 索引陣列，第 j 欄是第 j 架飛機的位置。
+    """
+    catalog = get_catalog(size)
+    words = placement_arrays(size)[0]
+    variant_of = np.array([p.variant for p in catalog.placements])
+    options = [np.flatnonzero(variant_of == catalog.variant_of(shape)) for shape in planes]
+
+    configs = options[0][:, None]
+    union = words[options[0]]
+    for opts in options[1:]:
+        free = ~(union[:, None, :] & words[opts][None, :, :]).any(axis=2)
+        idx, pick = np.nonzero(free)
+        configs = np.column_stack([configs[idx], opts[pick]])
+        union = union[idx] | words[opts[pick]]
+    return configs.astype(np.int32)
+
+
+_INDEX = {}
+_INDEX_LOCK = threading.Lock()   # 提示在 AnalysisWorker 執行緒載入，與 UI 執行緒共用
+
+
+def config_index(size=GRID_SIZE):
+    """
+    第一次用到時載入 (沒有檔案或與目前形狀目錄不符就重新建立) plane_index 的配置索引，之後共用同一份；
+    只支援預設棋盤大小，無法建立或讀取時回傳 None
+    """
+    if size != GRID_SIZE:
+        return None
+    with _INDEX_LOCK:
+        if size not in _INDEX:
+            try:
+                from plane_index import load_index
+                _INDEX[size] = load_index(size=size)
+            except (OSError, ValueError):
+                _INDEX[size] = None
+        return _INDEX[size]
+
+
+def find_configs(planes, size=GRID_SIZE):
+    """同 enumerate_configs，有配置索引時改用 ConfigIndex.configs_for"""
+    index = config_index(size)
+    if index is None:
+        return enumerate_configs(planes, size)
+    catalog = get_catalog(size)
+    return index.configs_for([catalog.variant_of(shape) for shape in planes])
+
+
+# ============================================================
+# 【第 3 段】HeadHeatmap 類別
+# 目的：每次翻格只篩掉不一致的配置，並從計數中扣掉被刪除的部分
+# ============================================================
+class HeadHeatmap:
+    def __init__(self, planes, size=GRID_SIZE, configs=None):
+        """configs 可直接傳入，省略則由 find_configs 查配置索引 (沒有索引才現場列舉)"""
+        self.size = size
+        _, self._covers, self._heads = placement_arrays(size)
+        self.configs = configs if configs is not None else find_configs(planes, size)
+        self.revealed = np.zeros(size * size, dtype=bool)
+        self.counts = np.bincount(self._heads[self.configs].ravel(), minlength=size * size)
+
+    def observe(self, r, c, cell):
+        """翻開 (r, c) 看到 cell (None / BODY / HEAD) 後更新"""
+        b = r * self.size + c
+        if self.revealed[b]: return
+        self.revealed[b] = True
+
+        configs = self.configs
+        is_head = (self._heads[configs] == b).any(axis=1)
+        if cell == HEAD:
+            keep = is_head
+        else:
+            covered = self._covers[configs, b].any(axis=1)
+            keep = covered & ~is_head if cell == BODY else ~covered
+
+        if keep.all(): return
+        removed = self._heads[configs[~keep]].ravel()
+        self.counts -= np.bincount(removed, minlength=len(self.counts))
+        self.configs = configs[keep]
+
+    def observe_all(self, events):
+        for r, c, cell in events:
+            self.observe(r, c, cell)
+
+    def probabilities(self):
+        """(size, size) 的機頭機率，已翻開的格子為 0"""
+        total = len(self.configs)
+        probs = self.counts / total if total else np.zeros(len(self.counts))
+        probs[self.revealed] = 0.0
+        return probs.reshape(self.size, self.size)
+
+    # ========================================================
+    # 【第 4 段】空襲建議
+    # 目的：一次算出每個 2x2 位置 (左上角 r, c) 的分數
+    #   "heads"：預期炸到的機頭數 (各格機頭機率相加，精確)
+    #   "info" ：預期資訊量，即 2x2 結果的熵 (bits)；配置多於 max_configs 時
+    #            均勻間隔取樣估計，配置數少時為精確值
+    # ========================================================
+    def bomb_scores(self, metric="heads", max_configs=INFO_SAMPLE):
+        size = self.size
+        if metric == "heads":
+            probs = np.zeros((size + 1, size + 1))
+            probs[:size, :size] = self.probabilities()
+            return probs[:-1, :-1] + probs[1:, :-1] + probs[:-1, 1:] + probs[1:, 1:]
+
+        configs = self.configs
+        if len(configs) > max_configs:
+            configs = configs[np.linspace(0, len(configs) - 1, max_configs).astype(np.int64)]
+        n = len(configs)
+        if not n:
+            return np.zeros((size, size))
+
+        # 每個配置每一格的內容，棋盤外補一圈 0
+        grid = np.zeros((n, size + 1, size + 1), dtype=np.uint8)
+        grid[:, :size, :size] = config_boards(configs, size).reshape(n, size, size)
+
+        codes = grid[:, :-1, :-1] * 27 + grid[:, 1:, :-1] * 9 + grid[:, :-1, 1:] * 3 + grid[:, 1:, 1:]
+        anchors = np.arange(size * size).reshape(size, size) * 81
+        counts = np.bincount((codes + anchors).ravel(), minlength=size * size * 81).reshape(size * size, 81)
+        p = counts / n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropy = -np.where(p > 0, p * np.log2(p), 0.0).sum(axis=1)
+        return entropy.reshape(size, size)
+
+    def best_bomb(self, metric="heads"):
+        """分數最高的 2x2 左上角 (r, c)"""
+        scores = self.bomb_scores(metric)
+        return divmod(int(scores.argmax()), self.size)
@@ -0,0 +1,184 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：事先列舉所有合法放置 (遮罩、機頭、變體) 並寫成可 mmap 的檔案，
+#       解題器、提示與難度分析直接載入，2 架配置查表、3 架配置由相容表即時列出
+#       用法：python plane_index.py build [路徑]
+#             python plane_index.py info  [路徑]
+# ============================================================
+import hashlib
+import os
+import struct
+import sys
+
+import numpy as np
+
+from plane_shapes import ANGLES, BODY_LENGTHS, GRID_SIZE, WING_LENGTHS, build_shape, get_catalog, rotate_shape
+
+
+# ============================================================
+# 【第 2 段】檔案格式 (little endian，每段陣列對齊 8 bytes)
+#   標頭  magic(4) 版本(1) 鄰居欄位寬度(1) 棋盤大小(2) placement 數 P(4) 遮罩字組數 W(4) 鄰居總數 N(8)
+#         參數雜湊(8)：產生目錄的參數 (見 params_hash)，與目前程式不符時 load_index 重新建立
+#   masks      (P, W) uint64   placement 佔用的位元 (位元 r * size + c)
+#   heads      (P,)   int16    機頭位置 r * size + c
+#   variants   (P,)   uint8    變體編號
+#   offsets    (P+1,) uint32   鄰居表 CSR 的起點
+#   neighbors  (N,)   uint16   與該 placement 不重疊的所有 placement (遞增)
+#
+#   10x10 上互不重疊的 2 架配置約 258 萬組，直接存下 (雙向約 10 MB)；
+#   3 架配置約 8.3 億組，全部展開要數 GB，因此只存上面的相容表，
+#   3 架配置 = i < j < k 且 j、k 都在 i 的鄰居表、k 在 j 的鄰居表，用交集即時列出；
+#   configs_for 只需要少數變體之間的相容表，由遮罩 AND 直接算比逐一查鄰居表快
+# ============================================================
+MAGIC = b"PLIX"
+VERSION = 3
+HEADER = struct.Struct("<4sBBHIIQ8s")
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plane_configs.idx")
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _layout(count, n_words, n_neighbors, neighbor_dtype):
+    """各陣列在檔案中的 (名稱, dtype, shape, 位移)"""
+    arrays = [("masks", np.uint64, (count, n_words)), ("heads", np.int16, (count,)),
+              ("variants", np.uint8, (count,)), ("offsets", np.uint32, (count + 1,)),
+              ("neighbors", neighbor_dtype, (n_neighbors,))]
+    pos = _align(HEADER.size)
+    layout = []
+    for name, dtype, shape in arrays:
+        layout.append((name, dtype, shape, pos))
+        pos = _align(pos + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+    return layout
+
+
+def params_hash(size=GRID_SIZE):
+    """
+    產生目錄的參數 (格式版本、棋盤大小、機身 / 機翼長度、角度) 與依目錄順序展開的 72 個形狀，
+    8 bytes 雜湊；不建完整目錄，載入時檢查不到 1 毫秒
+    """
+    shapes = [rotate_shape(build_shape(body_len, wing_len, tail), angle)
+              for body_len in BODY_LENGTHS for wing_len in WING_LENGTHS
+              for tail in (False, True) for angle in ANGLES]
+    text = repr((VERSION, size, BODY_LENGTHS, WING_LENGTHS, ANGLES, shapes))
+    return hashlib.blake2b(text.encode(), digest_size=8).digest()
+
+
+# ============================================================
+# 【第 3 段】建立索引
+# ============================================================
+def build_index(path=DEFAULT_PATH, size=GRID_SIZE):
+    catalog = get_catalog(size)
+    count = len(catalog.placements)
+    cells = size * size
+    n_words = (cells + 63) // 64
+
+    masks = np.array([[(p.mask >> (64 * w)) & (2**64 - 1) for w in range(n_words)]
+                      for p in catalog.placements], dtype=np.uint64)
+    covers = np.array([[p.mask >> b & 1 for b in range(cells)] for p in catalog.placements], dtype=np.float32)
+    free = (covers @ covers.T) == 0          # 兩個 placement 沒有共用格子
+    rows, cols = np.nonzero(free)            # 依列排序，直接就是 CSR
+    offsets = np.searchsorted(rows, np.arange(count + 1)).astype(np.uint32)
+    neighbor_dtype = np.uint16 if count < 2**16 else np.uint32
+
+    data = {
+        "masks": masks,
+        "heads": np.array([p.r * size + p.c for p in catalog.placements], dtype=np.int16),
+        "variants": np.array([p.variant for p in catalog.placements], dtype=np.uint8),
+        "offsets": offsets,
+        "neighbors": cols.astype(neighbor_dtype),
+    }
+    tmp = f"{path}.{os.getpid()}.tmp"        # 多個行程同時建立時各寫各的暫存檔
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, np.dtype(neighbor_dtype).itemsize, size, count, n_words,
+                            len(cols), params_hash(size)))
+        for name, _, _, pos in _layout(count, n_words, len(cols), neighbor_dtype):
+            f.write(b"\0" * (pos - f.tell()))
+            f.write(data[name].tobytes())
+    os.replace(tmp, path)     # 寫完才換上，讀取端不會看到寫一半的檔案
+    return path
+
+
+# ============================================================
+# 【第 4 段】ConfigIndex 類別 (mmap 載入)
+# ============================================================
+class ConfigIndex:
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:4] != MAGIC or header[4] != VERSION:
+            raise ValueError("索引檔格式錯誤")
+        _, _, width, self.size, count, n_words, n_neighbors, self.params = HEADER.unpack(header)
+        neighbor_dtype = np.uint16 if width == 2 else np.uint32
+        for name, dtype, shape, pos in _layout(count, n_words, n_neighbors, neighbor_dtype):
+            setattr(self, name, np.memmap(path, dtype=dtype, mode="r", offset=pos, shape=shape))
+
+    def __len__(self):
+        return len(self.heads)
+
+    def compatible(self, i):
+        """與 placement i 不重疊的 placement (遞增)"""
+        return self.neighbors[self.offsets[i]:self.offsets[i + 1]]
+
+    def pair_count(self):
+        return len(self.neighbors) // 2
+
+    def iter_pairs(self):
+        """逐一列出 i 的所有 (i, j)，i < j，每次一個 (n, 2) 陣列"""
+        for i in range(len(self)):
+            js = self.compatible(i)
+            js = js[js > i]
+            if len(js):
+                yield np.column_stack([np.full(len(js), i, dtype=js.dtype), js])
+
+    def iter_triples(self):
+        """逐一列出 i < j < k 的所有三架配置，每次一個 (n, 3) 陣列"""
+        for i in range(len(self)):
+            ni = self.compatible(i)
+            ni = ni[ni > i]
+            for j in ni:
+                ks = np.intersect1d(ni[ni > j], self.compatible(j), assume_unique=True)
+                if len(ks):
+                    yield np.column_stack([np.full(len(ks), i, dtype=ks.dtype),
+                                           np.full(len(ks), j, dtype=ks.dtype), ks])
+
+    def configs_for(self, variants):
+        """
+        指定每架飛機的變體編號，列出所有互不重疊的擺法。
+        回傳 (M, 飛機數) 的 placement 索引，與 plane_hints.enumerate_configs 相同。
+        """
+        options = [np.flatnonzero(self.variants == v) for v in variants]
+        configs = options[0][:, None]
+        for j in range(1, len(options)):
+            allowed = np.ones((len(configs), len(options[j])), dtype=bool)
+            for m in range(j):
+                # 兩組候選之間的相容表 (遮罩 AND 為 0 即不重疊)
+                table = ~(self.masks[options[m]][:, None, :] & self.masks[options[j]][None, :, :]).any(axis=2)
+                allowed &= table[np.searchsorted(options[m], configs[:, m])]
+            idx, pick = np.nonzero(allowed)
+            configs = np.column_stack([configs[idx], options[j][pick]])
+        return configs.astype(np.int32)
+
+
+def load_index(path=DEFAULT_PATH, size=GRID_SIZE):
+    """載入索引；檔案不存在、格式不符或產生參數與目前程式不一致時重新建立"""
+    try:
+        index = ConfigIndex(path)
+    except (OSError, ValueError):
+        index = None
+    if index is None or index.size != size or index.params != params_hash(size):
+        build_index(path, size)
+        index = ConfigIndex(path)
+    return index
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "info"
+    target = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH
+    if command == "build":
+        build_index(target)
+    index = ConfigIndex(target)
+    print(f"{target}: {index.size}x{index.size}，{len(index)} 種放置，"
+          f"{index.pair_count()} 組 2 架配置，{os.path.getsize(target) / 1e6:.1f} MB")
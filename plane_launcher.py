@@ -0,0 +1,64 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：遊戲入口，有顯示器時開 Tk 視窗版，否則 (或指定 --term) 用終端機版；
+#       tkinter 只在真的要開視窗時才載入，終端機版完全不碰 GUI 模組
+#       用法：python plane_launcher.py [--gui | --term] [終端機版的參數...]
+# ============================================================
+import importlib.util
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GUI_PATH = os.path.join(HERE, "airplane 3.py")   # 檔名有空白，不能直接 import
+
+
+def has_display():
+    """Windows / macOS 一律視為有；其他系統看 DISPLAY 或 WAYLAND_DISPLAY"""
+    if sys.platform.startswith(("win", "darwin")):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def load_gui():
+    spec = importlib.util.spec_from_file_location("airplane_gui", GUI_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_gui():
+    """開 Tk 視窗版；沒有 tkinter 或無法建立視窗時回傳原因字串，成功玩完回傳 None"""
+    try:
+        gui = load_gui()
+    except ImportError as e:
+        return f"無法載入 tkinter ({e})"
+    try:
+        gui.main()
+    except gui.tk.TclError as e:
+        return f"無法建立視窗 ({e})"
+    return None
+
+
+# ============================================================
+# 【主程式入口】
+# ============================================================
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    mode = "gui" if has_display() else "term"
+    for flag in ("--gui", "--term"):
+        if flag in argv:
+            argv.remove(flag)
+            mode = flag[2:]
+
+    if mode == "gui":
+        reason = run_gui()
+        if reason is None:
+            return
+        print(f"{reason}，改用終端機版", file=sys.stderr)
+
+    import plane_term
+    plane_term.main(argv)
+
+
+if __name__ == "__main__":
+    main()
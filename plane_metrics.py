@@ -0,0 +1,247 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：熱點路徑的計時與計數 (放置嘗試次數、產生棋盤、點擊到畫面更新、空襲、預覽繪製)，
+#       存成行程內的直方圖，可輸出 JSON 或由本機 HTTP 端點抓取
+#       環境變數 PLANE_METRICS=1 開啟；關閉時 instrument 不包裝任何方法，
+#       放置程式裡只剩一次 METRICS.enabled 的屬性檢查
+#       用法：PLANE_METRICS=1 PLANE_METRICS_PORT=9464 python "airplane 3.py"
+#             python plane_metrics.py --games 2000         (無 GUI 模擬後輸出 JSON)
+#       plane_engine 會匯入本模組，json / http.server / argparse 等到用到才載入 (終端機版要快速啟動)
+# ============================================================
+import bisect
+import functools
+import os
+import threading
+import time
+
+# 直方圖的桶上界；名稱以 _ms 結尾的用毫秒桶 (Prometheus 輸出時換成秒)，其他 (次數) 用次數桶
+MS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+COUNT_BUCKETS = (1, 2, 3, 4, 6, 8, 10, 20, 50, 100, 200, 500, 1000)
+PORT = 9464              # PLANE_METRICS_PORT 未指定時 serve() 的預設埠
+
+
+# ============================================================
+# 【第 2 段】Histogram 類別
+# 目的：固定桶的直方圖 (同 Prometheus)，百分位數以所在桶的上界估計
+# ============================================================
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # 最後一格為超過最大上界 (+Inf)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min: self.min = value
+        if self.max is None or value > self.max: self.max = value
+
+    def percentile(self, pct):
+        if not self.count: return None
+        rank = self.count * pct / 100
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count, "sum": self.sum, "min": self.min, "max": self.max,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(50), "p90": self.percentile(90), "p99": self.percentile(99),
+            "buckets": {str(b): n for b, n in zip(self.bounds + ("+Inf",), self.counts)},
+        }
+
+
+# ============================================================
+# 【第 3 段】Registry 類別
+# 目的：所有直方圖與計數器集中在一個 METRICS 物件；
+#       背景執行緒 (BoardPool、分析) 與 UI 執行緒都會寫入，以鎖保護
+# ============================================================
+class Registry:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, value):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram(MS_BUCKETS if name.endswith("_ms") else COUNT_BUCKETS)
+            hist.observe(value)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {"counters": dict(self.counters),
+                    "histograms": {name: h.snapshot() for name, h in sorted(self.histograms.items())}}
+
+    def dump_json(self, path=None):
+        """回傳 JSON 字串，給 path 時同時寫入檔案"""
+        import json
+        text = json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    def prometheus(self):
+        """
+        Prometheus 文字格式 (名稱中的 . 換成 _，加上 plane_ 前綴)；
+        依 Prometheus 慣例用基本單位，_ms 的直方圖輸出為 _seconds (桶上界與總和都換成秒)
+        """
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = "plane_" + name.replace(".", "_")
+                lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+            for name, h in sorted(self.histograms.items()):
+                bounds, scale = h.bounds, 1
+                if name.endswith("_ms"):
+                    name, scale = name[:-3] + "_seconds", 1000
+                    bounds = tuple(b / scale for b in bounds)
+                metric = "plane_" + name.replace(".", "_")
+                lines.append(f"# TYPE {metric} histogram")
+                total = 0
+                for bound, n in zip(bounds + ("+Inf",), h.counts):
+                    total += n
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {total}')
+                lines += [f"{metric}_sum {h.sum / scale}", f"{metric}_count {h.count}"]
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Registry(enabled=os.environ.get("PLANE_METRICS", "") not in ("", "0"))
+
+
+def enable(on=True):
+    """開啟或關閉記錄；只影響之後建立的引擎與畫面 (instrument 在建構時決定)"""
+    METRICS.enabled = on
+
+
+# ============================================================
+# 【第 4 段】方法計時
+# 目的：instrument(obj, {方法名稱: 指標名稱}) 把 obj 的這些方法換成計時版本
+#       (只改這個物件，不改類別)；未開啟時原樣回傳，完全沒有額外成本。
+#       要在把 bound method 交給別人 (例如 Tk 的 command) 之前呼叫
+# ============================================================
+def _timed(method, name):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            METRICS.observe(name, (time.perf_counter() - start) * 1000)
+    return wrapper
+
+
+def instrument(obj, timers):
+    if METRICS.enabled:
+        for attr, name in timers.items():
+            setattr(obj, attr, _timed(getattr(obj, attr), name))
+    return obj
+
+
+def mark_idle(root, name, start=None):
+    """
+    從現在 (或 start，time.perf_counter() 的值) 到 Tk 處理完目前排入的閒置工作
+    (包含格子重畫) 的時間，即點擊到畫面更新的延遲；呼叫前先檢查 METRICS.enabled
+    """
+    if start is None:
+        start = time.perf_counter()
+    root.after_idle(lambda: METRICS.observe(name, (time.perf_counter() - start) * 1000))
+
+
+# ============================================================
+# 【第 5 段】HTTP 端點
+# 目的：GET /metrics 為 Prometheus 文字格式，GET /metrics.json 為 JSON；
+#       預設只綁 127.0.0.1，在背景執行緒服務
+# ============================================================
+def _handler_class():
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                body, kind = METRICS.prometheus(), "text/plain; version=0.0.4"
+            elif path == "/metrics.json":
+                body, kind = METRICS.dump_json(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", kind + "; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass                  # 不在終端機印每次抓取
+    return Handler
+
+
+def serve(port=PORT, host="127.0.0.1"):
+    """啟動背景 HTTP 伺服器並回傳 (呼叫 shutdown() 停止)；port 為 0 時由系統指定"""
+    from http.server import ThreadingHTTPServer
+    server = ThreadingHTTPServer((host, port), _handler_class())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def serve_from_env():
+    """PLANE_METRICS 開啟且有 PLANE_METRICS_PORT 時啟動端點，否則回傳 None"""
+    port = os.environ.get("PLANE_METRICS_PORT")
+    if not METRICS.enabled or not port:
+        return None
+    return serve(int(port))
+
+
+# ============================================================
+# 【主程式入口】
+# 目的：無 GUI 跑一批對局 (plane_bots)，印出或寫出收集到的指標
+# ============================================================
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="尋找機頭：熱點路徑指標")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--planes", type=int, default=2, choices=(2, 3), help="飛機數量")
+    parser.add_argument("--bot", default="hunt-target", help="plane_bots 的策略名稱")
+    parser.add_argument("--out", help="JSON 輸出路徑 (省略則印出)")
+    args = parser.parse_args(argv)
+
+    import random
+    import plane_metrics          # 以 python plane_metrics.py 執行時本檔是 __main__，要用引擎看到的那一份
+    plane_metrics.enable()
+    from plane_bots import BOTS, play_game
+    from plane_engine import DIFFICULTY_STEPS, PlaneEngine
+    rng = random.Random(0)
+    engine = PlaneEngine(rng=rng)
+    bot = BOTS[args.bot](rng)
+    for _ in range(args.games):
+        play_game(engine, bot, args.planes, DIFFICULTY_STEPS["一般"])
+    text = plane_metrics.METRICS.dump_json(args.out)
+    if not args.out:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
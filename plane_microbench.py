@@ -0,0 +1,459 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：熱點路徑的微基準測試，結果寫成 JSON 並與存好的基準比較，
+#       任何一項變慢超過門檻 (百分比) 就以非 0 結束碼失敗
+#       基準中有、這次卻沒有結果 (被略過) 的指標同樣算失敗
+#       用法：python plane_microbench.py                  與基準比較
+#             python plane_microbench.py --save-baseline --runs 5   以本機結果 (5 次的中位數) 取代基準
+#             python plane_microbench.py --only gui --save-baseline   只更新基準中的 GUI 項目
+#       沒有 DISPLAY 的 Linux 上若裝了 Xvfb，GUI 項目自動在虛擬顯示器上跑
+# ============================================================
+import argparse
+import contextlib
+import importlib.util
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+from plane_engine import DIFFICULTY_STEPS, PlaneEngine
+from plane_shapes import QUICK_PICKS, generate_random_shape, get_catalog, rotate_shape
+from plane_sparse import SparseEngine
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "plane_microbench_baseline.json")
+GUI_PATH = os.path.join(HERE, "airplane 3.py")
+
+THRESHOLD = 25.0         # 預設的退步門檻 (%)
+REPEAT = 15              # 每項量 REPEAT 輪取中位數
+ROUND_SECONDS = 0.05     # 每輪至少這麼久 (依本機速度決定每輪呼叫次數)
+# 比較容易受干擾的項目另訂門檻 (%)：同一台機器上未改程式碼、以 reference 校正後，
+# 這一項單次執行與多次中位數仍差到約 ±17%，其餘項目在 ±16% 以內
+TOLERANCES = {
+    "generate_random_shape": 40.0,
+}
+SEED = 2024              # 所有測試用固定種子，計數類指標每次結果相同
+COUNT_BOARDS = 2000      # 統計嘗試次數 / 失敗率時產生的棋盤數
+CROWDED_PLANES = 6       # 10x10 上放這麼多架時，SparseEngine 已接近 MAX_ATTEMPTS 上限
+GUI_METRICS = ("gui.start_game", "gui.draw_plane_previews")
+
+
+# ============================================================
+# 【第 2 段】計時項目
+# 目的：每項是 (名稱, 建立函式)；建立函式做完所有準備，
+#       回傳要計時的無參數函式 (準備的時間不計入)
+# ============================================================
+def _fixed_board(num_planes=2):
+    return get_catalog().sample_board(num_planes, random.Random(SEED))
+
+
+def bench_place_planes(engine_class, num_planes):
+    def build():
+        engine = engine_class(rng=random.Random(SEED))
+
+        def run():
+            engine._reset_board()
+            engine.planes.clear(); engine.anchors.clear(); engine.plane_index.clear()
+            engine.plane_hits.clear(); engine.plane_heads_found.clear()
+            engine.place_planes(num_planes)
+        return run
+    return build
+
+
+def bench_is_valid_position():
+    engine = PlaneEngine()
+    engine.start_game(2, DIFFICULTY_STEPS["一般"], _fixed_board())
+    shapes = [v.shape for v in get_catalog().variants[::8]]
+    positions = [(r, c) for r in range(engine.size) for c in range(engine.size)]
+
+    def run():
+        for shape in shapes:
+            for r, c in positions:
+                engine.is_valid_position(r, c, shape)
+    return run
+
+
+def bench_rotate_shape():
+    shapes = [generate_random_shape(random.Random(i)) for i in range(16)]
+
+    def run():
+        for shape in shapes:
+            for angle in (0, 90, 180, 270):
+                rotate_shape(shape, angle)
+    return run
+
+
+def bench_generate_random_shape():
+    rng = random.Random(SEED)
+    return lambda: generate_random_shape(rng)
+
+
+def bench_reveal_sequence(engine_class):
+    """同一張棋盤依固定的亂序點到結束 (不設步數上限)，再列出全部飛機格子"""
+    def build():
+        engine = engine_class()
+        board = _fixed_board()
+        order = [(r, c) for r in range(engine.size) for c in range(engine.size)]
+        random.Random(SEED).shuffle(order)
+        no_limit = engine.size * engine.size
+
+        def run():
+            engine.start_game(2, no_limit, board)
+            for r, c in order:
+                engine.on_click(r, c)
+                if engine.game_over: break
+            engine.reveal_all_planes()
+        return run
+    return build
+
+
+def bench_reference():
+    """與遊戲無關的固定 Python 工作量，當成本機當下速度的尺 (見 compare)"""
+    data = list(range(1000))
+
+    def run():
+        total = 0
+        seen = {}
+        for i in data:
+            total += i * i
+            seen[i & 63] = total
+        return total
+    return run
+
+
+REFERENCE = "reference"
+CASES = [
+    (REFERENCE, bench_reference),
+    ("place_planes", bench_place_planes(PlaneEngine, 2)),
+    ("place_planes_3", bench_place_planes(PlaneEngine, 3)),
+    ("place_planes_sparse", bench_place_planes(SparseEngine, 2)),
+    ("is_valid_position", bench_is_valid_position),
+    ("rotate_shape", bench_rotate_shape),
+    ("generate_random_shape", bench_generate_random_shape),
+    ("reveal_sequence", bench_reveal_sequence(PlaneEngine)),
+    ("reveal_sequence_sparse", bench_reveal_sequence(SparseEngine)),
+]
+TIMED_METRICS = {name for name, _ in CASES} | set(GUI_METRICS)
+
+
+def calibrate(timer, seconds=ROUND_SECONDS):
+    """每輪的呼叫次數，讓一輪至少花 seconds 秒 (順便暖機)"""
+    number, elapsed = timer.autorange()
+    return max(1, math.ceil(number * seconds / elapsed))
+
+
+def time_cases(cases, repeat):
+    """
+    回傳 {名稱: 每次呼叫的微秒數}。所有項目輪流各量一輪、共 repeat 輪，
+    短暫的干擾 (其他行程、CPU 降頻) 會分散到各項目的不同輪，再取每項的中位數
+    """
+    timers = []
+    for name, build in cases:
+        timer = timeit.Timer(build())
+        timers.append((name, timer, calibrate(timer)))
+    samples = {name: [] for name, _, _ in timers}
+    for _ in range(repeat):
+        for name, timer, number in timers:
+            samples[name].append(timer.timeit(number) / number * 1e6)
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def time_call(run, repeat):
+    """單一項目：每次呼叫的微秒數 (repeat 輪的中位數)"""
+    timer = timeit.Timer(run)
+    number = calibrate(timer)
+    return statistics.median(timer.repeat(repeat, number)) / number * 1e6
+
+
+# ============================================================
+# 【第 3 段】放置的嘗試次數與失敗率
+# 目的：計數類指標與機器速度無關，放置演算法變差 (重抽變多、更常失敗) 就會反映在這裡
+#       目錄取樣：每架飛機抽了幾次、多少架退回完整篩選 (超過 QUICK_PICKS 次)
+#       SparseEngine：每張成功棋盤平均試了幾次，及擁擠棋盤碰到 MAX_ATTEMPTS 上限的比例
+# ============================================================
+class CountingRandom(random.Random):
+    """
+    draws 為 randrange 的呼叫次數 (目錄取樣每抽一個候選一次)，
+    picks 為 choices 的呼叫次數 (SparseEngine 每次嘗試抽一次變體)
+    """
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self.draws = 0
+        self.picks = 0
+
+    def randrange(self, *args, **kwargs):
+        self.draws += 1
+        return super().randrange(*args, **kwargs)
+
+    def choices(self, *args, **kwargs):
+        self.picks += 1
+        return super().choices(*args, **kwargs)
+
+
+def catalog_counts(num_planes, boards=COUNT_BOARDS):
+    catalog = get_catalog()
+    rng = CountingRandom(SEED)
+    fallbacks = 0
+    for _ in range(boards):
+        occupied = 0
+        for _ in range(num_planes):
+            before = rng.draws
+            occupied |= catalog.sample(occupied, rng).mask
+            fallbacks += rng.draws - before > QUICK_PICKS
+    return {f"place_planes_{num_planes}.draws_per_board": rng.draws / boards,
+            f"place_planes_{num_planes}.fallback_rate": fallbacks / (boards * num_planes)}
+
+
+def sparse_counts(num_planes, boards=COUNT_BOARDS):
+    rng = CountingRandom(SEED)
+    engine = SparseEngine(rng=rng)
+    attempts = failures = 0
+    for _ in range(boards):
+        before = rng.picks
+        try:
+            engine.start_game(num_planes, DIFFICULTY_STEPS["一般"])
+        except ValueError:
+            failures += 1
+        else:
+            attempts += rng.picks - before
+    prefix = f"place_planes_sparse_{num_planes}"
+    return {f"{prefix}.attempts_per_board": attempts / max(1, boards - failures),
+            f"{prefix}.failure_rate": failures / boards}
+
+
+def count_metrics():
+    metrics = {}
+    metrics.update(catalog_counts(2))
+    metrics.update(catalog_counts(3))
+    metrics.update(sparse_counts(2))
+    metrics.update(sparse_counts(CROWDED_PLANES))
+    return metrics
+
+
+# ============================================================
+# 【第 4 段】GUI：開新局與飛機預覽
+# 目的：在隱藏的 Tk 根視窗上建 PlaneGame (不進 mainloop，所以設定視窗不會跳出)，
+#       對局記錄寫到暫存目錄；沒有顯示器 (TclError) 或沒有 tkinter 時略過並註明原因
+# ============================================================
+@contextlib.contextmanager
+def virtual_display():
+    """Linux 上沒有 DISPLAY 但找得到 Xvfb 時，開一個虛擬顯示器給 Tk，結束時關掉"""
+    xvfb = shutil.which("Xvfb")
+    if not sys.platform.startswith("linux") or os.environ.get("DISPLAY") or not xvfb:
+        yield
+        return
+    read_fd, write_fd = os.pipe()
+    # -displayfd：Xvfb 自己挑一個沒用到的編號，準備好後把編號寫到 write_fd
+    server = subprocess.Popen([xvfb, "-displayfd", str(write_fd), "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                              pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()
+    try:
+        if number:
+            os.environ["DISPLAY"] = f":{number}"
+        yield
+    finally:
+        os.environ.pop("DISPLAY", None)
+        server.terminate()
+        server.wait()
+
+
+def _load_gui():
+    spec = importlib.util.spec_from_file_location("airplane_gui", GUI_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def gui_metrics(repeat):
+    """回傳 (指標, 略過原因)；能跑時略過原因為 None"""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:        # 沒有 tkinter 或沒有 DISPLAY
+        return {}, f"{type(e).__name__}: {e}"
+
+    metrics = {}
+    root.withdraw()
+    with tempfile.TemporaryDirectory() as tmp:
+        gui = _load_gui()
+        gui.REPLAY_PATH = os.path.join(tmp, "replays.bin")
+        gui.RESULTS_PATH = os.path.join(tmp, "results.sqlite3")
+        game = gui.PlaneGame(root)
+        try:
+            steps = DIFFICULTY_STEPS["一般"]
+            game.start_game(2, steps)
+            root.update_idletasks()      # 只處理繪製，不執行 after 排程 (開局設定視窗)
+            metrics["gui.start_game"] = time_call(lambda: game.start_game(2, steps), repeat)
+            metrics["gui.draw_plane_previews"] = time_call(game.draw_plane_previews, repeat)
+        finally:
+            game.board_pool.stop()
+            if game.analysis is not None:
+                game.analysis.stop()
+            game.replay.close()
+            game.results.close()
+            root.destroy()
+    return metrics, None
+
+
+# ============================================================
+# 【第 5 段】執行與比較
+# 目的：計時指標單位為微秒 / 次，計數指標為次數或比例，全部都是越小越好；
+#       (新 - 基準) / 基準 超過門檻 (TOLERANCES 中有的用各自的門檻) 即為退步，
+#       基準為 0 的指標只要變成非 0 就算退步；skipped 為 {指標名稱: 略過原因}
+# ============================================================
+def run_all(repeat=REPEAT, only=None, gui=True):
+    skipped = {}
+    metrics = time_cases([case for case in CASES
+                          if case[0] == REFERENCE or not only or any(key in case[0] for key in only)], repeat)
+    reference = metrics.pop(REFERENCE)
+    if not only or any("place_planes" in key for key in only):
+        metrics.update(count_metrics())
+    if gui and (not only or any("gui" in key for key in only)):
+        with virtual_display():
+            gui_results, reason = gui_metrics(repeat)
+        if reason is None:
+            metrics.update(gui_results)
+        else:
+            skipped.update(dict.fromkeys(GUI_METRICS, reason))
+    elif not gui:
+        skipped.update(dict.fromkeys(GUI_METRICS, "--no-gui"))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "reference": reference,
+        "metrics": metrics,
+        "skipped": skipped,
+    }
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    回傳 [(名稱, 基準, 目前, 變化 %, 是否退步)]，只比較兩邊都有的指標。
+    計時指標先除以同一次執行的 reference 再比 (整台機器忽快忽慢時各項會一起變動，
+    同一台機器上 reference 本身就可差到 70%)；計數指標與機器速度無關，直接比
+    """
+    speed = 1.0
+    if results.get("reference") and baseline.get("reference"):
+        speed = results["reference"] / baseline["reference"]
+    rows = []
+    for name, value in results["metrics"].items():
+        base = baseline["metrics"].get(name)
+        if base is None: continue
+        if base:
+            scale = speed if name in TIMED_METRICS else 1.0
+            change = (value / scale - base) / base * 100
+        else:
+            change = 0.0 if not value else float("inf")
+        rows.append((name, base, value, change, change > TOLERANCES.get(name, threshold)))
+    return rows
+
+
+def combine(runs):
+    """多次執行合併成一份：reference 取中位數，計時指標先換算到這個 reference 再取中位數"""
+    reference = statistics.median(run["reference"] for run in runs)
+    metrics = {}
+    for name in runs[-1]["metrics"]:
+        metrics[name] = statistics.median(
+            run["metrics"][name] * (reference / run["reference"] if name in TIMED_METRICS else 1) for run in runs)
+    return dict(runs[-1], reference=reference, metrics=metrics)
+
+
+def merge_baseline(baseline, results):
+    """把部分項目 (--only) 的結果換算到基準的 reference 後併入現有基準，其餘項目保留"""
+    reference = baseline.get("reference") or results["reference"]
+    scale = reference / results["reference"]
+    metrics = dict(baseline["metrics"])
+    for name, value in results["metrics"].items():
+        metrics[name] = value * scale if name in TIMED_METRICS else value
+    skipped = {name: reason for name, reason in dict(baseline.get("skipped", {}), **results["skipped"]).items()
+               if name not in metrics}
+    return dict(results, reference=reference, metrics=metrics, skipped=skipped)
+
+
+def missing(results, baseline):
+    """基準中有、這次沒有結果的指標 [(名稱, 原因)]"""
+    return [(name, results["skipped"].get(name, "沒有執行"))
+            for name in baseline["metrics"] if name not in results["metrics"]]
+
+
+def print_report(results, rows):
+    compared = {row[0]: row for row in rows}
+    print(f"{'項目':<40}{'基準':>10}{'目前':>10}{'變化':>8}")
+    for name, value in results["metrics"].items():
+        row = compared.get(name)
+        if row is None:
+            print(f"{name:<42}{'-':>12}{value:>12.3f}")
+        else:
+            flag = "  ← 退步" if row[4] else ""
+            print(f"{name:<42}{row[1]:>12.3f}{value:>12.3f}{row[3]:>+9.1f}%{flag}")
+    for name, reason in results["skipped"].items():
+        print(f"{name:<42}{'略過':>12}  ({reason})")
+
+
+# ============================================================
+# 【主程式入口】
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="尋找機頭：熱點路徑微基準測試")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="基準結果 JSON")
+    parser.add_argument("--out", help="本次結果另存的 JSON 路徑")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="退步門檻 (%%)")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--runs", type=int, default=1, help="完整執行幾次取中位數 (產生基準時建議 5)")
+    parser.add_argument("--only", nargs="+", help="只跑名稱包含這些字串的項目")
+    parser.add_argument("--no-gui", action="store_true", help="略過 Tk 項目")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次結果寫成新的基準")
+    args = parser.parse_args(argv)
+
+    results = combine([run_all(args.repeat, args.only, not args.no_gui) for _ in range(max(1, args.runs))])
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        print_report(results, [])
+        if args.only and os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                results = merge_baseline(json.load(f), results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"已寫入基準 {args.baseline}")
+        if results["skipped"]:
+            print(f"警告：基準缺少 {', '.join(results['skipped'])}，之後的比較不會檢查這些項目"
+                  " (請在有顯示器或裝了 Xvfb 的環境執行 --only gui --save-baseline 補上)")
+        return 0
+
+    baseline = {"metrics": {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    else:
+        print(f"找不到基準 {args.baseline}，只列出結果 (可用 --save-baseline 建立)")
+    rows = compare(results, baseline, args.threshold)
+    print_report(results, rows)
+    for name, reason in baseline.get("skipped", {}).items():
+        print(f"警告：基準沒有 {name} ({reason})，無法比較")
+    failed = False
+    regressed = [row[0] for row in rows if row[4]]
+    if regressed:
+        print("退步超過門檻：" + ", ".join(f"{name} (>{TOLERANCES.get(name, args.threshold):g}%)" for name in regressed))
+        failed = True
+    lost = [] if args.only else missing(results, baseline)   # --only 本來就只跑一部分
+    if lost:
+        print("基準中有、這次沒有結果：" + ", ".join(f"{name} ({reason})" for name, reason in lost))
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
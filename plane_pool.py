@@ -0,0 +1,56 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：背景執行緒預先產生棋盤，開始任務時直接取用，不在 UI 執行緒放置飛機
+# ============================================================
+import random
+import threading
+from collections import deque
+
+from plane_metrics import METRICS, instrument
+from plane_shapes import GRID_SIZE, get_catalog
+
+SEED_BITS = 63           # 棋盤種子的位元數 (重播檔標頭以 uint64 記錄)
+
+
+# ============================================================
+# 【第 2 段】BoardPool 類別
+# 目的：每種 (飛機數, 步數上限) 各保留 target 張現成棋盤，
+#       取走一張就喚醒背景執行緒補貨；每張棋盤都由一個隨機種子產生，可再重現
+# ============================================================
+class BoardPool:
+    def __init__(self, keys, target=4, size=GRID_SIZE, rng=None):
+        self.size = size
+        self.target = target
+        self.rng = rng if rng is not None else random.Random()
+        self.pools = {key: deque() for key in keys}
+        self._wake = threading.Event()
+        self._stopped = False
+        self._wake.set()
+        instrument(self, {"_make": "pool.make_board_ms"})
+        self._thread = threading.Thread(target=self._refill_loop, name="board-pool", daemon=True)
+        self._thread.start()
+
+    def get(self, num_planes, max_steps):
+        """取一張現成棋盤，回傳 (種子, placements)；池子剛好空了才當場產生"""
+        pool = self.pools.setdefault((num_planes, max_steps), deque())
+        self._wake.set()
+        try:
+            return pool.popleft()
+        except IndexError:
+            if METRICS.enabled: METRICS.count("pool.misses")   # 在 UI 執行緒當場產生
+            return self._make(num_planes, random.Random().getrandbits(SEED_BITS))
+
+    def _make(self, num_planes, seed):
+        return seed, get_catalog(self.size).board_from_seed(seed, num_planes)
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def _refill_loop(self):
+        while not self._stopped:
+            self._wake.wait()
+            self._wake.clear()
+            for (num_planes, _), pool in list(self.pools.items()):
+                while len(pool) < self.target and not self._stopped:
+                    pool.append(self._make(num_planes, self.rng.getrandbits(SEED_BITS)))
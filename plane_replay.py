@@ -0,0 +1,167 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：把每一局記錄成只會附加的二進位檔，並可用 mmap 隨機讀取重播
+# ============================================================
+import mmap
+import os
+import struct
+
+from plane_shapes import Placement, get_catalog
+from plane_sparse import make_engine
+
+
+# ============================================================
+# 【第 2 段】檔案格式 (little endian)
+# 目的：
+#   資料檔 *.bin：每局 = 標頭 + 每架飛機 5 bytes + 每個動作 5 bytes
+#     標頭  magic(4) 版本(1) 飛機數(2) 棋盤大小(2) 步數上限(4) 種子(8)
+#     飛機  (變體編號(1), 機頭 r(2), 機頭 c(2))，變體編號與棋盤大小無關
+#     動作  (種類(1), r(2), c(2))，種類為 CLICK / BOMB / END；
+#           END 記錄結果：r = 是否勝利、c = 用掉的步數
+#   索引檔 *.bin.idx：每局標頭在資料檔中的位置 (uint64)
+#   版本 1 (10x10 時代，各欄位 1 byte、固定 3 組飛機) 的舊記錄仍可讀取
+# ============================================================
+MAGIC = b"PLRP"
+VERSION = 2
+MAX_SIZE = 65535         # 棋盤邊長、飛機數與步數的上限 (2 bytes)
+
+HEADER = struct.Struct("<4sBHHIQ")
+PLANE = struct.Struct("<BHH")
+ACTION = struct.Struct("<BHH")
+OFFSET = struct.Struct("<Q")
+
+V1_HEADER = struct.Struct("<4sBBBBQ" + "BBB" * 3)
+V1_ACTION = struct.Struct("<BBB")
+
+CLICK, BOMB, END = 1, 2, 3
+
+
+# ============================================================
+# 【第 3 段】寫入
+# ============================================================
+class ReplayWriter:
+    def __init__(self, path):
+        self.path = path
+        self._data = open(path, "ab")
+        self._index = open(path + ".idx", "ab")
+        self._recording = False
+
+    def begin_game(self, engine, seed=None):
+        """在 engine.start_game 之後呼叫，寫入本局標頭 (seed 省略時用 engine.seed，沒有種子記為 0)"""
+        seed = engine.seed if seed is None else seed
+        if len(engine.planes) > MAX_SIZE or engine.size > MAX_SIZE:
+            raise ValueError(f"重播檔只支援 {MAX_SIZE}x{MAX_SIZE} 以內、最多 {MAX_SIZE} 架飛機的棋盤")
+        catalog = get_catalog()   # 變體編號各種棋盤大小都相同，不必建本棋盤的完整目錄
+        parts = [HEADER.pack(MAGIC, VERSION, len(engine.planes), engine.size,
+                             engine.max_steps, seed or 0)]
+        for shape, (r, c) in zip(engine.planes, engine.anchors):
+            parts.append(PLANE.pack(catalog.variant_of(shape), r, c))
+
+        self._index.write(OFFSET.pack(self._data.tell()))
+        self._data.write(b"".join(parts))
+        self._recording = True
+
+    def record(self, kind, r, c):
+        if self._recording:
+            self._data.write(ACTION.pack(kind, r, c))
+
+    def end_game(self, engine):
+        if not self._recording: return
+        self._data.write(ACTION.pack(END, int(engine.won), min(engine.steps, MAX_SIZE)))
+        self._recording = False
+        self.flush()
+
+    def flush(self):
+        self._data.flush()
+        self._index.flush()
+
+    def close(self):
+        self.flush()
+        self._data.close()
+        self._index.close()
+
+
+# ============================================================
+# 【第 4 段】讀取 (mmap，不需載入或解析整個檔案)
+# ============================================================
+class ReplayGame:
+    def __init__(self, buf, start, stop):
+        magic, version = struct.unpack_from("<4sB", buf, start)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError("重播檔格式錯誤")
+        if version == 1:
+            fields = V1_HEADER.unpack_from(buf, start)
+            self.num_planes, self.size, self.max_steps, self.seed = fields[2:6]
+            table = fields[6:]
+            self.placements = [tuple(table[3 * i:3 * i + 3]) for i in range(self.num_planes)]
+            self._action = V1_ACTION
+            start += V1_HEADER.size
+        else:
+            self.num_planes, self.size, self.max_steps, self.seed = HEADER.unpack_from(buf, start)[2:]
+            start += HEADER.size
+            self.placements = [PLANE.unpack_from(buf, start + i * PLANE.size) for i in range(self.num_planes)]
+            self._action = ACTION
+            start += self.num_planes * PLANE.size
+        self._actions = buf[start:stop]
+
+    def actions(self):
+        """逐筆列出 (種類, r, c)，直接從 mmap 解碼"""
+        return self._action.iter_unpack(self._actions)
+
+    def result(self):
+        """(是否勝利, 步數)；沒有打完的局回傳 None"""
+        action = self._action
+        if len(self._actions) >= action.size:
+            kind, won, steps = action.unpack_from(self._actions, len(self._actions) - action.size)
+            if kind == END:
+                return bool(won), steps
+        return None
+
+    def replay(self, engine=None):
+        """用 engine (預設依棋盤大小由 make_engine 選) 重新走一次，逐步產生 (動作, 新翻開的格子)"""
+        engine = engine if engine is not None else make_engine(self.size)
+        board = [Placement(v, r, c, None) for v, r, c in self.placements]   # engine 只用變體與機頭位置
+        engine.start_game(self.num_planes, self.max_steps, board)
+        for kind, r, c in self.actions():
+            if kind == CLICK:
+                yield (kind, r, c), engine.on_click(r, c)
+            elif kind == BOMB:
+                yield (kind, r, c), engine.execute_bomb_at(r, c)
+
+
+class ReplayLog:
+    def __init__(self, path):
+        self._files = []
+        self._data = self._map(path)
+        self._offsets = self._map(path + ".idx")
+
+    def _map(self, path):
+        f = open(path, "rb")
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self):
+        return len(self._offsets) // OFFSET.size
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        i %= len(self)
+        start = OFFSET.unpack_from(self._offsets, i * OFFSET.size)[0]
+        if i + 1 < len(self):
+            stop = OFFSET.unpack_from(self._offsets, (i + 1) * OFFSET.size)[0]
+        else:
+            stop = len(self._data)
+        return ReplayGame(self._data, start, stop)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        self._data.release()
+        self._offsets.release()
+        for f in self._files:
+            f.close()
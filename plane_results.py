@@ -0,0 +1,214 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：每局結束的結果存進本機 SQLite，寫入由背景執行緒批次處理 (write-behind)，
+#       結束一局時 UI 執行緒只把結果放進佇列，不碰磁碟
+#       用法：python plane_results.py [results.sqlite3]     (列出各難度統計)
+# ============================================================
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from plane_engine import DIFFICULTY_STEPS
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.sqlite3")
+BATCH_SIZE = 512         # 一次交易最多寫入的局數
+BATCH_WAIT = 0.05        # 收到第一筆後再等多久 (秒) 湊成一批
+
+DIFFICULTY_NAMES = {steps: name for name, steps in DIFFICULTY_STEPS.items()}
+
+# finished 為結束時間 (Unix 秒)，duration 為開局到結束的秒數，seed 沒有時為 None
+GameResult = namedtuple("GameResult", "num_planes max_steps steps bomb_used won duration seed finished")
+
+
+def result_of(engine, started, finished=None):
+    """由結束的 engine 與開局時的 time.monotonic() 建立 GameResult"""
+    now = time.monotonic()
+    return GameResult(len(engine.planes), engine.max_steps, min(engine.steps, engine.max_steps),
+                      engine.bomb_available <= 0, engine.won, now - started, engine.seed,
+                      time.time() if finished is None else finished)
+
+
+# ============================================================
+# 【第 2 段】資料表
+# 目的：games 保留每一局 (最佳紀錄用 (飛機數, 步數上限, 勝負, 步數) 索引直接找)；
+#       step_counts 為 (飛機數, 步數上限, 勝負, 步數) → 局數 的彙總，
+#       由觸發器在同一個交易中更新。步數只有數十種，
+#       勝率與百分位數只讀這張小表，資料量到數百萬局仍是固定時間
+# ============================================================
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished REAL NOT NULL,
+    num_planes INTEGER NOT NULL,
+    max_steps INTEGER NOT NULL,
+    steps INTEGER NOT NULL,
+    bomb_used INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    seed TEXT
+);
+CREATE INDEX IF NOT EXISTS games_best ON games (num_planes, max_steps, won, steps, duration);
+
+CREATE TABLE IF NOT EXISTS step_counts (
+    num_planes INTEGER NOT NULL,
+    max_steps INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    steps INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    PRIMARY KEY (num_planes, max_steps, won, steps)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS games_count AFTER INSERT ON games BEGIN
+    INSERT INTO step_counts VALUES (NEW.num_planes, NEW.max_steps, NEW.won, NEW.steps, 1)
+    ON CONFLICT (num_planes, max_steps, won, steps) DO UPDATE SET games = games + 1;
+END;
+"""
+
+INSERT = ("INSERT INTO games (finished, num_planes, max_steps, steps, bomb_used, won, duration, seed)"
+          " VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+def connect(path):
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode=WAL")      # 讀取不會擋住背景寫入
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+# ============================================================
+# 【第 3 段】ResultStore 類別
+# 目的：record 只把結果放進佇列；寫入執行緒拿到第一筆後最多再等 BATCH_WAIT，
+#       把佇列中的結果一次寫入一個交易。查詢在呼叫端的執行緒用另一條連線，
+#       只看得到已寫入的結果 (需要立刻看到剛結束的局時先呼叫 flush)
+# ============================================================
+class ResultStore:
+    def __init__(self, path=RESULTS_PATH):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._db = connect(path)                  # 建表後留給查詢用
+        self._thread = threading.Thread(target=self._write_loop, name="results", daemon=True)
+        self._thread.start()
+        self._closed = False
+        atexit.register(self.close)               # 結束程式前寫完佇列中的結果
+
+    def record(self, result):
+        self._queue.put(result)
+
+    def flush(self):
+        """等到目前佇列中的結果都已寫入"""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        if self._closed: return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._db.close()
+
+    def _write_loop(self):
+        db = connect(self.path)
+        stopping = False
+        while not stopping:
+            batch, waiters = [], []
+            item = self._queue.get()
+            deadline = time.monotonic() + BATCH_WAIT
+            while True:
+                if item is None:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stopping or waiters or len(batch) >= BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                with db:
+                    db.executemany(INSERT, [(r.finished, r.num_planes, r.max_steps, r.steps, int(r.bomb_used),
+                                             int(r.won), r.duration, None if r.seed is None else str(r.seed))
+                                            for r in batch])
+            for done in waiters:
+                done.set()
+        db.close()
+
+    # ========================================================
+    # 【第 4 段】統計查詢
+    # ========================================================
+    def win_rates(self):
+        """每種 (飛機數, 步數上限) 的局數與勝率，difficulty 為難度名稱 (自訂步數為 None)"""
+        rows = self._db.execute(
+            "SELECT num_planes, max_steps, SUM(games), SUM(games * won) FROM step_counts"
+            " GROUP BY num_planes, max_steps ORDER BY num_planes, max_steps DESC").fetchall()
+        return [{"num_planes": n, "max_steps": s, "difficulty": DIFFICULTY_NAMES.get(s),
+                 "games": games, "wins": wins, "win_rate": wins / games}
+                for n, s, games, wins in rows]
+
+    def best_runs(self, num_planes, max_steps, limit=10):
+        """勝利的局依步數、再依時間排序，回傳 GameResult 串列"""
+        rows = self._db.execute(
+            "SELECT num_planes, max_steps, steps, bomb_used, won, duration, seed, finished FROM games"
+            " WHERE num_planes = ? AND max_steps = ? AND won = 1 ORDER BY steps, duration LIMIT ?",
+            (num_planes, max_steps, limit)).fetchall()
+        return [GameResult(n, s, steps, bool(bomb), bool(won), duration,
+                           None if seed is None else int(seed), finished)
+                for n, s, steps, bomb, won, duration, seed, finished in rows]
+
+    def step_percentiles(self, num_planes, max_steps, pcts=(10, 50, 90), won=True):
+        """勝利 (won=False 為落敗、None 為全部) 的局用掉步數的百分位數；沒有資料回傳 {}"""
+        sql = "SELECT steps, SUM(games) FROM step_counts WHERE num_planes = ? AND max_steps = ?"
+        args = [num_planes, max_steps]
+        if won is not None:
+            sql += " AND won = ?"
+            args.append(int(won))
+        counts = self._db.execute(sql + " GROUP BY steps ORDER BY steps", args).fetchall()
+        total = sum(n for _, n in counts)
+        if not total:
+            return {}
+        result = {}
+        for pct in pcts:
+            rank = min(total - 1, int(total * pct / 100))   # 與 plane_bench.percentile 相同
+            seen = 0
+            for steps, n in counts:
+                seen += n
+                if seen > rank:
+                    result[pct] = steps
+                    break
+        return result
+
+
+# ============================================================
+# 【主程式入口】
+# ============================================================
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="尋找機頭：對局結果統計")
+    parser.add_argument("path", nargs="?", default=RESULTS_PATH)
+    parser.add_argument("--best", type=int, default=3, help="每種設定列出的最佳紀錄數")
+    args = parser.parse_args(argv)
+
+    store = ResultStore(args.path)
+    for row in store.win_rates():
+        name = row["difficulty"] or f"{row['max_steps']} 步"
+        pct = store.step_percentiles(row["num_planes"], row["max_steps"])
+        line = f"{row['num_planes']} 架 {name}：{row['games']} 局，勝率 {row['win_rate'] * 100:.1f}%"
+        if pct:
+            line += f"，獲勝步數 p10 {pct[10]} / p50 {pct[50]} / p90 {pct[90]}"
+        print(line)
+        for run in store.best_runs(row["num_planes"], row["max_steps"], args.best):
+            seed = f"  棋盤 #{run.seed}" if run.seed is not None else ""
+            print(f"    {run.steps} 步  {run.duration:.0f} 秒{'  (空襲)' if run.bomb_used else ''}{seed}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
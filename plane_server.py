@@ -0,0 +1,239 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：asyncio 連線伺服器，同時主持大量獨立對局 (每條連線一局)
+#       用法：python plane_server.py --port 8765 [--size 1000]
+#             python plane_server.py load --sessions 1000   (本機壓力測試)
+# ============================================================
+import argparse
+import asyncio
+import random
+import time
+
+from plane_engine import DIFFICULTY_STEPS, HEAD, BODY
+from plane_metrics import enable, serve as serve_metrics
+from plane_shapes import GRID_SIZE, get_catalog
+from plane_sparse import make_engine
+
+
+# ============================================================
+# 【第 2 段】通訊協定 (一行一個指令，UTF-8)
+#   NEW <飛機數> <步數上限或難度> [種子] → PLANES <變體編號...>  + STATE
+#                                   (給種子時棋盤與同種子的每日挑戰 / 問題回報相同)
+#   CLICK <r> <c>                   → CELL <r> <c> <. / B / H> ... + STATE
+#   BOMB <r> <c>                    → 同上 (2x2 空襲)
+#   STATE                           → STATE <步數> <上限> <剩餘機頭> <空襲數> <IDLE/PLAY/WON/LOST>
+#   QUIT                            → BYE
+#   錯誤一律回 ERR <原因>；每個指令的回應都以 STATE / ERR / BYE 結尾
+#   飛機數須為 1 ~ MAX_PLANES，步數上限須為 1 ~ 棋盤格數；棋盤放不下這麼多飛機回 ERR board-full
+#   一行超過 MAX_LINE bytes 回 ERR line-too-long 並關閉連線
+#   棋盤大小由伺服器啟動時的 --size 決定，所有連線相同
+# ============================================================
+HIGH_WATER = 64 * 1024   # 輸出緩衝超過此大小才等待 drain
+READ_CHUNK = 64 * 1024
+MAX_LINE = 1024          # 單行指令的長度上限 (不含換行)，避免不送換行的連線無限累積
+MAX_PLANES = 1000        # 單局飛機數上限，避免一個 NEW 指令佔住事件迴圈太久
+
+CELL_CODES = {None: ".", BODY: "B", HEAD: "H"}
+
+
+class Session:
+    """單一對局的狀態，只在事件迴圈中操作，不需要鎖"""
+
+    def __init__(self, rng, size=GRID_SIZE):
+        self.engine = make_engine(size, rng)
+        self.catalog = get_catalog()   # 變體編號各種棋盤大小都相同，不必建本棋盤的完整目錄
+
+    def state_line(self):
+        e = self.engine
+        status = "IDLE" if not e.planes else "WON" if e.won else "LOST" if e.game_over else "PLAY"
+        return f"STATE {e.steps} {e.max_steps} {e.heads_left} {e.bomb_available} {status}\n"
+
+    def handle(self, line, out):
+        """處理一行指令，回應附加到 out；回傳 False 表示結束連線"""
+        parts = line.split()
+        if not parts:
+            return True
+        cmd = parts[0].upper()
+        try:
+            if cmd == "NEW":
+                self._new(parts[1:], out)
+            elif cmd in ("CLICK", "BOMB"):
+                self._move(cmd, int(parts[1]), int(parts[2]), out)
+            elif cmd == "STATE":
+                out.append(self.state_line())
+            elif cmd == "QUIT":
+                out.append("BYE\n")
+                return False
+            else:
+                out.append(f"ERR unknown-command {cmd}\n")
+        except (IndexError, ValueError):
+            out.append(f"ERR bad-arguments {cmd}\n")
+        return True
+
+    def _new(self, args, out):
+        num_planes = int(args[0])
+        if not 1 <= num_planes <= MAX_PLANES:
+            raise ValueError
+        max_steps = DIFFICULTY_STEPS[args[1]] if args[1] in DIFFICULTY_STEPS else int(args[1])
+        if not 1 <= max_steps <= self.engine.size * self.engine.size:
+            raise ValueError
+        seed = int(args[2]) if len(args) > 2 else None
+        try:
+            self.engine.start_game(num_planes, max_steps, seed=seed)
+        except ValueError:
+            self.engine.start_game(0, max_steps)   # 放到一半的棋盤作廢，回到沒有對局的狀態
+            out.append("ERR board-full\n"); return
+        ids = " ".join(str(self.catalog.variant_of(shape)) for shape in self.engine.planes)
+        out.append(f"PLANES {ids}\n")
+        out.append(self.state_line())
+
+    def _move(self, cmd, r, c, out):
+        e = self.engine
+        if not e.planes:
+            out.append("ERR no-game\n"); return
+        if not (0 <= r < e.size and 0 <= c < e.size):
+            raise ValueError
+        if cmd == "BOMB":
+            if e.game_over or e.bomb_available <= 0:
+                out.append("ERR no-bomb\n"); return
+            if not e.is_bombing:
+                e.use_bomb()
+        elif e.is_bombing:
+            e.use_bomb()          # 一般點擊時取消鎖定
+        for er, ec, cell in e.on_click(r, c):
+            out.append(f"CELL {er} {ec} {CELL_CODES[cell]}\n")
+        out.append(self.state_line())
+
+
+# ============================================================
+# 【第 3 段】伺服器
+# 目的：每次讀到一批資料就處理其中所有完整的行，回應合併成一次 write
+# ============================================================
+class PlaneServer:
+    def __init__(self, seed=None, size=GRID_SIZE):
+        self.rng = random.Random(seed)
+        self.size = size
+        self.sessions = 0
+
+    async def handle_client(self, reader, writer):
+        session = Session(random.Random(self.rng.getrandbits(64)), self.size)
+        self.sessions += 1
+        pending = b""
+        try:
+            while True:
+                chunk = await reader.read(READ_CHUNK)
+                if not chunk:
+                    break
+                *lines, pending = (pending + chunk).split(b"\n")
+                out = []
+                too_long = len(pending) > MAX_LINE or any(len(line) > MAX_LINE for line in lines)
+                if too_long:
+                    lines = lines[:next((i for i, line in enumerate(lines) if len(line) > MAX_LINE), len(lines))]
+                alive = all(session.handle(line.decode("utf-8", "replace"), out) for line in lines)
+                if too_long and alive:
+                    out.append("ERR line-too-long\n")
+                    alive = False
+                if out:
+                    writer.write("".join(out).encode())
+                    if writer.transport.get_write_buffer_size() > HIGH_WATER:
+                        await writer.drain()
+                if not alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None):
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_client, unix_path, backlog=4096)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port, backlog=4096)
+        async with server:
+            await server.serve_forever()
+
+
+# ============================================================
+# 【第 4 段】本機測試用戶端
+# ============================================================
+class PlaneClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, line):
+        """送出一個指令，回傳回應的所有行 (最後一行為 STATE / ERR / BYE)"""
+        self.writer.write((line + "\n").encode())
+        lines = []
+        while True:
+            reply = (await self.reader.readline()).decode().rstrip("\n")
+            if not reply:
+                raise ConnectionError("伺服器已關閉連線")
+            lines.append(reply)
+            if reply.split(" ", 1)[0] in ("STATE", "ERR", "BYE"):
+                return lines
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def load_test(host, port, sessions, moves):
+    """開 sessions 條連線同時各下 moves 步，回傳每步延遲 (秒)"""
+    latencies = []
+
+    async def play(i):
+        rng = random.Random(i)
+        client = await PlaneClient.connect(host, port)
+        await client.request("NEW 3 困難")
+        for _ in range(moves):
+            start = time.perf_counter()
+            reply = await client.request(f"CLICK {rng.randrange(10)} {rng.randrange(10)}")
+            latencies.append(time.perf_counter() - start)
+            if not reply[-1].endswith("PLAY"):
+                await client.request("NEW 3 困難")
+        await client.request("QUIT")
+        await client.close()
+
+    await asyncio.gather(*(play(i) for i in range(sessions)))
+    return latencies
+
+
+# ============================================================
+# 【主程式入口】
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="尋找機頭：多人對局伺服器")
+    parser.add_argument("mode", nargs="?", default="serve", choices=("serve", "load"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="改用本機 Unix socket 路徑")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--size", type=int, default=GRID_SIZE, help="serve：棋盤邊長")
+    parser.add_argument("--sessions", type=int, default=1000, help="load：同時連線數")
+    parser.add_argument("--moves", type=int, default=20, help="load：每條連線的步數")
+    parser.add_argument("--metrics-port", type=int, help="serve：開啟效能指標並在此埠提供 /metrics")
+    args = parser.parse_args(argv)
+
+    if args.mode == "serve":
+        if args.metrics_port:
+            enable()
+            serve_metrics(args.metrics_port)
+        asyncio.run(PlaneServer(args.seed, args.size).serve(args.host, args.port, args.unix))
+        return
+
+    start = time.perf_counter()
+    latencies = sorted(asyncio.run(load_test(args.host, args.port, args.sessions, args.moves)))
+    elapsed = time.perf_counter() - start
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    print(f"{args.sessions} 條連線、{len(latencies)} 步，{len(latencies) / elapsed:.0f} 步/秒，"
+          f"延遲 p50 {pct(0.5):.2f} ms / p99 {pct(0.99):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
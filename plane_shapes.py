@@ -0,0 +1,181 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：飛機形狀規則、全部形狀/方向的預先計算目錄與放置取樣
+# ============================================================
+import hashlib                            # 由日期等欄位推出種子
+import random                             # 產生隨機飛機形狀與位置
+from collections import namedtuple
+
+from plane_metrics import METRICS         # 放置嘗試次數 (開啟記錄時)
+
+
+# ============================================================
+# 【第 2 段】基本參數
+# ============================================================
+GRID_SIZE = 10           # 棋盤大小為 10x10
+
+BODY_LENGTHS = (2, 3, 4)       # 機身長度
+WING_LENGTHS = (1, 2, 3)       # 單側機翼長度
+ANGLES = (0, 90, 180, 270)     # 旋轉角度
+
+QUICK_PICKS = 8          # 取樣時先直接抽候選的次數，之後改為完整篩選
+
+
+# ============================================================
+# 【第 3 段】飛機形狀生成與旋轉
+# 目的：形狀以機頭為原點 (0, 0)，座標為 (dx, dy)，第一格一定是機頭
+# ============================================================
+def build_shape(body_len, wing_len, tail):
+    shape = [(0, 0), (0, 1)] # 頭+頸
+    for i in range(2, body_len + 1): shape.append((0, i))
+    for i in range(1, wing_len + 1):
+        shape.append((-i, 1))
+        shape.append((i, 1))
+    if tail: # 尾翼
+        shape.append((-1, body_len)); shape.append((1, body_len))
+    return shape
+
+
+def generate_random_shape(rng=random):
+    return build_shape(rng.randint(2, 4), rng.randint(1, 3), rng.choice([True, False]))
+
+
+def rotate_shape(shape, angle):
+    new_shape = []
+    for x, y in shape:
+        if angle == 90: nx, ny = -y, x
+        elif angle == 180: nx, ny = -x, -y
+        elif angle == 270: nx, ny = y, -x
+        else: nx, ny = x, y
+        new_shape.append((nx, ny))
+    return new_shape
+
+
+# ============================================================
+# 【第 4 段】形狀目錄
+# 目的：列舉 3 種機身 x 3 種機翼 x 有無尾翼 x 4 個方向 = 72 種變體，
+#       每種變體預先算好格子、外框與所有不出界的機頭位置
+#       placements 為 (變體編號, r, c, 位元遮罩)，位元 r * size + c
+# ============================================================
+Variant = namedtuple("Variant", "id body_len wing_len tail angle shape bbox anchors")
+Placement = namedtuple("Placement", "variant r c mask")
+
+
+class ShapeCatalog:
+    def __init__(self, size=GRID_SIZE):
+        self.size = size
+        self.variants = []
+        self.placements = []
+        self.masks = []
+        self._variant_ids = {}
+        self._placement_ids = {}
+
+        for body_len in BODY_LENGTHS:
+            for wing_len in WING_LENGTHS:
+                for tail in (False, True):
+                    base = build_shape(body_len, wing_len, tail)
+                    for angle in ANGLES:
+                        self._add_variant(body_len, wing_len, tail, angle, rotate_shape(base, angle))
+
+    def _add_variant(self, body_len, wing_len, tail, angle, shape):
+        size = self.size
+        xs = [dx for dx, _ in shape]; ys = [dy for _, dy in shape]
+        bbox = (min(xs), min(ys), max(xs), max(ys))
+        anchors = [(r, c) for r in range(-bbox[1], size - bbox[3])
+                   for c in range(-bbox[0], size - bbox[2])]
+        variant = Variant(len(self.variants), body_len, wing_len, tail, angle, shape, bbox, anchors)
+        self.variants.append(variant)
+        self._variant_ids[tuple(shape)] = variant.id
+
+        for r, c in anchors:
+            mask = 0
+            for dx, dy in shape:
+                mask |= 1 << ((r + dy) * size + c + dx)
+            self._placement_ids[(variant.id, r, c)] = len(self.placements)
+            self.placements.append(Placement(variant.id, r, c, mask))
+            self.masks.append(mask)
+
+    def variant_of(self, shape):
+        """由形狀座標查回變體編號"""
+        return self._variant_ids[tuple(shape)]
+
+    def find_placement(self, variant, r, c):
+        """由 (變體編號, 機頭位置) 查回 Placement"""
+        return self.placements[self._placement_ids[(variant, r, c)]]
+
+    def sample(self, occupied=0, rng=random):
+        """
+        從不與 occupied 重疊的放置中均勻抽一個。
+        舊版拒絕取樣 (均勻抽形狀、角度、機頭位置，不合法就重抽) 接受後
+        正好是「所有合法放置均勻分布」，這裡的分布與其完全相同但不會失敗：
+        先直接抽 QUICK_PICKS 次，仍重疊就篩出全部合法候選再抽，時間有上限。
+        """
+        placements = self.placements
+        for attempt in range(1, QUICK_PICKS + 1):
+            placement = placements[rng.randrange(len(placements))]
+            if not placement.mask & occupied:
+                if METRICS.enabled: METRICS.observe("place.attempts", attempt)
+                return placement
+
+        candidates = [p for p in placements if not p.mask & occupied]
+        if not candidates:
+            if METRICS.enabled: METRICS.count("place.failures")
+            raise ValueError("棋盤上已沒有可放置飛機的位置")
+        if METRICS.enabled:
+            METRICS.observe("place.attempts", QUICK_PICKS + 1)
+            METRICS.count("place.fallbacks")
+        return candidates[rng.randrange(len(candidates))]
+
+    def sample_board(self, count, rng=random):
+        """在空棋盤上依序放置 count 架飛機，回傳 placements"""
+        occupied = 0
+        board = []
+        for _ in range(count):
+            placement = self.sample(occupied, rng)
+            occupied |= placement.mask
+            board.append(placement)
+        return board
+
+    def board_from_seed(self, seed, count):
+        """
+        同一個種子永遠得到同一張棋盤：用獨立的 random.Random(seed)，
+        每架飛機直接從全部不重疊的放置中抽一個 (與 sample 同分布)，不重試、時間固定，
+        也不受 QUICK_PICKS 等取樣調整影響
+        """
+        rng = random.Random(seed)
+        occupied = 0
+        board = []
+        for _ in range(count):
+            candidates = [p for p in self.placements if not p.mask & occupied]
+            if not candidates:
+                raise ValueError("棋盤上已沒有可放置飛機的位置")
+            placement = candidates[rng.randrange(len(candidates))]
+            occupied |= placement.mask
+            board.append(placement)
+        return board
+
+
+_CATALOGS = {}
+
+
+def get_catalog(size=GRID_SIZE):
+    """每種棋盤大小只建一次目錄"""
+    catalog = _CATALOGS.get(size)
+    if catalog is None:
+        catalog = _CATALOGS[size] = ShapeCatalog(size)
+    return catalog
+
+
+# ============================================================
+# 【第 5 段】棋盤種子
+# 目的：由日期、飛機數、難度等欄位推出 64 位元種子 (每日挑戰、回報問題時重現棋盤)，
+#       伺服器不必儲存棋盤，隨時可由種子重新產生
+# ============================================================
+def seed_for(*parts):
+    text = "|".join(str(part) for part in parts)
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def daily_seed(date, num_planes, difficulty):
+    """某一天 (datetime.date) 的每日挑戰種子"""
+    return seed_for("daily", date.isoformat(), num_planes, difficulty)
@@ -0,0 +1,549 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：精確解出「找到所有機頭的最少期望點擊數」與最佳下一步
+#       (規則同 reveal_cell + 一次性 2x2 空襲，空襲不計步數)
+#       用法：python plane_solver.py --planes 2 --size 6
+#             python plane_solver.py --planes 2 --checkpoint solver.pkl --max-states 200000
+#             python plane_solver.py --check 20     (核對剪枝與化簡沒有改錯解答)
+# ============================================================
+import argparse
+import hashlib
+import os
+import pickle
+import random
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from plane_engine import DIFFICULTY_STEPS, PlaneEngine
+from plane_hints import HeadHeatmap, config_boards, find_configs
+from plane_shapes import GRID_SIZE, get_catalog
+
+
+# ============================================================
+# 【第 2 段】基本參數與盤面知識
+# 目的：玩家的知識 = 所有仍一致的配置 (每列一張盤面，0 空格、1 機身、2 未找到的機頭)
+#       與每張盤面的權重、空襲是否還在。化簡規則：
+#       - 已翻開的格子與所有盤面都相同的非機頭格子一律記為 0 (點了也沒有資訊)
+#       - 找到的機頭記為 0，某列沒有 2 即為勝利
+#       - 空襲用完後，確定是機頭的格子直接點掉 (遲早要點，先點不影響結果)
+#       化簡後相同的盤面合併權重；機率假設所有一致的配置等機率 (與 HeadHeatmap 相同)，
+#       只看格子內容，不使用預覽面板上「哪一架被打中」的資訊
+# ============================================================
+FORMAT_VERSION = 1
+CHECKPOINT_EVERY = 20000  # 每新增這麼多個局面就寫一次檢查點
+EPSILON = 1e-9
+
+SolverState = namedtuple("SolverState", "rows counts bomb")
+
+
+class SearchBudgetExceeded(RuntimeError):
+    """展開的局面超過 max_states (已寫入檢查點，可再次執行接續)"""
+
+
+_SYMMETRIES = {}
+
+
+def symmetries(size):
+    """
+    正方形的 8 種對稱 (4 個旋轉 x 是否鏡射)，每種是一個格子排列 perm：
+    轉換後的盤面 = 盤面[:, perm]，也就是轉換後的第 j 格對應原本的第 perm[j] 格
+    """
+    perms = _SYMMETRIES.get(size)
+    if perms is None:
+        r, c = np.divmod(np.arange(size * size), size)
+        n = size - 1
+        maps = [(r, c), (c, n - r), (n - r, n - c), (n - c, r),
+                (c, r), (r, n - c), (n - c, n - r), (n - r, c)]
+        perms = _SYMMETRIES[size] = np.array([mr * size + mc for mr, mc in maps], dtype=np.int64)
+    return perms
+
+
+# ============================================================
+# 【第 3 段】PlaneSolver 類別
+# 目的：期望值搜尋 (點擊 = 1 步，空襲 = 0 步)，置換表以正規化盤面的雜湊為鍵；
+#       8 種對稱只存一份，不同飛機形狀組合只要化簡後盤面相同也共用結果
+# ============================================================
+class PlaneSolver:
+    def __init__(self, size=GRID_SIZE, checkpoint=None, checkpoint_every=CHECKPOINT_EVERY, max_states=None):
+        self.size = size
+        self.perms = symmetries(size)
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.max_states = max_states
+        self.table = {}               # 鍵 -> (期望點擊數, 正規化座標下的最佳動作)
+        self.expanded = 0             # 本次執行新解出的局面數
+        self._unsaved = 0
+        if checkpoint and os.path.exists(checkpoint):
+            self.load(checkpoint)
+
+    # --------------------------------------------------------
+    # 建立局面
+    # --------------------------------------------------------
+    def initial_state(self, planes):
+        """開局 (形狀已知、尚未翻開任何格子、有空襲)"""
+        return self.state_of_configs(find_configs(planes, self.size), (), True)
+
+    def state_of(self, engine):
+        """engine 目前玩家所知的局面"""
+        revealed = engine.revealed_cells()
+        heatmap = HeadHeatmap(engine.planes, engine.size)
+        heatmap.observe_all(revealed)
+        return self.state_of_configs(heatmap.configs, revealed, engine.bomb_available > 0)
+
+    def state_of_configs(self, configs, revealed, bomb):
+        rows = config_boards(configs, self.size)
+        for r, c, _ in revealed:
+            rows[:, r * self.size + c] = 0
+        return SolverState(rows, np.ones(len(rows), dtype=np.int64), bool(bomb))
+
+    # --------------------------------------------------------
+    # 公開查詢
+    # --------------------------------------------------------
+    def expected_clicks(self, state):
+        cost, rows, counts = self._normalize(state.rows, state.counts, state.bomb)
+        return cost + self._value(rows, counts, state.bomb)
+
+    def best_action(self, state):
+        """
+        回傳 ("click", r, c) 或 ("bomb", r, c) (與 plane_bots 相同格式)；已勝利回傳 None。
+        空襲用完且有確定的機頭時，直接點它
+        """
+        rows, counts, bomb = state
+        if not bomb:
+            known = (rows == 2).all(axis=0)
+            if known.any():
+                return ("click",) + divmod(int(np.flatnonzero(known)[0]), self.size)
+        cost, rows, counts = self._normalize(rows, counts, bomb)
+        if not len(rows):
+            return None
+        if (rows == rows[0]).all():
+            return self._single_action(rows[0], bomb)
+        self._value(rows, counts, bomb)
+        key, g, _, _ = self._canonical(rows, counts, bomb)
+        kind, j = self.table[key][1]
+        perm = self.perms[g]
+        if kind == "click":
+            return ("click",) + divmod(int(perm[j]), self.size)
+        block = [perm[j], perm[j + 1], perm[j + self.size], perm[j + self.size + 1]]
+        rs, cs = np.divmod(np.array(block), self.size)
+        return ("bomb", int(rs.min()), int(cs.min()))
+
+    def step_distribution(self, state):
+        """照最佳策略走，各步數結束的機率 (陣列索引 = 點擊數)"""
+        return self._distribution(state.rows, state.counts, state.bomb, {})
+
+    def win_rate(self, state, max_steps):
+        """最佳策略在 max_steps 步內找到所有機頭的機率"""
+        return float(self.step_distribution(state)[:max_steps + 1].sum())
+
+    # --------------------------------------------------------
+    # 化簡、正規化與下界
+    # --------------------------------------------------------
+    def _normalize(self, rows, counts, bomb):
+        """回傳 (自動點掉的機頭數, 化簡後的盤面, 權重)；已勝利的盤面回傳空陣列"""
+        rows = rows.copy()
+        constant = (rows == rows[0]).all(axis=0)
+        cost = 0
+        if not bomb:
+            known = constant & (rows[0] == 2)
+            cost = int(known.sum())
+            rows[:, known] = 0
+        rows[:, constant & (rows[0] != 2)] = 0
+        if not (rows == 2).any():
+            return cost, rows[:0], counts[:0]
+        return cost, rows, counts
+
+    def _canonical(self, rows, counts, bomb):
+        """8 種對稱中位元組序最小的一種；回傳 (鍵, 對稱編號, 盤面, 權重)"""
+        # 每列當成一個定長位元組字串 (比 np.unique(axis=0) 快得多)，先合併相同的盤面
+        width = rows.shape[1]
+        uniq, inverse = np.unique(np.ascontiguousarray(rows).view(f"V{width}").ravel(), return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=counts, minlength=len(uniq)).astype(np.int64)
+        rows = uniq.view(np.uint8).reshape(len(uniq), width)
+
+        # 8 種轉換一次做完，各自排序後取位元組序最小者
+        moved = np.ascontiguousarray(rows[:, self.perms].transpose(1, 0, 2))
+        packed = moved.view(f"V{width}")[..., 0]
+        order = np.argsort(packed, axis=1)
+        raws = [packed[g, order[g]].tobytes() + counts[order[g]].tobytes() for g in range(len(order))]
+        g = min(range(len(raws)), key=raws.__getitem__)
+        key = hashlib.blake2b(raws[g] + bytes([bomb]), digest_size=16).digest()
+        return key, g, moved[g, order[g]], counts[order[g]]
+
+    def _blocks(self, heads):
+        """每列每個 2x2 (左上角 r, c < size - 1) 內的機頭數，(M, (size-1)^2)"""
+        n = self.size
+        grid = heads.reshape(len(heads), n, n).astype(np.int8)
+        block = grid[:, :-1, :-1] + grid[:, 1:, :-1] + grid[:, :-1, 1:] + grid[:, 1:, 1:]
+        return block.reshape(len(heads), -1)
+
+    def _single_action(self, row, bomb):
+        """盤面已確定時的最佳動作：有空襲就炸機頭最多的 2x2，否則點任一個機頭"""
+        heads = row == 2
+        if bomb:
+            return ("bomb",) + divmod(int(self._blocks(heads[None])[0].argmax()), self.size - 1)
+        return ("click",) + divmod(int(np.flatnonzero(heads)[0]), self.size)
+
+    # --------------------------------------------------------
+    # 期望值搜尋
+    # --------------------------------------------------------
+    def _known_value(self, row, bomb):
+        """盤面已確定：每個機頭點一下，空襲可順便炸掉同一個 2x2 內的機頭"""
+        heads = row == 2
+        return int(heads.sum() - (self._blocks(heads[None])[0].max() if bomb else 0))
+
+    def _lower_bound(self, rows, counts, bomb):
+        """知道答案時的期望點擊數，一定不大於真正的期望值"""
+        if not len(rows):
+            return 0.0
+        heads = rows == 2
+        need = heads.sum(axis=1) - (self._blocks(heads).max(axis=1) if bomb else 0)
+        return float(counts @ need) / counts.sum()
+
+    def _value(self, rows, counts, bomb, limit=np.inf):
+        """
+        已化簡局面之後還需要的期望點擊數。
+        答案不小於 limit 時提早停止，只回傳一個不小於 limit 的下界 (也存入置換表)
+        """
+        if not len(rows):
+            return 0.0
+        if (rows == rows[0]).all():
+            return float(self._known_value(rows[0], bomb))
+
+        key, _, rows, counts = self._canonical(rows, counts, bomb)
+        hit = self.table.get(key)
+        if hit is not None and (hit[2] or hit[0] >= limit):
+            return hit[0]
+
+        heads = rows == 2
+        n_heads = heads.sum(axis=1)
+        p = counts / counts.sum()
+        base = self._lower_bound(rows, counts, bomb)
+
+        # 每個動作的下界：點擊 = 1 + 下界 - 點到機頭的機率；空襲 = 炸完後剩下的機頭數
+        informative = ~(rows == rows[0]).all(axis=0) | heads[0]
+        actions = [(1.0 + base - float(p @ heads[:, b]), "click", int(b)) for b in np.flatnonzero(informative)]
+        if bomb:
+            bounds = p @ (n_heads[:, None] - self._blocks(heads))
+            n = self.size
+            actions += [(float(bounds[a]), "bomb", (a // (n - 1)) * n + a % (n - 1))
+                        for a in range(len(bounds))]
+        actions.sort()
+
+        best, best_action, floor = np.inf, None, np.inf
+        for bound, kind, j in actions:
+            threshold = min(best, limit)
+            if bound >= threshold - EPSILON:
+                floor = bound      # 其餘動作都不會更好
+                break
+            value = self._action_value(rows, counts, bomb, kind, j, threshold)
+            if value < best:
+                best, best_action = value, (kind, j)
+
+        if best < limit:
+            self.table[key] = (best, best_action, True)
+        else:
+            best = min(best, floor)
+            if hit is not None and hit[0] >= best:
+                return hit[0]
+            self.table[key] = (best, None, False)
+        self._record()
+        return best
+
+    def _split(self, rows, counts, bomb, kind, j):
+        """執行動作後依看到的結果分組，逐一產生 (子局面盤面, 權重, 是否還有空襲)"""
+        rows = rows.copy()
+        if kind == "click":
+            cells = [j]
+            child_bomb = bomb
+        else:
+            cells = [j, j + 1, j + self.size, j + self.size + 1]
+            child_bomb = False
+        code = np.zeros(len(rows), dtype=np.int64)
+        for b in cells:
+            code = code * 3 + rows[:, b]
+        rows[:, cells] = 0
+        for outcome in np.unique(code):
+            mask = code == outcome
+            yield rows[mask], counts[mask], child_bomb
+
+    def _action_value(self, rows, counts, bomb, kind, j, limit):
+        """動作的期望點擊數；不小於 limit 時提早停止並回傳下界"""
+        total = counts.sum()
+        value = 1.0 if kind == "click" else 0.0
+        children = []
+        for child_rows, child_counts, child_bomb in self._split(rows, counts, bomb, kind, j):
+            won = ~(child_rows == 2).any(axis=1)
+            if won.all():
+                continue
+            child_rows, child_counts = child_rows[~won], child_counts[~won]
+            share = child_counts.sum() / total
+            cost, child_rows, child_counts = self._normalize(child_rows, child_counts, child_bomb)
+            bound = share * (cost + self._lower_bound(child_rows, child_counts, child_bomb))
+            children.append((share, cost, child_rows, child_counts, child_bomb, bound))
+
+        rest = sum(child[-1] for child in children)     # 還沒算的子局面下界總和
+        for share, cost, child_rows, child_counts, child_bomb, bound in children:
+            if value + rest >= limit:
+                break             # 已不可能比目前最佳動作好
+            rest -= bound
+            child_limit = (limit - value - rest) / share - cost
+            value += share * (cost + self._value(child_rows, child_counts, child_bomb, child_limit))
+        return value + rest
+
+    def _distribution(self, rows, counts, bomb, memo):
+        cost, rows, counts = self._normalize(rows, counts, bomb)
+        if not len(rows):
+            return _point(cost)
+        if (rows == rows[0]).all():
+            return _point(cost + self._known_value(rows[0], bomb))
+
+        self._value(rows, counts, bomb)
+        key, _, rows, counts = self._canonical(rows, counts, bomb)
+        dist = memo.get(key)
+        if dist is None:
+            kind, j = self.table[key][1]
+            step = 1 if kind == "click" else 0
+            total = counts.sum()
+            dist = np.zeros(step + 1)
+            for child_rows, child_counts, child_bomb in self._split(rows, counts, bomb, kind, j):
+                won = ~(child_rows == 2).any(axis=1)
+                dist[step] += child_counts[won].sum() / total
+                if not won.all():
+                    sub = self._distribution(child_rows[~won], child_counts[~won], child_bomb, memo)
+                    dist = _add(dist, np.concatenate([np.zeros(step), sub * (child_counts[~won].sum() / total)]))
+            memo[key] = dist
+        return np.concatenate([np.zeros(cost), dist])
+
+    # --------------------------------------------------------
+    # 預算與檢查點
+    # --------------------------------------------------------
+    def _record(self):
+        self.expanded += 1
+        self._unsaved += 1
+        if self.checkpoint and self._unsaved >= self.checkpoint_every:
+            self.save()
+        if self.max_states is not None and self.expanded >= self.max_states:
+            if self.checkpoint:
+                self.save()
+            raise SearchBudgetExceeded(f"已展開 {self.expanded} 個局面，超過上限")
+
+    def save(self, path=None):
+        path = path or self.checkpoint
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": FORMAT_VERSION, "size": self.size, "table": self.table}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)     # 寫完才換上，中斷也不會留下壞掉的檢查點
+        self._unsaved = 0
+
+    def load(self, path):
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != FORMAT_VERSION or data.get("size") != self.size:
+            raise ValueError("檢查點格式或棋盤大小不符")
+        self.table.update(data["table"])
+
+
+def _point(steps):
+    """必定在 steps 步結束的分布"""
+    dist = np.zeros(steps + 1)
+    dist[steps] = 1.0
+    return dist
+
+
+def _add(a, b):
+    """長度不同的機率陣列相加"""
+    if len(a) < len(b):
+        a, b = b, a
+    a = a.copy()
+    a[:len(b)] += b
+    return a
+
+
+# ============================================================
+# 【第 4 段】核對 (python plane_solver.py --check 20)
+# 目的：剪枝、化簡與正規化改動後確認解答沒有被悄悄改錯
+#       - brute_force_value：不剪枝、不用對稱與化簡的期望值搜尋，與 expected_clicks 比對
+#       - replay_policy：在每種配置上照 best_action 實際玩完，平均點擊數須等於期望值
+#       盤面 boards 為 config_boards 的原始盤面 (不清除已翻開的格子)，revealed 為已翻開的格子編號
+# ============================================================
+CHECK_CONFIGS = 24       # 核對用局面最多保留的配置數 (暴力搜尋的成本隨配置數急增)
+
+
+def brute_force_value(boards, revealed, bomb, size):
+    """
+    逐一嘗試每個動作的期望點擊數 (每種配置等機率)；
+    只略過所有配置都相同、又不是未找到機頭的格子 (點了不得分也沒有資訊)。
+    已翻開的格子在所有配置中都相同，局面只需記錄剩下的配置與已找到的機頭
+    """
+    n_planes = int((boards[0] == 2).sum())
+    blocks = [[r * size + c, r * size + c + 1, (r + 1) * size + c, (r + 1) * size + c + 1]
+              for r in range(size - 1) for c in range(size - 1)]
+    memo = {}
+
+    def outcomes(ids, cells, bomb, found):
+        groups = {}
+        for i in ids:
+            groups.setdefault(tuple(boards[i, cells]), []).append(i)
+        total = 0.0
+        for outcome, group in groups.items():
+            heads = found | {b for b, v in zip(cells, outcome) if v == 2}
+            total += len(group) * value(tuple(group), bomb, frozenset(heads))
+        return total / len(ids)
+
+    def value(ids, bomb, found):
+        if len(found) == n_planes:
+            return 0.0
+        key = (ids, bomb, found)
+        if key not in memo:
+            rows = boards[list(ids)]
+            useful = ~(rows == rows[0]).all(axis=0) | (rows[0] == 2)
+            best = min(1.0 + outcomes(ids, [int(b)], bomb, found)
+                       for b in np.flatnonzero(useful) if b not in found)
+            if bomb:
+                best = min([best] + [outcomes(ids, block, False, found) for block in blocks])
+            memo[key] = best
+        return memo[key]
+
+    found = frozenset(b for b in revealed if boards[0, b] == 2)
+    return value(tuple(range(len(boards))), bool(bomb), found)
+
+
+def replay_policy(solver, boards, revealed, bomb):
+    """把每種配置當成答案，照 solver.best_action 玩到找到所有機頭，回傳平均點擊數"""
+    size = solver.size
+    total = 0
+    for truth in boards:
+        alive = np.arange(len(boards))
+        seen = set(revealed)
+        has_bomb = bool(bomb)
+        heads = set(np.flatnonzero(truth == 2))
+        while not heads <= seen:
+            rows = boards[alive]
+            rows[:, sorted(seen)] = 0
+            kind, r, c = solver.best_action(SolverState(rows, np.ones(len(rows), dtype=np.int64), has_bomb))
+            b = r * size + c
+            if kind == "click":
+                cells = [b]
+                total += 1
+            else:
+                cells = [b, b + 1, b + size, b + size + 1]
+                has_bomb = False
+            for b in cells:
+                if b not in seen:
+                    seen.add(b)
+                    alive = alive[boards[alive, b] == truth[b]]
+    return total / len(boards)
+
+
+def check_position(solver, engine):
+    """回傳 (expected_clicks, 重播平均點擊數, 暴力搜尋值)；配置超過 CHECK_CONFIGS 時不做暴力搜尋"""
+    heatmap = HeadHeatmap(engine.planes, engine.size)
+    heatmap.observe_all(engine.revealed_cells())
+    boards = config_boards(heatmap.configs, engine.size)
+    revealed = [r * engine.size + c for r, c, _ in engine.revealed_cells()]
+    bomb = engine.bomb_available > 0
+    values = (solver.expected_clicks(solver.state_of(engine)), replay_policy(solver, boards, revealed, bomb))
+    if len(boards) <= CHECK_CONFIGS:
+        values += (brute_force_value(boards, revealed, bomb, engine.size),)
+    return values
+
+
+def check_positions(count, seed=0):
+    """
+    在 5x5 / 6x6 上各抽一半的 2 架局面，隨機翻格直到配置數不超過 CHECK_CONFIGS，
+    每隔兩個局面先隨機用掉空襲 (核對沒有空襲的局面)；最後再重播一個完整的 6x6 開局
+    (配置太多，只重播不做暴力搜尋)。所有數值一致回傳 True
+    """
+    rng = random.Random(seed)
+    solvers = {}
+    ok = True
+    for i in range(count):
+        size = 5 if i % 2 == 0 else 6
+        solver = solvers.setdefault(size, PlaneSolver(size))
+        engine = PlaneEngine(size, rng)
+        while True:
+            try:
+                engine.start_game(2, size * size)
+            except ValueError:
+                continue          # 5x5 上第一架的位置可能讓第二架放不下，重抽
+            heatmap = HeadHeatmap(engine.planes, size)
+            if i % 4 >= 2:
+                engine.use_bomb()
+                heatmap.observe_all(engine.on_click(rng.randrange(size - 1), rng.randrange(size - 1)))
+            cells = [(r, c) for r in range(size) for c in range(size)]
+            rng.shuffle(cells)
+            for r, c in cells:
+                if len(heatmap.configs) <= CHECK_CONFIGS or engine.game_over: break
+                heatmap.observe_all(engine.on_click(r, c))
+            if not engine.game_over: break
+
+        ok &= _report(solver, engine, len(heatmap.configs))
+
+    engine = PlaneEngine(6)
+    engine.start_game(2, 36, get_catalog(6).sample_board(2, random.Random(seed)))
+    ok &= _report(solvers.setdefault(6, PlaneSolver(6)), engine, None)
+    return ok
+
+
+def _report(solver, engine, n_configs):
+    values = check_position(solver, engine)
+    match = max(values) - min(values) < 1e-6
+    size = engine.size
+    line = f"  {size}x{size} 變體 {[get_catalog(size).variant_of(s) for s in engine.planes]}"
+    line += f"，{n_configs} 種配置" if n_configs is not None else "，完整開局"
+    line += f"：解 {values[0]:.4f} 重播 {values[1]:.4f}"
+    if len(values) > 2:
+        line += f" 暴力 {values[2]:.4f}"
+    print(line + ("" if match else "  ✖ 不一致"))
+    return match
+
+
+# ============================================================
+# 【主程式入口】
+# 目的：隨機抽一組飛機形狀，解開局局面並列出各難度步數上限下的勝率
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="尋找機頭：最佳策略精確解")
+    parser.add_argument("--planes", type=int, default=2)
+    parser.add_argument("--size", type=int, default=GRID_SIZE)
+    parser.add_argument("--seed", type=int, default=0, help="抽飛機形狀用的種子")
+    parser.add_argument("--checkpoint", help="置換表檢查點路徑 (存在就接續)")
+    parser.add_argument("--max-states", type=int, help="本次最多展開的局面數")
+    parser.add_argument("--check", type=int, metavar="N",
+                        help="改為核對 N 個 5x5 / 6x6 小局面 (暴力搜尋與重播)，不一致時結束碼為 1")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        ok = check_positions(args.check, args.seed)
+        print("全部一致" if ok else "有局面不一致")
+        return 0 if ok else 1
+
+    board = get_catalog(args.size).sample_board(args.planes, random.Random(args.seed))
+    planes = [get_catalog(args.size).variants[p.variant].shape for p in board]
+    solver = PlaneSolver(args.size, args.checkpoint, max_states=args.max_states)
+    state = solver.initial_state(planes)
+    print(f"{args.size}x{args.size}、{args.planes} 架，變體 {[p.variant for p in board]}，{len(state.rows)} 種配置")
+
+    start = time.perf_counter()
+    try:
+        value = solver.expected_clicks(state)
+    except SearchBudgetExceeded as e:
+        print(f"{e}；" + ("已寫入檢查點，再次執行即可接續" if args.checkpoint else "可加上 --checkpoint 分次計算"))
+        return
+    elapsed = time.perf_counter() - start
+    if args.checkpoint:
+        solver.save()
+
+    print(f"最少期望點擊數 {value:.4f}，第一步 {solver.best_action(state)}，"
+          f"置換表 {len(solver.table)} 個局面，{elapsed:.1f} 秒")
+    for name, steps in DIFFICULTY_STEPS.items():
+        print(f"  {name} ({steps} 步)：最佳策略勝率 {solver.win_rate(state, steps):.2%}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
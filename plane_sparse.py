@@ -0,0 +1,115 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：大棋盤模式 (例如 1000x1000、數百架飛機)，只記錄有飛機與翻開過的格子
+# ============================================================
+import random
+from itertools import accumulate
+
+from plane_engine import HEAD, BODY, PlaneEngine
+from plane_metrics import METRICS
+from plane_shapes import get_catalog
+
+
+# ============================================================
+# 【第 2 段】基本參數
+# ============================================================
+# 棋盤邊長超過此值時 make_engine 改用稀疏儲存：PlaneEngine 的完整形狀目錄隨面積成長
+# (20x20 約 80 ms / 6.5 MB，30x30 約 150 ms / 20 MB，100x100 約 4 秒 / 數百 MB)，
+# 每局省下的時間 (約 25 微秒) 在 20 以上已不值得
+SPARSE_THRESHOLD = 20
+MAX_ATTEMPTS = 1000      # 單架飛機的最多嘗試次數 (稀疏棋盤幾乎一次就成功)
+
+
+# ============================================================
+# 【第 3 段】SparseEngine 類別
+# 目的：格子內容存在 {r * size + c: HEAD/BODY} 字典、翻開的格子存在集合，
+#       記憶體與結束時翻開全圖的成本只跟飛機數量有關，與棋盤面積無關
+# ============================================================
+class SparseEngine(PlaneEngine):
+    def _reset_board(self):
+        self.cells = {}
+        self.revealed_keys = set()
+        # 形狀目錄只取 10x10 的變體 (形狀與外框和棋盤大小無關)，
+        # 抽變體的權重為它在本棋盤上可放的機頭位置數
+        self._variants = get_catalog().variants
+        self._cum_weights = list(accumulate(
+            (self.size - (v.bbox[2] - v.bbox[0])) * (self.size - (v.bbox[3] - v.bbox[1]))
+            for v in self._variants))
+
+    def place_planes(self, count):
+        self._place_sampled(count, self.rng)
+
+    def place_seeded(self, count, seed):
+        """大棋盤不建完整目錄；同一個種子永遠得到同一張棋盤 (抽法與 place_planes 相同)"""
+        self._place_sampled(count, random.Random(seed))
+
+    def _place_sampled(self, count, rng):
+        """
+        先依可放位置數加權抽變體、再均勻抽機頭位置，重疊就重抽；
+        分布與 ShapeCatalog.sample 相同 (所有合法放置均勻分布)，
+        每架的成本與棋盤大小、已放的飛機數無關
+        """
+        for _ in range(count):
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                variant = rng.choices(self._variants, cum_weights=self._cum_weights)[0]
+                min_x, min_y, max_x, max_y = variant.bbox
+                r = rng.randrange(-min_y, self.size - max_y)
+                c = rng.randrange(-min_x, self.size - max_x)
+                if self.is_valid_position(r, c, variant.shape):
+                    self.add_plane_to_grid(r, c, variant.shape)
+                    if METRICS.enabled: METRICS.observe("place.attempts", attempt)
+                    break
+            else:
+                if METRICS.enabled: METRICS.count("place.failures")
+                raise ValueError("棋盤太擁擠，無法放置所有飛機")
+
+    def place_board(self, board):
+        for placement in board:
+            self.add_plane_to_grid(placement.r, placement.c, self._variants[placement.variant].shape)
+
+    def is_valid_position(self, r, c, shape):
+        size = self.size
+        cells = self.cells
+        for dx, dy in shape:
+            nr, nc = r + dy, c + dx
+            if not (0 <= nr < size and 0 <= nc < size): return False
+            if nr * size + nc in cells: return False
+        return True
+
+    def add_plane_to_grid(self, r, c, shape):
+        size = self.size
+        for i, (dx, dy) in enumerate(shape):
+            self.cells[(r + dy) * size + c + dx] = HEAD if i == 0 else BODY
+        self._register_plane(r, c, shape)
+
+    def cell_at(self, r, c):
+        return self.cells.get(r * self.size + c)
+
+    def is_revealed(self, r, c):
+        return r * self.size + c in self.revealed_keys
+
+    def reveal_cell(self, r, c):
+        key = r * self.size + c
+        if key in self.revealed_keys: return []
+        self.revealed_keys.add(key)
+
+        cell = self.cells.get(key)
+        if cell is not None:
+            self._hit(key, cell)
+        return [(r, c, cell)]
+
+    def reveal_all_planes(self):
+        """遊戲結束後，列出所有飛機格子 (只走訪有飛機的格子)"""
+        size = self.size
+        return [divmod(key, size) + (cell,) for key, cell in self.cells.items()]
+
+    def revealed_cells(self):
+        size = self.size
+        return [divmod(key, size) + (self.cells.get(key),) for key in self.revealed_keys]
+
+
+def make_engine(size, rng=None):
+    """依棋盤大小選擇儲存方式：大棋盤用 SparseEngine"""
+    if size > SPARSE_THRESHOLD:
+        return SparseEngine(size, rng)
+    return PlaneEngine(size, rng)
@@ -0,0 +1,159 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：精簡的對局狀態 (大量對局常駐記憶體、快照與還原用)
+#       用法：python plane_state.py   (量測記憶體與快照/還原成本)
+# ============================================================
+import struct
+import sys
+import timeit
+
+from plane_engine import PlaneEngine
+from plane_shapes import GRID_SIZE, Placement, get_catalog
+from plane_sparse import make_engine
+
+
+# ============================================================
+# 【第 2 段】固定長度格式 (little endian)
+#   飛機數(1) 步數(2) 步數上限(2) 旗標(1) 種子(8)
+#   + MAX_PLANES 組 (變體編號, 機頭 r, 機頭 c)，各 1 byte
+#   + 已翻開格子的位元 (位元 r * size + c)
+#   棋盤內容可由飛機變體與位置推回，不另外存；
+#   飛機數與機頭座標欄位固定，只收 MAX_PLANES 架、MAX_SIZE 以內的棋盤
+#   (大棋盤的快照請用 plane_replay 的可變長度記錄)
+# ============================================================
+MAX_PLANES = 3
+MAX_SIZE = 255
+
+FLAG_BOMB = 1            # 還有空襲
+FLAG_BOMBING = 2         # 空襲鎖定中
+FLAG_OVER = 4            # 遊戲結束
+FLAG_WON = 8             # 勝利
+FLAG_SEED = 16           # 棋盤有種子 (沒有種子的棋盤種子欄位為 0)
+
+_HEAD = struct.Struct("<BHHBQ" + "BBB" * MAX_PLANES)
+
+
+def blob_size(size=GRID_SIZE):
+    return _HEAD.size + (size * size + 7) // 8
+
+
+# ============================================================
+# 【第 3 段】CompactGame 類別
+# ============================================================
+class CompactGame:
+    __slots__ = ("size", "num_planes", "steps", "max_steps", "flags", "seed", "planes", "revealed")
+
+    def __init__(self, size, num_planes, steps, max_steps, flags, seed, planes, revealed):
+        self.size = size
+        self.num_planes = num_planes
+        self.steps = steps
+        self.max_steps = max_steps
+        self.flags = flags
+        self.seed = seed              # engine.seed (沒有種子為 None)
+        self.planes = planes          # bytes：(變體編號, r, c) * MAX_PLANES
+        self.revealed = revealed      # int：已翻開格子的位元板
+
+    @classmethod
+    def from_engine(cls, engine):
+        """步數上限最多 65535 (實際上不超過棋盤格數)，種子須為 64 位元以內的非負整數"""
+        if len(engine.planes) > MAX_PLANES or engine.size > MAX_SIZE:
+            raise ValueError(f"快照只支援 {MAX_SIZE}x{MAX_SIZE} 以內、最多 {MAX_PLANES} 架飛機的棋盤")
+        if not 0 <= engine.max_steps < 65535:
+            raise ValueError("快照只支援步數上限 0 ~ 65534")
+        if engine.seed is not None and not 0 <= engine.seed < 1 << 64:
+            raise ValueError("快照只支援 64 位元以內的非負種子")
+        catalog = get_catalog()   # 變體編號各種棋盤大小都相同
+        planes = bytearray(3 * MAX_PLANES)
+        for i, (shape, (r, c)) in enumerate(zip(engine.planes, engine.anchors)):
+            planes[3 * i:3 * i + 3] = (catalog.variant_of(shape), r, c)
+
+        revealed = 0
+        for r, c, _ in engine.revealed_cells():
+            revealed |= 1 << (r * engine.size + c)
+
+        flags = ((FLAG_BOMB if engine.bomb_available > 0 else 0) | (FLAG_BOMBING if engine.is_bombing else 0)
+                 | (FLAG_OVER if engine.game_over else 0) | (FLAG_WON if engine.won else 0)
+                 | (FLAG_SEED if engine.seed is not None else 0))
+        return cls(engine.size, len(engine.planes), engine.steps, engine.max_steps, flags, engine.seed,
+                   bytes(planes), revealed)
+
+    def to_engine(self, engine=None):
+        """還原成可繼續玩的 engine (預設依棋盤大小由 make_engine 選)"""
+        engine = engine if engine is not None else make_engine(self.size)
+        p = self.planes
+        board = [Placement(p[3 * i], p[3 * i + 1], p[3 * i + 2], None) for i in range(self.num_planes)]
+        engine.start_game(self.num_planes, self.max_steps, board, self.seed)
+
+        revealed = self.revealed
+        while revealed:
+            low = revealed & -revealed
+            engine.reveal_cell(*divmod(low.bit_length() - 1, self.size))
+            revealed ^= low
+
+        flags = self.flags
+        engine.steps = self.steps
+        engine.bomb_available = 1 if flags & FLAG_BOMB else 0
+        engine.is_bombing = bool(flags & FLAG_BOMBING)
+        engine.game_over = bool(flags & FLAG_OVER)
+        engine.won = bool(flags & FLAG_WON)
+        return engine
+
+    def to_bytes(self):
+        return (_HEAD.pack(self.num_planes, self.steps, self.max_steps, self.flags, self.seed or 0, *self.planes)
+                + self.revealed.to_bytes((self.size * self.size + 7) // 8, "little"))
+
+    @classmethod
+    def from_bytes(cls, blob, size=GRID_SIZE):
+        if len(blob) != blob_size(size):
+            raise ValueError("快照長度不符")
+        fields = _HEAD.unpack_from(blob)
+        flags = fields[3]
+        seed = fields[4] if flags & FLAG_SEED else None
+        return cls(size, fields[0], fields[1], fields[2], flags, seed, bytes(fields[5:]),
+                   int.from_bytes(blob[_HEAD.size:], "little"))
+
+
+# ============================================================
+# 【第 4 段】量測
+# ============================================================
+def deep_sizeof(obj, seen=None):
+    """粗略估算物件 (含內部容器) 佔用的位元組數，共用的物件只算一次"""
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(x, seen) for x in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, s), seen) for s in obj.__slots__ if hasattr(obj, s))
+    return size
+
+
+def measure(engine):
+    """回傳 engine 與精簡狀態的記憶體 (bytes) 及快照/還原時間 (微秒)"""
+    shared = {id(engine.rng)} | {id(s) for s in engine.planes}  # 亂數產生器與目錄形狀為共用物件
+    game = CompactGame.from_engine(engine)
+    blob = game.to_bytes()
+    n = 2000
+    return {
+        "engine_bytes": deep_sizeof(engine, set(shared)),
+        "compact_bytes": deep_sizeof(game),
+        "blob_bytes": len(blob),
+        "snapshot_us": timeit.timeit(lambda: CompactGame.from_engine(engine).to_bytes(), number=n) / n * 1e6,
+        "restore_us": timeit.timeit(lambda: CompactGame.from_bytes(blob, engine.size).to_engine(), number=n) / n * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    import random
+
+    engine = PlaneEngine(rng=random.Random(0))
+    engine.start_game(3, 30)
+    for r, c in [(0, 0), (5, 5), (9, 9), (3, 7)]:
+        engine.on_click(r, c)
+    print(measure(engine))
@@ -0,0 +1,310 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：終端機版 (ANSI 顏色 + 文字指令)，不載入 tkinter 或任何 GUI 模組，
+#       沒有顯示器的主機也能玩，啟動只需載入規則核心
+#       用法：python plane_term.py                 (先選飛機數與難度)
+#             python plane_term.py --planes 3 --difficulty 困難
+#             python plane_term.py --size 1000 --planes 300   (大棋盤只顯示目標附近)
+# ============================================================
+import datetime
+import os
+import sys
+import time
+
+from plane_engine import DIFFICULTY_STEPS, HEAD, BODY               # 無 GUI 的遊戲規則
+from plane_shapes import GRID_SIZE, daily_seed                      # 每日挑戰的棋盤種子
+from plane_sparse import make_engine                                # 依棋盤大小選擇儲存方式
+
+
+# ============================================================
+# 【第 2 段】顯示設定
+# 目的：顏色對應 GUI 的深色雷達風；NO_COLOR 或輸出不是終端機時只用字元區分；
+#       欄位字母不夠用的大棋盤改用「列,欄」數字座標，只畫最後一個目標附近 VIEW_SIZE 見方
+# ============================================================
+COLUMNS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+VIEW_SIZE = len(COLUMNS)
+
+RESET = "\x1b[0m"
+STYLE_DEFAULT = "\x1b[90m"       # 未翻開 (灰)
+STYLE_MISS = "\x1b[97m"          # 空包彈 (白)
+STYLE_BODY = "\x1b[1;34m"        # 機身 (藍)
+STYLE_HEAD = "\x1b[1;31m"        # 機頭 (紅)
+STYLE_TITLE = "\x1b[1;36m"       # 標題 (青)
+
+CELL_CHARS = {None: "o", BODY: "#", HEAD: "X"}   # 翻開後的格子
+UNKNOWN_CHAR = "."
+
+HELP = ("指令：C5 翻開 C 欄第 5 列  |  !C5 以 C5 為左上角呼叫 2x2 空襲  |"
+        "  n 新任務  |  q 離開")
+HELP_NUMERIC = ("指令：5,3 翻開第 5 列第 3 欄  |  !5,3 以該格為左上角呼叫 2x2 空襲  |"
+                "  n 新任務  |  q 離開")
+
+
+def use_color(stream=sys.stdout):
+    if os.environ.get("NO_COLOR") or not stream.isatty():
+        return False
+    if os.name == "nt":
+        os.system("")             # 讓 Windows 10 以後的主控台處理 ANSI 跳脫字元
+    return True
+
+
+# ============================================================
+# 【第 3 段】TermGame 類別
+# 目的：與 PlaneGame 相同的流程 (設定 → 開局 → 點擊 / 空襲 → 結算)，
+#       規則全部交給 PlaneEngine，這裡只負責輸入與繪製
+# ============================================================
+class TermGame:
+    def __init__(self, engine=None, color=None, out=sys.stdout, read=input, results_path=None):
+        self.engine = engine if engine is not None else make_engine(GRID_SIZE)
+        self.color = use_color(out) if color is None else color
+        self.out = out
+        self.read = read
+        self.message = ""
+        self.shown_all = False    # 結束後顯示全部飛機
+        self.focus = (0, 0)       # 大棋盤顯示範圍的中心 (最後一個目標)
+        self.results_path = results_path   # 省略時用 plane_results.RESULTS_PATH
+        self.results = None       # ResultStore，第一局結束時才建立 (不拖慢啟動)
+        self.started = time.monotonic()
+
+    def paint(self, text, style):
+        return f"{style}{text}{RESET}" if self.color else text
+
+    # ========================================================
+    # 【第 4 段】任務設定 (對應 ask_start_game)
+    # ========================================================
+    def ask_settings(self):
+        """回傳 (飛機數, 難度名稱, 是否每日挑戰)；直接按 Enter 用預設值"""
+        planes = self._choose("請選擇飛機數量 [2] / 3：", {"2": 2, "3": 3}, 2)
+        names = list(DIFFICULTY_STEPS)
+        options = {name: name for name in names}
+        options.update({str(i + 1): name for i, name in enumerate(names)})
+        listing = " / ".join(f"{i + 1}.{n}({DIFFICULTY_STEPS[n]}步)" for i, n in enumerate(names))
+        difficulty = self._choose(f"請選擇難度 {listing} [一般]：", options, "一般")
+        daily = self._choose("今日挑戰？ y / [n]：", {"y": True, "n": False}, False)
+        return planes, difficulty, daily
+
+    def _choose(self, prompt, options, default):
+        while True:
+            answer = self.read(prompt).strip().lower()
+            if not answer:
+                return default
+            if answer in options:
+                return options[answer]
+            self.out.write(f"無效的選項：{answer}\n")
+
+    def start_game(self, num_planes, difficulty, daily=False, seed=None):
+        if daily and seed is None:
+            seed = daily_seed(datetime.date.today(), num_planes, difficulty)
+        self.engine.start_game(num_planes, DIFFICULTY_STEPS[difficulty], seed=seed)
+        self.started = time.monotonic()
+        self.shown_all = False
+        self.focus = (self.engine.size // 2, self.engine.size // 2)
+        self.message = self.help_text()
+
+    def help_text(self):
+        return HELP if self.engine.size <= len(COLUMNS) else HELP_NUMERIC
+
+    # ========================================================
+    # 【第 5 段】繪製：左側棋盤、右側飛機預覽
+    # ========================================================
+    def view_range(self):
+        """要畫的 (列, 欄) 範圍；大棋盤只取 focus 附近 VIEW_SIZE 見方"""
+        size = self.engine.size
+        if size <= VIEW_SIZE:
+            return range(size), range(size)
+        r, c = self.focus
+        top = min(max(0, r - VIEW_SIZE // 2), size - VIEW_SIZE)
+        left = min(max(0, c - VIEW_SIZE // 2), size - VIEW_SIZE)
+        return range(top, top + VIEW_SIZE), range(left, left + VIEW_SIZE)
+
+    def board_lines(self):
+        """棋盤的每一行 (可見寬度都相同)"""
+        engine = self.engine
+        rows, cols = self.view_range()
+        width = max(3, len(str(engine.size)))
+        if engine.size <= len(COLUMNS):
+            lines = [" " * (width + 1) + " ".join(COLUMNS[:engine.size])]
+        else:
+            # 欄號只標個位數，完整範圍由 render 寫在狀態列
+            lines = [" " * (width + 1) + " ".join(str((c + 1) % 10) for c in cols)]
+        for r in rows:
+            row = []
+            for c in cols:
+                cell = engine.cell_at(r, c)
+                if engine.is_revealed(r, c) or (self.shown_all and cell is not None):
+                    style = STYLE_HEAD if cell == HEAD else STYLE_BODY if cell == BODY else STYLE_MISS
+                    row.append(self.paint(CELL_CHARS[cell], style))
+                else:
+                    row.append(self.paint(UNKNOWN_CHAR, STYLE_DEFAULT))
+            lines.append(f"{r + 1:>{width}} " + " ".join(row))
+        return lines
+
+    def preview_lines(self, idx):
+        """第 idx 架飛機：標題 + 形狀；只標示是否已擊落，不標出翻到的是哪一格"""
+        engine = self.engine
+        shape = engine.planes[idx]
+        if engine.plane_heads_found[idx] > 0:
+            title = self.paint(f"敵機訊號 {idx + 1}  ✖ 已擊落", STYLE_HEAD)
+        else:
+            title = f"敵機訊號 {idx + 1}"
+
+        xs = [dx for dx, _ in shape]; ys = [dy for _, dy in shape]
+        min_x, min_y = min(xs), min(ys)
+        grid = [[" "] * (max(xs) - min_x + 1) for _ in range(max(ys) - min_y + 1)]
+        for i, (dx, dy) in enumerate(shape):
+            cell = HEAD if i == 0 else BODY
+            grid[dy - min_y][dx - min_x] = self.paint(CELL_CHARS[cell], STYLE_HEAD if i == 0 else STYLE_BODY)
+        return [title] + ["  " + " ".join(row) for row in grid] + [""]
+
+    def render(self):
+        engine = self.engine
+        lines = []
+        if self.color:
+            lines.append("\x1b[2J\x1b[H")    # 清除畫面，游標回左上角
+        title = "尋找機頭 - 雷達作戰中心"
+        if engine.seed is not None:
+            title += f"  (棋盤 #{engine.seed})"
+        lines.append(self.paint(title, STYLE_TITLE))
+        bomb = f"空襲 ({engine.bomb_available})" if engine.bomb_available else "空襲已耗盡"
+        lines.append(f"步數: {engine.steps} / 上限: {engine.max_steps}    "
+                     f"剩餘目標: {engine.heads_left}    {bomb}")
+        if engine.size > VIEW_SIZE:
+            rows, cols = self.view_range()
+            lines.append(f"顯示範圍：列 {rows[0] + 1}~{rows[-1] + 1}  欄 {cols[0] + 1}~{cols[-1] + 1}"
+                         f"  (共 {engine.size}x{engine.size})")
+        lines.append("")
+
+        board = self.board_lines()
+        panel = [self.paint("▼ 敵機情報 ▼", STYLE_TITLE)]
+        for idx in range(len(engine.planes)):
+            panel += self.preview_lines(idx)
+        blank = " " * len(board[0])   # 第一行沒有顏色，可見寬度就是字串長度
+        for i in range(max(len(board), len(panel))):
+            left = board[i] if i < len(board) else blank
+            right = panel[i] if i < len(panel) else ""
+            lines.append(f"{left}    {right}".rstrip())
+        lines.append("")
+        if self.message:
+            lines.append(self.message)
+        self.out.write("\n".join(lines) + "\n")
+        self.out.flush()
+
+    # ========================================================
+    # 【第 6 段】指令處理 (點擊 / 空襲 / 新任務 / 離開)
+    # ========================================================
+    def parse_cell(self, text):
+        """'C5' 或 '5,3' (列,欄) → (4, 2)；格式錯誤或超出棋盤回傳 None"""
+        text = text.strip().upper()
+        if "," in text:
+            parts = [part.strip() for part in text.split(",")]
+            if len(parts) != 2 or not all(part.isdigit() for part in parts):
+                return None
+            r, c = int(parts[0]) - 1, int(parts[1]) - 1
+        elif len(text) >= 2 and text[0] in COLUMNS and text[1:].isdigit():
+            r, c = int(text[1:]) - 1, COLUMNS.index(text[0])
+        else:
+            return None
+        if not (0 <= r < self.engine.size and 0 <= c < self.engine.size):
+            return None
+        return r, c
+
+    def handle(self, command):
+        """處理一行指令，回傳 "quit" / "new" / None"""
+        engine = self.engine
+        command = command.strip()
+        if command.lower() in ("q", "quit", "exit"):
+            return "quit"
+        if command.lower() in ("n", "new"):
+            return "new"
+        if command.lower() in ("h", "?", "help"):
+            self.message = self.help_text()
+            return None
+
+        bomb = command.startswith("!")
+        target = self.parse_cell(command[1:] if bomb else command)
+        if target is None:
+            self.message = f"看不懂的指令：{command}    {self.help_text()}"
+            return None
+        self.focus = target
+        if bomb:
+            if engine.bomb_available <= 0:
+                self.message = "空襲已耗盡"
+                return None
+            if not engine.is_bombing:
+                engine.use_bomb()
+        elif engine.is_bombing:
+            engine.use_bomb()     # 一般點擊時取消鎖定
+        events = engine.on_click(*target)
+        self.message = "" if events or bomb else "這一格已經翻開過了"
+        self.check_game_end()
+        return None
+
+    def check_game_end(self):
+        engine = self.engine
+        if not engine.game_over: return
+        self.shown_all = True     # 結束時顯示全圖
+        self.record_result()
+        if engine.won:
+            self.message = f"任務完成：恭喜！您以 {engine.steps} 步殲滅了所有敵機！"
+        else:
+            self.message = "任務失敗：步數已用盡，作戰失敗！"
+
+    def record_result(self):
+        """結果交給 ResultStore 的背景執行緒寫入 SQLite"""
+        from plane_results import RESULTS_PATH, ResultStore, result_of
+        if self.results is None:
+            self.results = ResultStore(self.results_path or RESULTS_PATH)
+        self.results.record(result_of(self.engine, self.started))
+
+    # ========================================================
+    # 【第 7 段】主迴圈
+    # ========================================================
+    def run(self, settings=None):
+        """settings 為 (飛機數, 難度, 每日挑戰)，省略則先詢問；Ctrl-C / Ctrl-D 直接離開"""
+        try:
+            while True:
+                self.start_game(*(settings or self.ask_settings()))
+                settings = None
+                action = self.play()
+                if action == "quit":
+                    return
+                if action is None and self._choose("再來一局？ [y] / n：", {"y": True, "n": False}, True) is False:
+                    return
+        except (EOFError, KeyboardInterrupt):
+            self.out.write("\n")
+
+    def play(self):
+        """玩到結束 (回傳 None) 或玩家要求新任務 / 離開"""
+        while True:
+            self.render()
+            if self.engine.game_over:
+                return None
+            action = self.handle(self.read("> "))
+            if action:
+                return action
+
+
+# ============================================================
+# 【主程式入口】
+# ============================================================
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="尋找機頭：終端機版")
+    parser.add_argument("--planes", type=int, help="飛機數量 (與 --difficulty 都給時略過設定)")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTY_STEPS), help="難度")
+    parser.add_argument("--daily", action="store_true", help="今日挑戰")
+    parser.add_argument("--no-color", action="store_true", help="不使用 ANSI 顏色")
+    parser.add_argument("--size", type=int, default=GRID_SIZE, help="棋盤邊長 (預設 10)")
+    args = parser.parse_args(argv)
+    if args.planes is not None and args.planes < 1:
+        parser.error("--planes 至少要 1")
+
+    game = TermGame(make_engine(args.size), color=False if args.no_color else None)
+    settings = None
+    if args.planes and args.difficulty:
+        settings = (args.planes, args.difficulty, args.daily)
+    game.run(settings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：向量化的 Gym 風格環境，N 局同步進行，每一步用陣列運算一次處理所有棋盤
+#       (訓練代理人用；不經過 PlaneEngine 或任何 Tk 元件)
+#       用法：python plane_vecenv.py --envs 300 --steps 80   (與 PlaneEngine 逐步比對規則)
+# ============================================================
+import argparse
+import sys
+
+import numpy as np
+
+from plane_batch import HEAD, generate_boards
+from plane_dataset import UNKNOWN, MISS, HIT_BODY, HIT_HEAD
+from plane_engine import BODY, DIFFICULTY_STEPS, PlaneEngine
+from plane_engine import HEAD as ENGINE_HEAD
+from plane_shapes import GRID_SIZE, get_catalog
+
+
+# ============================================================
+# 【第 2 段】動作與觀察
+#   動作 a (每局一個整數)：
+#     0 <= a < size*size             點擊格子 a = r * size + c (同 on_click)
+#     size*size <= a < 2*size*size   以格子 a - size*size 為左上角空襲 2x2 (同 execute_bomb_at，
+#                                    出界的格子略過、不計步數)；空襲已用完時當成點擊該格
+#   觀察：(N, size, size) uint8，UNKNOWN / MISS / HIT_BODY / HIT_HEAD (與 plane_dataset 相同)
+#   獎勵：這一步找到的機頭數 - step_penalty * (這一步是否用掉一步)
+# ============================================================
+class VecPlaneEnv:
+    def __init__(self, num_envs, num_planes=2, max_steps=DIFFICULTY_STEPS["一般"], size=GRID_SIZE,
+                 seed=None, auto_reset=True, step_penalty=0.0):
+        self.num_envs = num_envs
+        self.num_planes = num_planes
+        self.max_steps = max_steps
+        self.size = size
+        self.auto_reset = auto_reset
+        self.step_penalty = step_penalty
+        self.action_count = 2 * size * size
+        self.rng = np.random.default_rng(seed)
+
+        cells = size * size
+        self.boards = np.zeros((num_envs, cells), dtype=np.uint8)
+        self.placements = np.zeros((num_envs, num_planes), dtype=np.int32)   # get_catalog(size).placements 的索引
+        self.obs = np.zeros((num_envs, cells), dtype=np.uint8)
+        self.revealed = np.zeros((num_envs, cells), dtype=bool)
+        self.steps = np.zeros(num_envs, dtype=np.int32)
+        self.heads_left = np.zeros(num_envs, dtype=np.int32)
+        self.bombs = np.zeros(num_envs, dtype=np.int8)
+        self.over = np.zeros(num_envs, dtype=bool)
+
+    def _observation(self):
+        return self.obs.reshape(self.num_envs, self.size, self.size).copy()
+
+    # ========================================================
+    # 【第 3 段】重置
+    # ========================================================
+    def reset(self, mask=None):
+        """重開 mask 指定的局 (省略則全部)，回傳觀察"""
+        idx = np.arange(self.num_envs) if mask is None else np.flatnonzero(mask)
+        if len(idx):
+            boards, placements = generate_boards(len(idx), self.num_planes, self.rng, self.size)
+            self.boards[idx] = boards.reshape(len(idx), -1)
+            self.placements[idx] = placements
+            self.obs[idx] = UNKNOWN
+            self.revealed[idx] = False
+            self.steps[idx] = 0
+            self.heads_left[idx] = self.num_planes
+            self.bombs[idx] = 1
+            self.over[idx] = False
+        return self._observation()
+
+    # ========================================================
+    # 【第 4 段】同步前進一步
+    # 目的：規則與 PlaneEngine.on_click / execute_bomb_at 相同：
+    #       點已翻開的格子不算步數；第 max_steps + 1 次點擊直接判輸、不翻格
+    # ========================================================
+    def step(self, actions):
+        """
+        回傳 (觀察, 獎勵, 結束旗標, info)。
+        info 的 "won" / "steps" 是這一步結束的局的結果 (auto_reset 時觀察已是新局)
+        """
+        size, cells = self.size, self.size * self.size
+        rows = np.arange(self.num_envs)
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs,) or actions.min() < 0 or actions.max() >= self.action_count:
+            raise ValueError("動作必須是長度 num_envs、範圍 0 ~ action_count - 1 的整數陣列")
+
+        active = ~self.over
+        target = actions % cells
+        bomb = active & (actions >= cells) & (self.bombs > 0)
+        click = active & ~bomb & ~self.revealed[rows, target]
+
+        self.steps += click
+        lost = click & (self.steps > self.max_steps)       # 步數用盡
+        click &= ~lost
+
+        new = np.zeros((self.num_envs, cells), dtype=bool)
+        new[rows[click], target[click]] = True
+        r, c = np.divmod(target, size)
+        for dr in (0, 1):
+            for dc in (0, 1):
+                inside = bomb & (r + dr < size) & (c + dc < size)
+                new[rows[inside], (r + dr)[inside] * size + (c + dc)[inside]] = True
+        self.bombs[bomb] = 0
+
+        new &= ~self.revealed
+        self.revealed |= new
+        self.obs[new] = self.boards[new] + 1
+        found = (new & (self.boards == HEAD)).sum(axis=1).astype(np.int32)
+        self.heads_left -= found
+
+        won = active & (self.heads_left == 0)
+        done = won | lost
+        self.over |= done
+        rewards = found - self.step_penalty * click
+        info = {"won": won, "steps": self.steps.copy()}
+        if self.auto_reset and done.any():
+            self.reset(done)
+        return self._observation(), rewards, done, info
+
+    def valid_actions(self):
+        """(N, action_count) 布林遮罩：未翻開的格子可點；還有空襲時 2x2 左上角都可炸"""
+        clicks = ~self.revealed & ~self.over[:, None]
+        bombs = np.repeat((self.bombs > 0) & ~self.over, self.size * self.size).reshape(clicks.shape)
+        return np.concatenate([clicks, bombs], axis=1)
+
+
+# ============================================================
+# 【第 5 段】與 PlaneEngine 逐步比對
+# 目的：PlaneEngine 的規則改了而這裡沒跟著改時能被發現；
+#       每局各開一個 PlaneEngine 用同一張棋盤，送入相同的隨機動作，
+#       每一步比對獎勵、結束 / 勝利、步數、空襲、剩餘機頭與觀察 (含自動重開的新局)
+# ============================================================
+ENGINE_CODES = {None: MISS, BODY: HIT_BODY, ENGINE_HEAD: HIT_HEAD}
+
+
+def _engine_obs(engine):
+    obs = np.full(engine.size * engine.size, UNKNOWN, dtype=np.uint8)
+    for r, c, cell in engine.revealed_cells():
+        obs[r * engine.size + c] = ENGINE_CODES[cell]
+    return obs
+
+
+def _engine_step(engine, action):
+    """把 VecPlaneEnv 的動作套到 engine 上，回傳找到的機頭數"""
+    cells = engine.size * engine.size
+    before = engine.found_heads
+    if action >= cells and engine.bomb_available > 0 and not engine.game_over:
+        engine.use_bomb()
+    engine.on_click(*divmod(int(action) % cells, engine.size))
+    return engine.found_heads - before
+
+
+def check_against_engine(num_envs=300, steps=80, num_planes=2, seed=0):
+    """回傳不一致的描述 (list)，完全一致時為空"""
+    env = VecPlaneEnv(num_envs, num_planes, seed=seed)
+    catalog = get_catalog(env.size)
+    engines = [PlaneEngine(env.size) for _ in range(num_envs)]
+
+    def start(i):
+        engines[i].start_game(num_planes, env.max_steps, [catalog.placements[p] for p in env.placements[i]])
+
+    env.reset()
+    for i in range(num_envs):
+        start(i)
+    rng = np.random.default_rng(seed)
+    errors = []
+    for t in range(steps):
+        actions = rng.integers(0, env.action_count, num_envs)
+        _, rewards, done, info = env.step(actions)
+        for i, engine in enumerate(engines):
+            found = _engine_step(engine, actions[i])
+            got = (float(rewards[i]), bool(done[i]), bool(info["won"][i]), int(info["steps"][i]))
+            want = (found, engine.game_over, engine.won, engine.steps)
+            if got != want:
+                errors.append(f"第 {t} 步第 {i} 局：(獎勵, 結束, 勝利, 步數) {got} != {want}")
+            if done[i]:
+                start(i)          # auto_reset 已換上新棋盤，engine 跟著重開
+            got = (int(env.bombs[i]), int(env.heads_left[i]), env.obs[i].tobytes())
+            want = (engine.bomb_available, engine.heads_left, _engine_obs(engine).tobytes())
+            if got != want:
+                errors.append(f"第 {t} 步第 {i} 局：空襲、剩餘機頭或觀察不一致")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="VecPlaneEnv 與 PlaneEngine 逐步比對")
+    parser.add_argument("--envs", type=int, default=300)
+    parser.add_argument("--steps", type=int, default=80)
+    parser.add_argument("--planes", type=int, default=2, choices=(2, 3))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    errors = check_against_engine(args.envs, args.steps, args.planes, args.seed)
+    for line in errors[:20]:
+        print(line)
+    print(f"{args.envs} 局 x {args.steps} 步：" + (f"{len(errors)} 處不一致" if errors else "與 PlaneEngine 完全一致"))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
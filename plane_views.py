@@ -0,0 +1,207 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：主棋盤的兩種繪製方式，PlaneGame 只透過 reset / show / hint 操作
+# ============================================================
+import abc
+import tkinter as tk
+
+from plane_engine import HEAD, BODY
+
+
+def blend_color(c1, c2, t):
+    """兩個 #RRGGBB 顏色依比例 t (0~1) 混合"""
+    a = [int(c1[i:i + 2], 16) for i in (1, 3, 5)]
+    b = [int(c2[i:i + 2], 16) for i in (1, 3, 5)]
+    return "#" + "".join(f"{round(x + (y - x) * t):02x}" for x, y in zip(a, b))
+
+
+# ============================================================
+# 【第 2 段】GridView 基底
+# 目的：colors 需包含 default / hover / miss / body / head / target；
+#       hint 只在顯示的百分比改變時才重畫，target 為空襲建議位置；
+#       pending 為已翻開、等動畫輪到才 show 的格子
+# ============================================================
+class GridView(abc.ABC):
+    def __init__(self, parent, size, on_click, colors):
+        self.size = size
+        self.on_click = on_click
+        self.colors = colors
+        self.hints = {}          # (r, c) -> 目前顯示的百分比
+
+    def cell_color(self, cell):
+        if cell == HEAD: return self.colors["head"]
+        if cell == BODY: return self.colors["body"]
+        return self.colors["miss"]
+
+    def hint(self, r, c, prob):
+        """未翻開格子的機頭機率覆蓋層，prob 為 0 表示清除"""
+        pct = round(prob * 100)
+        if self.hints.get((r, c), 0) == pct: return
+        if pct:
+            self.hints[(r, c)] = pct
+        else:
+            self.hints.pop((r, c), None)
+        self._draw_hint(r, c, pct, prob)
+
+    @abc.abstractmethod
+    def reset(self):
+        """新局開始，清掉所有翻開、提示與建議框"""
+
+    @abc.abstractmethod
+    def show(self, r, c, cell):
+        """畫出翻開的格子"""
+
+    @abc.abstractmethod
+    def pending(self, r, c):
+        """格子已翻開但還沒輪到動畫"""
+
+    @abc.abstractmethod
+    def show_target(self, cells):
+        """標出空襲建議的格子"""
+
+    @abc.abstractmethod
+    def clear_target(self):
+        """收起空襲建議"""
+
+    @abc.abstractmethod
+    def _draw_hint(self, r, c, pct, prob):
+        """畫出 (pct 為 0 時清除) 單一格的機率提示"""
+
+
+# ============================================================
+# 【第 3 段】ButtonGridView (每格一個 tk.Button，原本的畫面)
+# ============================================================
+class ButtonGridView(GridView):
+    def __init__(self, parent, size, on_click, colors):
+        super().__init__(parent, size, on_click, colors)
+        self.buttons = [[None for _ in range(size)] for _ in range(size)]
+        self.dirty = set()       # 有變化過的格子，重置時只處理這些
+        self.target_saved = {}   # 空襲建議格子原本的底色
+        for r in range(size):
+            for c in range(size):
+                btn = tk.Button(
+                    parent, width=4, height=2,
+                    bg=colors["default"], activebackground=colors["hover"],
+                    relief="groove", borderwidth=1,
+                    command=lambda row=r, col=c: on_click(row, col)
+                )
+                btn.grid(row=r, column=c, padx=1, pady=1)
+                self.buttons[r][c] = btn
+        self.text_fg = self.buttons[0][0].cget("fg")   # 原本按鈕文字色，機頭 X 用
+
+    def reset(self):
+        self.hints.clear()
+        self.target_saved.clear()
+        for r, c in self.dirty:
+            self.buttons[r][c].config(bg=self.colors["default"], state=tk.NORMAL, text="", relief="groove")
+        self.dirty.clear()
+
+    def show(self, r, c, cell):
+        self.hints.pop((r, c), None)
+        self.target_saved.pop((r, c), None)
+        self.dirty.add((r, c))
+        self.buttons[r][c].config(bg=self.cell_color(cell), text="X" if cell == HEAD else "",
+                                  fg=self.text_fg, relief="sunken", state=tk.DISABLED)
+
+    def pending(self, r, c):
+        """先停用按鈕並清掉提示，顏色等 show 再換"""
+        self.hints.pop((r, c), None)
+        self.target_saved.pop((r, c), None)
+        self.dirty.add((r, c))
+        self.buttons[r][c].config(bg=self.colors["default"], text="", state=tk.DISABLED)
+
+    def _draw_hint(self, r, c, pct, prob):
+        self.dirty.add((r, c))
+        bg = blend_color(self.colors["default"], self.colors["head"], prob) if pct else self.colors["default"]
+        if (r, c) in self.target_saved:
+            self.target_saved[(r, c)] = bg   # 建議框還在，清除時再換上新底色
+            bg = self.colors["target"]
+        self.buttons[r][c].config(text=str(pct) if pct else "", fg="white", bg=bg)
+
+    def show_target(self, cells):
+        self.clear_target()
+        for r, c in cells:
+            btn = self.buttons[r][c]
+            if btn["state"] == tk.DISABLED: continue
+            self.target_saved[(r, c)] = btn.cget("bg")
+            self.dirty.add((r, c))
+            btn.config(bg=self.colors["target"])
+
+    def clear_target(self):
+        for (r, c), bg in self.target_saved.items():
+            self.buttons[r][c].config(bg=bg)
+        self.target_saved.clear()
+
+
+# ============================================================
+# 【第 4 段】CanvasGridView (整個棋盤畫在一張 tk.Canvas 上)
+# 目的：開局只畫底色與格線；格子的矩形在第一次變化時才建立，
+#       重置只刪除有變化過的格子，成本與棋盤面積無關
+# ============================================================
+class CanvasGridView(GridView):
+    def __init__(self, parent, size, on_click, colors, cell_px=40):
+        super().__init__(parent, size, on_click, colors)
+        self.cell_px = cell_px
+        side = size * cell_px
+        self.canvas = tk.Canvas(parent, width=side, height=side, bg=colors["default"],
+                                highlightthickness=0)
+        self.canvas.pack()
+        line = colors["body"]
+        for i in range(1, size):
+            self.canvas.create_line(i * cell_px, 0, i * cell_px, side, fill=line)
+            self.canvas.create_line(0, i * cell_px, side, i * cell_px, fill=line)
+        self.items = {}          # (r, c) -> (矩形 id, 文字 id)
+        self.canvas.bind("<Button-1>", self._on_press)
+
+    def _on_press(self, event):
+        r, c = int(event.y // self.cell_px), int(event.x // self.cell_px)
+        if 0 <= r < self.size and 0 <= c < self.size:
+            self.on_click(r, c)
+
+    def _item(self, r, c):
+        item = self.items.get((r, c))
+        if item is None:
+            px = self.cell_px
+            x, y = c * px, r * px
+            rect = self.canvas.create_rectangle(x + 1, y + 1, x + px - 1, y + px - 1,
+                                                outline="", tags="cell")
+            text = self.canvas.create_text(x + px / 2, y + px / 2, fill="white",
+                                           font=("Microsoft JhengHei", max(6, px // 4), "bold"), tags="cell")
+            item = self.items[(r, c)] = (rect, text)
+            self.canvas.tag_raise("target")   # 建議框保持在最上層
+        return item
+
+    def reset(self):
+        self.hints.clear()
+        self.canvas.delete("cell")
+        self.items.clear()
+
+    def show(self, r, c, cell):
+        self.hints.pop((r, c), None)
+        rect, text = self._item(r, c)
+        self.canvas.itemconfig(rect, fill=self.cell_color(cell))
+        self.canvas.itemconfig(text, text="X" if cell == HEAD else "")
+
+    def pending(self, r, c):
+        """只清掉提示 (點擊已翻開的格子由 engine 忽略)"""
+        if self.hints.pop((r, c), None) is not None:
+            rect, text = self._item(r, c)
+            self.canvas.itemconfig(rect, fill=self.colors["default"])
+            self.canvas.itemconfig(text, text="")
+
+    def show_target(self, cells):
+        """在建議的格子外圍畫框"""
+        self.clear_target()
+        px = self.cell_px
+        rows = [r for r, _ in cells]; cols = [c for _, c in cells]
+        self.canvas.create_rectangle(min(cols) * px, min(rows) * px, (max(cols) + 1) * px, (max(rows) + 1) * px,
+                                     outline=self.colors["target"], width=3, tags="target")
+
+    def clear_target(self):
+        self.canvas.delete("target")
+
+    def _draw_hint(self, r, c, pct, prob):
+        rect, text = self._item(r, c)
+        color = blend_color(self.colors["default"], self.colors["head"], prob) if pct else self.colors["default"]
+        self.canvas.itemconfig(rect, fill=color)
+        self.canvas.itemconfig(text, text=str(pct) if pct else "")
@@ -0,0 +1,126 @@
+# ============================================================
+# 【第 1 段】匯入模組
+# 目的：把提示、空襲建議等分析移到背景執行緒，UI 執行緒只送出快照與繪製結果；
+#       新的點擊進來時，還在算的舊快照直接作廢
+# ============================================================
+import queue
+import threading
+
+POLL_MS = 15             # UI 執行緒檢查結果的間隔 (只在有工作時輪詢)
+
+
+# ============================================================
+# 【第 2 段】AnalysisWorker 類別
+# 目的：只保留最新的一份快照；analyze(snapshot, cancelled) 在工作執行緒執行，
+#       應不時呼叫 cancelled()，為 True 就回傳 None 放棄。
+#       結果放進佇列，由 UI 執行緒以 root.after 輪詢取出後呼叫 on_result
+#       (Tk 不是執行緒安全的，工作執行緒完全不碰 Tk 物件)
+# ============================================================
+class AnalysisWorker:
+    def __init__(self, root, analyze, on_result, poll_ms=POLL_MS):
+        self.root = root
+        self.analyze = analyze
+        self.on_result = on_result
+        self.poll_ms = poll_ms
+        self._lock = threading.Lock()
+        self._generation = 0      # 每次送出或取消都加一，結果的代數不同就作廢
+        self._job = None
+        self._pending = False     # UI 執行緒還在等結果 (決定要不要繼續輪詢)
+        self._polling = False
+        self._stopped = False
+        self._wake = threading.Event()
+        self._results = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="analysis", daemon=True)
+        self._thread.start()
+
+    # --------------------------------------------------------
+    # UI 執行緒呼叫
+    # --------------------------------------------------------
+    def submit(self, snapshot):
+        """送出最新快照，取代尚未開始或正在算的舊快照"""
+        with self._lock:
+            self._generation += 1
+            self._job = (self._generation, snapshot)
+        self._pending = True
+        self._wake.set()
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def cancel(self):
+        """作廢所有還沒送回的結果 (例如開新局)"""
+        with self._lock:
+            self._generation += 1
+            self._job = None
+        self._pending = False
+
+    def stop(self):
+        self.cancel()
+        self._stopped = True
+        self._wake.set()
+
+    def _poll(self):
+        latest = None
+        while True:
+            try:
+                generation, result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._generation:
+                latest = result
+        if latest is not None:
+            self._pending = False
+            self.on_result(latest)
+        if self._pending and not self._stopped:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    # --------------------------------------------------------
+    # 工作執行緒
+    # --------------------------------------------------------
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped:
+                return
+            with self._lock:
+                job, self._job = self._job, None
+            if job is None:
+                continue
+            generation, snapshot = job
+            cancelled = lambda: generation != self._generation
+            result = self.analyze(snapshot, cancelled)
+            if result is not None and not cancelled():
+                self._results.put((generation, result))
+
+
+# ============================================================
+# 【第 3 段】機頭機率與空襲建議
+# 目的：HeadHeatmap 只存在工作執行緒上；快照為
+#       (局編號, 飛機形狀, 已翻開的格子, 是否需要空襲建議)，
+#       同一局只套用新翻開的格子，開新局才重新列舉配置
+# ============================================================
+class HintAnalysis:
+    def __init__(self, bomb_metric="info"):
+        self.bomb_metric = bomb_metric
+        self.game = None
+        self.heatmap = None
+
+    def __call__(self, snapshot, cancelled):
+        from plane_hints import HeadHeatmap
+        game, planes, revealed, want_bomb = snapshot
+        if game != self.game:
+            self.game, self.heatmap = game, HeadHeatmap(planes)
+        for r, c, cell in revealed:
+            if cancelled():
+                return None       # 已套用的格子保留，下一份快照接著算
+            self.heatmap.observe(r, c, cell)
+
+        result = {"game": game, "probs": self.heatmap.probabilities(), "bomb": None}
+        if want_bomb:
+            if cancelled():
+                return None
+            result["bomb"] = self.heatmap.best_bomb(self.bomb_metric)
+        return result
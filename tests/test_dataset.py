@@ -0,0 +1,30 @@
+# ============================================================
+# 訓練資料：盤面由 plane_bots 策略玩出來，export 的選項會傳到各分片
+# ============================================================
+import numpy as np
+
+import plane_dataset
+from plane_dataset import HIT_BODY, HIT_HEAD, UNKNOWN
+
+
+def _hit_rate(bot):
+    chunk = next(plane_dataset.iter_samples(1000, rng=np.random.default_rng(0), bots=[bot],
+                                            max_reveals=15, bomb_rate=0.0))
+    revealed = (chunk["obs"] != UNKNOWN).sum(axis=1)
+    assert 0 < revealed.max() <= 15
+    assert not (chunk["target"].astype(bool) & (chunk["obs"] != UNKNOWN)).any()
+    assert chunk["target"].sum(axis=1).min() >= 1          # 機頭已全部找到的盤面不收
+    return np.isin(chunk["obs"], (HIT_BODY, HIT_HEAD)).sum() / revealed.sum()
+
+
+def test_samples_follow_bot_play():
+    # 追擊策略打到機身後會往四周點，翻開的格子中打到飛機的比例明顯高於隨機翻格
+    assert _hit_rate("hunt-target") > 1.5 * _hit_rate("random")
+
+
+def test_export_forwards_options(tmp_path):
+    paths = plane_dataset.export(str(tmp_path), 40, shards=2, processes=1, max_reveals=0, bomb_rate=0.0)
+    for path in paths:
+        info, records = plane_dataset.open_shard(path)
+        assert info["count"] == 20
+        assert not records["obs"].any()
@@ -0,0 +1,29 @@
+# ============================================================
+# 配置索引：鄰居表與遮罩一致，載入時只比對參數雜湊、不建形狀目錄
+# ============================================================
+import numpy as np
+
+import plane_index
+import plane_shapes
+
+
+def test_neighbor_table_matches_masks(tmp_path):
+    path = str(tmp_path / "configs.idx")
+    index = plane_index.load_index(path)
+    assert index.pair_count() == 2576920
+    for i in (0, 1, len(index) // 2, len(index) - 1):
+        expected = np.flatnonzero(~(index.masks & index.masks[i]).any(axis=1))
+        assert np.array_equal(index.compatible(i), expected)
+
+
+def test_load_checks_params_without_catalog(tmp_path, monkeypatch):
+    path = str(tmp_path / "configs.idx")
+    plane_index.build_index(path)
+    monkeypatch.setattr(plane_shapes, "_CATALOGS", {})
+    plane_index.load_index(path)
+    assert plane_shapes._CATALOGS == {}
+
+    # 參數改變 (例如機翼長度) 時重新建立
+    monkeypatch.setattr(plane_index, "WING_LENGTHS", (1, 2))
+    index = plane_index.load_index(path)
+    assert index.params == plane_index.params_hash()
@@ -0,0 +1,108 @@
+# ============================================================
+# 1000x1000 大棋盤經由前端 (終端機版、伺服器 Session) 完整玩一局，
+# 並確認重播檔可記錄與重播大棋盤、精簡快照明確拒絕
+# ============================================================
+import io
+import random
+
+import pytest
+
+from plane_replay import BOMB, CLICK, ReplayLog, ReplayWriter
+from plane_server import Session
+from plane_sparse import SparseEngine, make_engine
+from plane_state import CompactGame
+from plane_term import TermGame
+
+SIZE = 1000
+
+
+def heads(engine):
+    """每架飛機機頭的 (r, c) (形狀的第 0 格是機頭)"""
+    return [(r + shape[0][1], c + shape[0][0]) for shape, (r, c) in zip(engine.planes, engine.anchors)]
+
+
+def test_term_game_plays_large_board(tmp_path):
+    out = io.StringIO()
+    engine = make_engine(SIZE, random.Random(1))
+    assert isinstance(engine, SparseEngine)
+    game = TermGame(engine, color=False, out=out, read=lambda prompt: next(commands),
+                    results_path=str(tmp_path / "results.sqlite3"))
+    game.start_game(5, "一般", seed=12345)
+    commands = iter(["998,2", "!1,999"] + [f"{r + 1},{c + 1}" for r, c in heads(engine)])
+    try:
+        assert game.play() is None
+    finally:
+        if game.results is not None:
+            game.results.close()
+    assert engine.won and engine.steps == 6         # 空襲不算步數
+    assert len(engine.revealed_cells()) == 1 + 4 + 5
+    text = out.getvalue()
+    assert "任務完成" in text and "共 1000x1000" in text
+    assert game.parse_cell("1000,1000") == (999, 999)
+    assert game.parse_cell("1001,1") is None
+
+
+def test_server_session_plays_large_board():
+    session = Session(random.Random(2), SIZE)
+    out = []
+    session.handle("NEW 50 200 777", out)
+    assert out[0].startswith("PLANES ") and len(out[0].split()) == 51
+    assert out[-1].endswith("PLAY\n")
+    for r, c in heads(session.engine):
+        out = []
+        session.handle(f"CLICK {r} {c}", out)
+        assert out[0] == f"CELL {r} {c} H\n"
+    assert out[-1].endswith("WON\n")
+
+    out = []
+    session.handle(f"CLICK {SIZE} 0", out)
+    assert out == ["ERR bad-arguments CLICK\n"]
+
+
+def test_server_rejects_crowded_board():
+    session = Session(random.Random(3))
+    out = []
+    session.handle("NEW 40 30", out)
+    assert out[0] == "ERR board-full\n"
+    out = []
+    session.handle("CLICK 0 0", out)
+    assert out == ["ERR no-game\n"]
+
+
+def test_replay_large_board(tmp_path):
+    path = str(tmp_path / "replays.bin")
+    engine = make_engine(SIZE, random.Random(4))
+    engine.start_game(300, 40, seed=99)
+    writer = ReplayWriter(path)
+    writer.begin_game(engine)
+    moves = [(CLICK, 999, 998), (BOMB, 500, 700)] + [(CLICK, r, c) for r, c in heads(engine)[:3]]
+    for kind, r, c in moves:
+        writer.record(kind, r, c)
+        if kind == BOMB:
+            engine.use_bomb()
+        engine.on_click(r, c)
+    writer.end_game(engine)
+    writer.close()
+
+    log = ReplayLog(path)
+    try:
+        game = log[0]
+        assert (game.size, game.num_planes, game.seed) == (SIZE, 300, 99)
+        assert [tuple(a) for a in game.actions()][:-1] == moves
+        replayed = [cell for _, events in game.replay() for cell in events]
+        assert set(replayed) == set(engine.revealed_cells())
+        assert game.result() == (False, engine.steps)
+    finally:
+        log.close()
+
+    with pytest.raises(ValueError):
+        CompactGame.from_engine(engine)
+
+
+def test_seeded_placement_scales():
+    # 每架飛機的成本固定，1000 架也只要數毫秒；同一個種子得到同一張棋盤
+    a, b = SparseEngine(SIZE), SparseEngine(SIZE)
+    a.start_game(1000, 10, seed=2024)
+    b.start_game(1000, 10, seed=2024)
+    assert len(a.planes) == 1000 and len(a.cells) == sum(len(shape) for shape in a.planes)
+    assert a.anchors == b.anchors and a.cells == b.cells
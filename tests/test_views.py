@@ -0,0 +1,128 @@
+# ============================================================
+# 主棋盤繪製的冒煙測試
+# CanvasGridView 用假的 Canvas 驅動 (不需要顯示器)；
+# 有顯示器時另外以非預設大小建 PlaneGame，走一次開局與點擊的更新流程
+# ============================================================
+import importlib.util
+import os
+import random
+
+import pytest
+
+import plane_views
+from plane_sparse import SparseEngine
+
+GUI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "airplane 3.py")
+COLORS = {"default": "#000000", "hover": "#111111", "miss": "#ffffff",
+          "body": "#0000ff", "head": "#ff0000", "target": "#ffff00"}
+
+
+class FakeCanvas:
+    """只記錄目前存在的圖形與它們的設定"""
+
+    def __init__(self, parent=None, **options):
+        self.items = {}
+        self.next_id = 1
+
+    def _create(self, kind, options):
+        item = self.next_id
+        self.next_id += 1
+        self.items[item] = dict(options, kind=kind)
+        return item
+
+    def create_line(self, *coords, **options):
+        return self._create("line", options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", options)
+
+    def itemconfig(self, item, **options):
+        self.items[item].update(options)
+
+    def delete(self, tag):
+        self.items = {k: v for k, v in self.items.items() if v.get("tags") != tag}
+
+    def tagged(self, tag):
+        return [v for v in self.items.values() if v.get("tags") == tag]
+
+    def pack(self, **options): pass
+    def bind(self, event, callback): pass
+    def tag_raise(self, tag): pass
+
+
+class Press:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+def test_grid_view_is_abstract():
+    with pytest.raises(TypeError):
+        plane_views.GridView(None, 10, None, COLORS)
+
+
+def test_canvas_view_update_path(monkeypatch):
+    monkeypatch.setattr(plane_views.tk, "Canvas", FakeCanvas)
+    size = 200
+    clicks = []
+    view = plane_views.CanvasGridView(None, size, lambda r, c: clicks.append((r, c)), COLORS, cell_px=4)
+    canvas = view.canvas
+    assert len(canvas.items) == 2 * (size - 1)          # 開局只有格線
+
+    engine = SparseEngine(size, random.Random(0))
+    engine.start_game(20, 500, seed=7)
+    view._on_press(Press(4 * 150 + 1, 4 * 120 + 1))
+    view._on_press(Press(4 * size + 1, 0))              # 棋盤外不算
+    assert clicks == [(120, 150)]
+
+    for r, c in [(120, 150), (0, 0), (199, 199)] + [divmod(k, size) for k in list(engine.cells)[:5]]:
+        for r2, c2, cell in engine.on_click(r, c):
+            view.show(r2, c2, cell)
+    revealed = engine.revealed_cells()
+    assert len(canvas.tagged("cell")) == 2 * len(revealed)
+    for r, c, cell in revealed:
+        rect, text = view.items[(r, c)]
+        assert canvas.items[rect]["fill"] == view.cell_color(cell)
+
+    view.hint(5, 5, 0.5)
+    assert canvas.items[view.items[(5, 5)][1]]["text"] == "50"
+    view.pending(5, 5)
+    assert canvas.items[view.items[(5, 5)][1]]["text"] == ""
+    view.show_target([(10, 10), (10, 11), (11, 10), (11, 11)])
+    assert len(canvas.tagged("target")) == 1
+    view.clear_target()
+    assert not canvas.tagged("target")
+
+    view.reset()
+    assert not canvas.tagged("cell") and not view.items and not view.hints
+
+
+def test_plane_game_non_default_size(tmp_path):
+    tk = pytest.importorskip("tkinter")
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"沒有顯示器 ({e})")
+    root.withdraw()
+    spec = importlib.util.spec_from_file_location("airplane_gui", GUI_PATH)
+    gui = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gui)
+    gui.REPLAY_PATH = str(tmp_path / "replays.bin")
+    gui.RESULTS_PATH = str(tmp_path / "results.sqlite3")
+    game = gui.PlaneGame(root, renderer="canvas", size=30)
+    try:
+        assert game.engine.size == 30 and game.view.size == 30
+        assert not game.hints_available and game.analysis is None
+        assert game.board_pool is None          # 大於 SPARSE_THRESHOLD 的棋盤直接由種子放置
+        game.start_game(3, 200)
+        for r in range(5):
+            game.on_click(r, r)
+        root.update_idletasks()
+        assert len(game.view.items) == len(game.engine.revealed_cells())
+        game.draw_hints()
+    finally:
+        game.replay.close()
+        game.results.close()
+        root.destroy()